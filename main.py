@@ -17,18 +17,20 @@ from PyQt5.QtCore import QEvent, QFileSystemWatcher, QRect, QSettings, QSize, Qt
 from PyQt5.QtGui import QColor, QFont, QPalette  # noqa: F401 - kept for theme extension
 from PyQt5.QtWidgets import (
     QAction,
+    QActionGroup,
     QApplication,
     QFileDialog,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMainWindow,
     QMessageBox,
     QProgressBar,
     QPushButton,
     QSizePolicy,
+    QSpinBox,
     QSplitter,
     QStackedWidget,
     QStatusBar,
@@ -44,16 +46,29 @@ from PyQt5.QtWidgets import (
 )
 
 from xtochd.constants import COMPATIBLE_EXTS
+from xtochd.engine import format_duration
+from xtochd.file_list_model import ROLE_FILE_INFO, PENDING_MSG, FileListModel
+from xtochd.journal import RunJournal, journal_path, load_run
+from xtochd.profiles import DEFAULT_PROFILE, PROFILES
+from xtochd.scanner import FoundFileIndex, merge_found_files
+from xtochd.scheduling import (
+    ORDER_LARGEST_FIRST, ORDER_LISTED, ORDER_SMALLEST_FIRST,
+)
 from xtochd.temp_manager import temp_manager
 from xtochd.theme import ThemeManager
+from xtochd.validation_cache import ValidationCache
 from xtochd.validators import get_file_info
 from xtochd.workers import ConversionWorker, ScanWorker, ValidationWorker
 
 
-# Role constants stored on each QListWidgetItem so the delegate can paint
-# directly from the item model rather than hitting a parallel dict.
-ROLE_FILE_INFO = Qt.UserRole + 1
-ROLE_FILE_PATH = Qt.UserRole + 2
+# ValidationWorker hands results over in chunks of up to this many files,
+# or whatever finished within this many seconds, so a 20k-file library
+# costs a few hundred signal dispatches rather than 20k.
+VALIDATION_BATCH_SIZE = 256
+VALIDATION_BATCH_INTERVAL = 0.05
+
+# Log the slowest folder after a scan when its listing took this long.
+SLOW_DIR_LOG_SECONDS = 1.0
 
 _BADGE_ROW_HEIGHT = 34
 _BADGE_WIDTH = 56
@@ -245,11 +260,25 @@ class CHDConverterGUI(QMainWindow):
         self.setMinimumSize(980, 620)
         self.temp_dirs = []
         self.found_files = []
+        # Path set + base-name map kept in step with found_files so each
+        # scan merges in linear time.
+        self.found_index = FoundFileIndex()
         self.conversion_worker = None
         self.scan_worker = None
+        self._scan_new_count = 0
+        self._scan_duplicates = []
+        # Set when files arrive while a ValidationWorker is busy; they are
+        # validated by a follow-up run once it completes.
+        self._validation_queued = False
+        # On-disk validation results, so unchanged files skip revalidation
+        # on the next launch.
+        self.validation_cache = ValidationCache.open_default()
 
         # Persisted settings (last input/output folders, splitter state, etc.)
         self.settings = QSettings('XtoCHD', 'XtoCHD')
+        # Fast scratch volumes for extraction; set before the startup sweep
+        # so orphans on them are cleaned too.
+        temp_manager.scratch_roots = self._load_scratch_roots()
 
         # Theme management
         self.current_theme = 'dark'  # Default to dark theme
@@ -274,6 +303,7 @@ class CHDConverterGUI(QMainWindow):
 
         # Perform startup cleanup of orphaned temp files
         self.perform_startup_cleanup()
+        self._announce_resumable_run()
 
         # Drag-and-drop support
         self.setAcceptDrops(True)
@@ -325,6 +355,16 @@ class CHDConverterGUI(QMainWindow):
 
         tools_menu = menubar.addMenu('Tools')
 
+        self.action_resume = QAction('Resume Last Run', self)
+        self.action_resume.triggered.connect(lambda: self.resume_last_run())
+        tools_menu.addAction(self.action_resume)
+        self.action_retry_failed = QAction('Retry Failed Inputs of Last Run', self)
+        self.action_retry_failed.triggered.connect(
+            lambda: self.resume_last_run(retry_failed=True)
+        )
+        tools_menu.addAction(self.action_retry_failed)
+        tools_menu.addSeparator()
+
         temp_info_action = QAction('Temp Directory Info', self)
         temp_info_action.triggered.connect(self.show_temp_directory_info)
         tools_menu.addAction(temp_info_action)
@@ -333,6 +373,82 @@ class CHDConverterGUI(QMainWindow):
         cleanup_action.triggered.connect(self.cleanup_temp_directory)
         tools_menu.addAction(cleanup_action)
 
+        scratch_action = QAction('Scratch Folders...', self)
+        scratch_action.triggered.connect(self.edit_scratch_folders)
+        tools_menu.addAction(scratch_action)
+
+        self.action_dedup = QAction('Convert Identical Discs Once', self)
+        self.action_dedup.setCheckable(True)
+        self.action_dedup.setToolTip(
+            'Compare disc contents before converting; byte-identical copies are '
+            'converted once and hard-linked under their own names'
+        )
+        self.action_dedup.setChecked(self.settings.value('dedup', False, type=bool))
+        self.action_dedup.toggled.connect(
+            lambda checked: self.settings.setValue('dedup', checked)
+        )
+        tools_menu.addAction(self.action_dedup)
+
+        self.action_verify = QAction('Verify CHDs After Converting', self)
+        self.action_verify.setCheckable(True)
+        self.action_verify.setToolTip(
+            'Run chdman verify on each new CHD while the next discs convert; '
+            'a CHD that fails is deleted so it can be converted again'
+        )
+        self.action_verify.setChecked(self.settings.value('verify', False, type=bool))
+        self.action_verify.toggled.connect(
+            lambda checked: self.settings.setValue('verify', checked)
+        )
+        tools_menu.addAction(self.action_verify)
+
+        profile_menu = tools_menu.addMenu('Compression Profile')
+        self.profile_group = QActionGroup(self)
+        self.profile_group.setExclusive(True)
+        saved_profile = self.settings.value('profile', DEFAULT_PROFILE.name, type=str)
+        for name, profile in PROFILES.items():
+            action = QAction(name.capitalize(), self, checkable=True)
+            action.setData(name)
+            action.setToolTip(profile.description)
+            action.setStatusTip(profile.description)
+            action.setChecked(name == saved_profile)
+            self.profile_group.addAction(action)
+            profile_menu.addAction(action)
+        if self.profile_group.checkedAction() is None:
+            self.profile_group.actions()[0].setChecked(True)
+        self.profile_group.triggered.connect(
+            lambda action: self.settings.setValue('profile', action.data())
+        )
+
+        order_menu = tools_menu.addMenu('Job Order')
+        self.order_group = QActionGroup(self)
+        self.order_group.setExclusive(True)
+        saved_order = self.settings.value('order', ORDER_LISTED, type=str)
+        for policy, label, tip in (
+            (ORDER_LISTED, 'As Listed', 'Convert in the order of the file list'),
+            (ORDER_LARGEST_FIRST, 'Largest First',
+             'Start the biggest discs first so parallel batches finish sooner'),
+            (ORDER_SMALLEST_FIRST, 'Smallest First',
+             'Start the smallest discs first for quick first results'),
+        ):
+            action = QAction(label, self, checkable=True)
+            action.setData(policy)
+            action.setToolTip(tip)
+            action.setStatusTip(tip)
+            action.setChecked(policy == saved_order)
+            self.order_group.addAction(action)
+            order_menu.addAction(action)
+        if self.order_group.checkedAction() is None:
+            self.order_group.actions()[0].setChecked(True)
+        self.order_group.triggered.connect(
+            lambda action: self.settings.setValue('order', action.data())
+        )
+
+        tools_menu.addSeparator()
+
+        clear_cache_action = QAction('Clear Validation Cache', self)
+        clear_cache_action.triggered.connect(self.clear_validation_cache)
+        tools_menu.addAction(clear_cache_action)
+
     def switch_theme(self, theme):
         if theme != self.current_theme:
             self.current_theme = theme
@@ -490,7 +606,7 @@ class CHDConverterGUI(QMainWindow):
 
         Structure:
             QToolBar (actions: Add File, Add Folder, Fast Validation,
-                     chdman badge, Log toggle)
+                     Jobs spinner, chdman badge, Log toggle)
             central widget:
                 QVBoxLayout:
                     Input path strip  (QLineEdit, inline actions)
@@ -598,7 +714,7 @@ class CHDConverterGUI(QMainWindow):
         return row
 
     def _build_toolbar(self):
-        """Top QToolBar: primary actions + chdman badge + log toggle."""
+        """Top QToolBar: primary actions + job count + chdman badge + log toggle."""
         style = self.style()
         self.toolbar = QToolBar('Main')
         self.toolbar.setMovable(False)
@@ -642,6 +758,25 @@ class CHDConverterGUI(QMainWindow):
         self.action_fast_validation.toggled.connect(self.on_validation_mode_changed)
         self.toolbar.addAction(self.action_fast_validation)
 
+        self.toolbar.addSeparator()
+
+        # Number of discs converted at once. Each job runs its own chdman,
+        # so the default of 1 keeps the classic one-at-a-time behaviour.
+        jobs_label = QLabel('Jobs')
+        jobs_label.setStyleSheet('padding: 0 6px;')
+        self.toolbar.addWidget(jobs_label)
+        self.jobs_spin = QSpinBox()
+        self.jobs_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.jobs_spin.setValue(self.settings.value('parallel_jobs', 1, type=int))
+        self.jobs_spin.setToolTip(
+            'How many discs to convert in parallel.\n'
+            'Each job runs its own chdman process.'
+        )
+        self.jobs_spin.valueChanged.connect(
+            lambda value: self.settings.setValue('parallel_jobs', value)
+        )
+        self.toolbar.addWidget(self.jobs_spin)
+
         # Right-pinned items.
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
@@ -698,15 +833,21 @@ class CHDConverterGUI(QMainWindow):
         layout.addLayout(header_row)
 
         # -- file list -----------------------------------------------
-        self.file_list = QListWidget()
+        # Model/view rather than QListWidget: FileListModel stores rows
+        # column-wise so 100k-file libraries stay responsive.
+        self.file_model = FileListModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
         self.file_list.setAlternatingRowColors(True)
         self.file_list.setUniformItemSizes(True)
         self.file_list.setMinimumHeight(260)
         self.file_list.setItemDelegate(FileListDelegate(self.file_list))
-        self.file_list.setSelectionMode(QListWidget.SingleSelection)
+        self.file_list.setSelectionMode(QListView.SingleSelection)
         self.file_list.setFocusPolicy(Qt.StrongFocus)
-        self.file_list.itemSelectionChanged.connect(self.on_file_selection_changed)
-        self.file_list.model().dataChanged.connect(self._on_file_item_data_changed)
+        self.file_list.selectionModel().selectionChanged.connect(
+            self.on_file_selection_changed
+        )
+        self.file_model.dataChanged.connect(self._on_file_item_data_changed)
         layout.addWidget(self.file_list, 1)
 
         # -- collapsible file info -----------------------------------
@@ -858,91 +999,47 @@ class CHDConverterGUI(QMainWindow):
         if getattr(self, 'scan_worker', None) is not None:
             self.scan_worker.quit()
             self.scan_worker.wait()
+        self._scan_new_count = 0
+        self._scan_duplicates = []
         self.scan_worker = ScanWorker(valid_paths)
         self.scan_worker.scan_progress.connect(self.status_bar.showMessage)
+        self.scan_worker.scan_batch.connect(self.scan_batch_found)
         self.scan_worker.scan_complete.connect(self.scan_completed)
         self.scan_worker.scan_error.connect(self.scan_error)
         self.scan_worker.start()
 
-    def scan_completed(self, found_files):
-        """Merge newly-scanned files into the list, de-duplicating by base name."""
+    def scan_batch_found(self, found_files):
+        """Merge one streamed batch into the list, de-duplicating by base name.
+
+        Runs while the walk continues, so rows appear (and validation
+        starts) on the first batch rather than after the whole tree.
+        """
         if not hasattr(self, 'found_files'):
             self.found_files = []
 
-        # Multi-file disc formats where a "duplicate" base name is actually
-        # a required companion, not a replacement.
-        multi_file_formats = {
-            '.cue': ('.bin',),
-            '.toc': ('.bin',),
-            '.ccd': ('.img', '.sub'),
-        }
-        # Format priority when the same base name appears in two formats:
-        # pick the smaller number. Anything not listed drops to 999.
-        format_priority = {
-            '.iso': 1, '.cue': 2, '.bin': 3, '.img': 4,
-            '.zip': 5, '.nrg': 6, '.gdi': 7, '.toc': 8,
-            '.ccd': 9, '.vcd': 10,
-            '.cdr': 11, '.hdi': 12, '.vhd': 13, '.vmdk': 14, '.dsk': 15,
-        }
-
-        new_files = []
-        duplicate_files = []
+        merge = merge_found_files(self.found_files, found_files, self.found_index)
+        self._scan_duplicates.extend(merge.duplicates)
 
-        for file_path in found_files:
-            if file_path in self.found_files:
-                continue
+        if merge.replaced:
+            self.file_model.remove_paths(merge.replaced)
 
-            file_name = os.path.basename(file_path)
-            file_base, file_ext = os.path.splitext(file_name)
-            file_ext = file_ext.lower()
+        if merge.added:
+            self._scan_new_count += len(merge.added)
+            if not hasattr(self, 'file_info_cache'):
+                self.file_info_cache = {}
+            self.add_files_to_list(merge.added)
+            self.queue_background_validation()
 
-            is_duplicate = False
-            should_replace = None
+        self.update_start_button_state()
 
-            for existing in self.found_files:
-                existing_name = os.path.basename(existing)
-                existing_base, existing_ext = os.path.splitext(existing_name)
-                existing_ext = existing_ext.lower()
-                if existing_base != file_base:
-                    continue
+    def scan_completed(self, found_files):
+        """Report the outcome once the walk is done; rows were added per batch."""
+        new_count = self._scan_new_count
+        duplicate_files = self._scan_duplicates
 
-                # Is the new file a companion the existing one needs?
-                is_companion = (
-                    (existing_ext in multi_file_formats and file_ext in multi_file_formats[existing_ext])
-                    or (file_ext in multi_file_formats and existing_ext in multi_file_formats[file_ext])
-                )
-                if is_companion:
-                    continue
-
-                new_priority = format_priority.get(file_ext, 999)
-                existing_priority = format_priority.get(existing_ext, 999)
-                if new_priority < existing_priority:
-                    should_replace = existing
-                    break
-                duplicate_files.append(file_name)
-                is_duplicate = True
-                break
-
-            if should_replace is not None:
-                self.found_files.remove(should_replace)
-                for i in range(self.file_list.count()):
-                    item = self.file_list.item(i)
-                    if item.data(ROLE_FILE_PATH) == should_replace:
-                        self.file_list.takeItem(i)
-                        break
-
-            if not is_duplicate:
-                self.found_files.append(file_path)
-                new_files.append(file_path)
-
-        if new_files:
-            if not hasattr(self, 'file_info_cache'):
-                self.file_info_cache = {}
-            for file_path in new_files:
-                self.add_file_to_list(file_path)
-            self.start_background_validation()
+        if new_count:
             status_msg = (
-                f'Scan complete: {len(new_files)} new file(s) found. '
+                f'Scan complete: {new_count} new file(s) found. '
                 f'Total: {len(self.found_files)} file(s). Ready to convert!'
             )
             if duplicate_files:
@@ -956,6 +1053,12 @@ class CHDConverterGUI(QMainWindow):
         else:
             self.status_bar.showMessage('Scan complete: No new files found.')
 
+        # Point at the folder that held the walk up - usually a slow share.
+        slowest = self.scan_worker.dir_timings.slowest() if self.scan_worker else []
+        if slowest and slowest[0][1] >= SLOW_DIR_LOG_SECONDS:
+            path, seconds = slowest[0]
+            self.log_area.append(f'Slowest folder to list: {path} ({seconds:.1f}s)')
+
         self.update_start_button_state()
 
     def scan_error(self, error_msg):
@@ -983,29 +1086,26 @@ class CHDConverterGUI(QMainWindow):
         if not hasattr(self, 'file_info_cache'):
             self.file_info_cache = {}
         existing_cache = self.file_info_cache
-        self.file_list.clear()
+        self.file_model.clear()
         # Drop cache entries for files that are no longer in the list.
-        self.file_info_cache = {k: v for k, v in existing_cache.items() if k in self.found_files}
+        self.file_info_cache = {
+            k: v for k, v in existing_cache.items() if k in self.found_index
+        }
 
-        for file_path in self.found_files:
-            self.add_file_to_list(file_path)
+        self.add_files_to_list(self.found_files)
 
         self._update_list_summary()
         self.start_background_validation()
 
-    def add_file_to_list(self, file_path):
-        """Create a QListWidgetItem carrying file path + (optionally cached) info."""
-        item = QListWidgetItem()
-        item.setFlags(
-            Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
-        )
-        item.setCheckState(Qt.Checked)
-        item.setData(ROLE_FILE_PATH, file_path)
-
-        cached = getattr(self, 'file_info_cache', {}).get(file_path)
-        if cached is not None:
-            item.setData(ROLE_FILE_INFO, cached)
-        else:
+    def add_files_to_list(self, file_paths):
+        """Append checked rows for ``file_paths`` in one model insert."""
+        cache = getattr(self, 'file_info_cache', {})
+        infos = []
+        for file_path in file_paths:
+            cached = cache.get(file_path)
+            if cached is not None:
+                infos.append(cached)
+                continue
             try:
                 file_size = os.path.getsize(file_path)
                 size_str = temp_manager.format_size(file_size)
@@ -1014,7 +1114,7 @@ class CHDConverterGUI(QMainWindow):
                 size_str = 'Unknown'
             # Seed pending info so the delegate can render something sensible
             # while validation runs in the background.
-            item.setData(ROLE_FILE_INFO, {
+            infos.append({
                 'name': os.path.basename(file_path),
                 'path': file_path,
                 'size': file_size,
@@ -1022,16 +1122,28 @@ class CHDConverterGUI(QMainWindow):
                 'extension': os.path.splitext(file_path)[1].lower(),
                 # 'is_valid' deliberately omitted so the delegate paints
                 # a pending/... status indicator.
-                'validation_msg': 'Validating...',
+                'validation_msg': PENDING_MSG,
             })
-        item.setToolTip(file_path)
-        self.file_list.addItem(item)
+        self.file_model.append_files(infos)
+
+    def queue_background_validation(self):
+        """Validate newly listed files without blocking on a running worker.
+
+        If a ValidationWorker is still busy, the new files are picked up by
+        a follow-up run as soon as it completes.
+        """
+        worker = getattr(self, 'validation_worker', None)
+        if worker is not None and worker.isRunning():
+            self._validation_queued = True
+            return
+        self.start_background_validation()
 
     def start_background_validation(self):
         """Run a ValidationWorker across files not already validated."""
         if getattr(self, 'validation_worker', None) is not None:
             self.validation_worker.quit()
             self.validation_worker.wait()
+        self._validation_queued = False
 
         if not hasattr(self, 'file_info_cache'):
             self.file_info_cache = {}
@@ -1054,54 +1166,41 @@ class CHDConverterGUI(QMainWindow):
         fast_validation = self.action_fast_validation.isChecked()
         self.validation_worker = ValidationWorker(
             unvalidated, max_workers=max_workers, fast_validation=fast_validation,
+            cache=self.validation_cache,
+            batch_size=VALIDATION_BATCH_SIZE,
+            batch_interval=VALIDATION_BATCH_INTERVAL,
         )
-        self.validation_worker.validation_progress.connect(self.update_single_file_validation)
+        self.validation_worker.validation_batch.connect(self.update_file_validation_batch)
         self.validation_worker.validation_complete.connect(self.update_file_validation)
         self.validation_worker.start()
 
-    def update_single_file_validation(self, file_path, file_info):
-        """Update a single file's row as its validation result arrives."""
-        try:
-            file_index = self.found_files.index(file_path)
-        except ValueError:
+    def update_file_validation_batch(self, batch):
+        """Apply a chunk of validation results with one repaint and one status update."""
+        if not self.file_model.set_file_infos(batch):
             return
-        if file_index >= self.file_list.count():
-            return
-
-        item = self.file_list.item(file_index)
-        item.setData(ROLE_FILE_INFO, file_info)
-        item.setToolTip(
-            f"{file_info['path']}\n"
-            f"{file_info['size_str']}  ({file_info['extension']})\n"
-            f"{file_info['validation_msg']}"
-        )
-        # Ensure the delegate repaints this row now that its data changed.
-        self.file_list.update(self.file_list.indexFromItem(item))
 
         if not hasattr(self, 'file_info_cache'):
             self.file_info_cache = {}
-        self.file_info_cache[file_path] = file_info
+        self.file_info_cache.update(batch)
 
-        validated_count = len(self.file_info_cache)
-        total_count = len(self.found_files)
+        # The list summary label already refreshed via the model's
+        # dataChanged; both read the running totals, never the whole list.
+        summary = self.file_model.summary
         self.status_bar.showMessage(
-            f"Validating files... ({validated_count}/{total_count} completed)"
+            f"Validating files... ({summary.validated}/{summary.total} completed)"
         )
-        self._update_list_summary()
 
     def update_file_validation(self, validation_results):
         """Final summary once all ValidationWorker results are in."""
         if validation_results:
             self.file_info_cache.update(validation_results)
 
-        total_size = sum(
-            info['size'] for info in self.file_info_cache.values() if info['is_valid']
-        )
-        valid_files = sum(1 for info in self.file_info_cache.values() if info['is_valid'])
-        invalid_files = sum(1 for info in self.file_info_cache.values() if not info['is_valid'])
+        summary = self.file_model.summary
+        valid_files = summary.valid
+        invalid_files = summary.invalid
 
         if self.found_files:
-            total_size_str = temp_manager.format_size(total_size)
+            total_size_str = temp_manager.format_size(summary.valid_size)
             self.status_bar.showMessage(
                 f"Files: {len(self.found_files)} | Valid: {valid_files} | "
                 f"Invalid: {invalid_files} | Total Size: {total_size_str}"
@@ -1123,20 +1222,18 @@ class CHDConverterGUI(QMainWindow):
                     f"Re-validation complete ({mode} mode): all {valid_files} file(s) valid."
                 )
 
+        if self._validation_queued:
+            self.start_background_validation()
+
     def on_file_selection_changed(self):
         """Show details for the selected file in the information panel."""
-        selected_items = self.file_list.selectedItems()
-        if not selected_items:
+        selected = self.file_list.selectionModel().selectedIndexes()
+        if not selected:
             self.file_info_text.clear()
             self.file_info_container.setVisible(False)
             return
 
-        item = selected_items[0]
-        item_index = self.file_list.row(item)
-        if item_index >= len(self.found_files):
-            return
-
-        file_path = self.found_files[item_index]
+        file_path = self.file_model.path_at(selected[0].row())
         cached = getattr(self, 'file_info_cache', {}).get(file_path)
         file_info = cached if cached is not None else get_file_info(file_path)
 
@@ -1171,12 +1268,10 @@ class CHDConverterGUI(QMainWindow):
         self.file_info_text.setVisible(self._file_info_expanded)
 
     def select_all_files(self):
-        for i in range(self.file_list.count()):
-            self.file_list.item(i).setCheckState(Qt.Checked)
+        self.file_model.set_all_checked(True)
 
     def select_none_files(self):
-        for i in range(self.file_list.count()):
-            self.file_list.item(i).setCheckState(Qt.Unchecked)
+        self.file_model.set_all_checked(False)
 
     def get_selected_files(self):
         """Return the checked files plus warnings about invalid/unvalidated ones."""
@@ -1184,11 +1279,7 @@ class CHDConverterGUI(QMainWindow):
         invalid_selected = []
         unvalidated_selected = []
 
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            if item.checkState() != Qt.Checked:
-                continue
-            file_path = self.found_files[i]
+        for file_path in self.file_model.checked_paths():
             cached = getattr(self, 'file_info_cache', {}).get(file_path)
             if cached is not None:
                 if cached['is_valid']:
@@ -1225,21 +1316,14 @@ class CHDConverterGUI(QMainWindow):
             self.list_summary_label.setText('No files added yet')
             return
 
-        cache = getattr(self, 'file_info_cache', {})
-        total = len(self.found_files)
-        checked = sum(
-            1 for i in range(self.file_list.count())
-            if self.file_list.item(i).checkState() == Qt.Checked
-        )
-        size_bytes = sum(
-            info.get('size', 0) for info in cache.values() if info.get('is_valid')
-        )
+        summary = self.file_model.summary
+        total = summary.total
+        checked = summary.checked
+        size_bytes = summary.valid_size
         size_str = temp_manager.format_size(size_bytes) if size_bytes else '--'
 
-        valid = sum(1 for info in cache.values() if info.get('is_valid'))
-        invalid = sum(
-            1 for info in cache.values() if 'is_valid' in info and not info['is_valid']
-        )
+        valid = summary.valid
+        invalid = summary.invalid
         if invalid:
             status = f'{valid} valid, {invalid} invalid'
         elif valid == total:
@@ -1261,6 +1345,45 @@ class CHDConverterGUI(QMainWindow):
         if not output_path:
             self.log_area.append('Please select an output folder.')
             return
+        self._start_conversion_run(selected_files, output_path)
+
+    def resume_last_run(self, retry_failed=False):
+        """Tools menu: convert what the last run didn't finish (or, if asked, failed)."""
+        if self.conversion_worker and self.conversion_worker.isRunning():
+            return
+        record = load_run(journal_path())
+        remaining = record.remaining(retry_failed) if record is not None else []
+        if not remaining:
+            if retry_failed:
+                self.log_area.append('Nothing to retry: no input of the last run failed.')
+            else:
+                self.log_area.append('Nothing to resume: the last run finished.')
+            return
+        files = [p for p in remaining if os.path.exists(p)]
+        gone = len(remaining) - len(files)
+        if gone:
+            self.log_area.append(f'Skipping {gone} input(s) that no longer exist.')
+        if not files:
+            return
+        self.log_area.append(
+            f'Resuming last run: {len(files)} of {len(record.files)} input(s) left, '
+            f'output to {record.output_dir}'
+        )
+        self.output_path_edit.setText(record.output_dir)
+        # Failures this run won't retry stay on record for a later retry.
+        carried = [] if retry_failed else record.failed()
+        self._start_conversion_run(files, record.output_dir, carried_failures=carried)
+
+    def _announce_resumable_run(self):
+        record = load_run(journal_path())
+        if record is not None and record.resumable:
+            self.log_area.append(
+                f'The last conversion run was interrupted with '
+                f'{len(record.remaining())} input(s) left. '
+                f'Use Tools > Resume Last Run to finish it.'
+            )
+
+    def _start_conversion_run(self, files, output_path, carried_failures=None):
         if not self.chdman_path or not os.path.isfile(self.chdman_path):
             self.log_area.append(
                 'chdman.exe not found. Please place chdman.exe in the same folder as XtoCHD.'
@@ -1271,23 +1394,48 @@ class CHDConverterGUI(QMainWindow):
         self.disable_ui_during_conversion()
         self.progress_bar.setMaximum(100)
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat('%p%')
         self.progress_bar.setTextVisible(True)
         # Morph the single action button into its "Stop" state.
         self.action_stack.setCurrentIndex(1)
         self.status_bar.showMessage('Starting conversion...')
 
-        self.conversion_worker = ConversionWorker(selected_files, output_path, self.chdman_path)
+        self.conversion_worker = ConversionWorker(
+            files, output_path, self.chdman_path,
+            max_jobs=self.jobs_spin.value(),
+            journal=RunJournal(journal_path(), carried_failures=carried_failures),
+            dedup=self.action_dedup.isChecked(),
+            profile=PROFILES.get(
+                self.profile_group.checkedAction().data(), DEFAULT_PROFILE
+            ),
+            order=self.order_group.checkedAction().data(),
+            verify=self.action_verify.isChecked(),
+        )
         self.conversion_worker.progress_updated.connect(self.progress_bar.setValue)
+        self.conversion_worker.batch_rate.connect(self.update_batch_rate)
         self.conversion_worker.progress_text.connect(self.status_bar.showMessage)
         self.conversion_worker.log_updated.connect(self.log_area_append)
         self.conversion_worker.conversion_finished.connect(self.conversion_completed)
         self.conversion_worker.start()
 
+    def update_batch_rate(self, mb_per_s, eta_seconds):
+        """Show whole-batch throughput and byte-weighted ETA on the progress bar."""
+        self.progress_bar.setFormat(
+            f'%p%  ·  {mb_per_s:.1f} MB/s  ·  ETA {format_duration(eta_seconds)}'
+        )
+
     def _set_toolbar_actions_enabled(self, enabled):
         for action in (
             getattr(self, 'action_add_file', None),
             getattr(self, 'action_add_folder', None),
             getattr(self, 'action_fast_validation', None),
+            getattr(self, 'jobs_spin', None),
+            getattr(self, 'action_resume', None),
+            getattr(self, 'action_retry_failed', None),
+            getattr(self, 'action_dedup', None),
+            getattr(self, 'action_verify', None),
+            getattr(self, 'profile_group', None),
+            getattr(self, 'order_group', None),
         ):
             if action is not None:
                 action.setEnabled(enabled)
@@ -1323,6 +1471,7 @@ class CHDConverterGUI(QMainWindow):
         self.cleanup_temp_dirs()
 
         self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFormat('%p%')
         # Morph back to the "Start" state.
         self.action_stack.setCurrentIndex(0)
 
@@ -1362,13 +1511,7 @@ class CHDConverterGUI(QMainWindow):
         # Reset every row's display state back to "pending" so the
         # delegate paints the grey "validating..." hint while the worker
         # is in flight.
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            info = dict(item.data(ROLE_FILE_INFO) or {})
-            info.pop('is_valid', None)
-            info['validation_msg'] = 'Validating...'
-            item.setData(ROLE_FILE_INFO, info)
-            self.file_list.update(self.file_list.indexFromItem(item))
+        self.file_model.reset_validation()
 
         # Remember to announce completion; update_file_validation will
         # check this flag and log a closing line once the worker is done.
@@ -1387,16 +1530,23 @@ class CHDConverterGUI(QMainWindow):
             if temp_size > 0:
                 self.log_area.append(f'Temp directory size: {temp_manager.format_size(temp_size)}')
             self.log_area.append(f'Temp directory: {temp_manager.temp_base_dir}')
+            if temp_manager.scratch_roots:
+                self.log_area.append(
+                    f"Scratch folders: {', '.join(temp_manager.scratch_roots)}"
+                )
         except OSError as e:
             self.log_area.append(f'Warning: could not perform startup cleanup: {e}')
 
     def get_temp_directory_info(self):
         try:
             temp_size = temp_manager.get_temp_dir_size()
-            return (
+            info = (
                 f"Temp directory: {temp_manager.temp_base_dir}\n"
                 f"Size: {temp_manager.format_size(temp_size)}"
             )
+            if temp_manager.scratch_roots:
+                info += f"\nScratch folders: {', '.join(temp_manager.scratch_roots)}"
+            return info
         except OSError as e:
             return (
                 f"Temp directory: {temp_manager.temp_base_dir}\n"
@@ -1444,6 +1594,43 @@ class CHDConverterGUI(QMainWindow):
         except OSError as e:
             self.log_area.append(f'Error during manual cleanup: {e}')
 
+    def _load_scratch_roots(self):
+        saved = self.settings.value('scratch_dirs', '', type=str)
+        return [p for p in saved.split(os.pathsep) if p.strip()]
+
+    def edit_scratch_folders(self):
+        """Tools menu: choose fast volumes (NVMe, RAM disk) to extract archives onto.
+
+        Each run uses the listed folder with the most free space.
+        """
+        text, ok = QInputDialog.getText(
+            self, 'Scratch Folders',
+            f'Folders to extract archives into, separated by "{os.pathsep}".\n'
+            'Leave empty to use the temp folder beside XtoCHD.',
+            QLineEdit.Normal, os.pathsep.join(temp_manager.scratch_roots),
+        )
+        if not ok:
+            return
+        roots = [p.strip() for p in text.split(os.pathsep) if p.strip()]
+        missing = [p for p in roots if not os.path.isdir(p)]
+        if missing:
+            QMessageBox.warning(
+                self, 'Scratch Folders',
+                'These folders do not exist and will be ignored until they do:\n'
+                + '\n'.join(missing),
+            )
+        temp_manager.scratch_roots = roots
+        self.settings.setValue('scratch_dirs', os.pathsep.join(roots))
+        if roots:
+            self.log_area.append(f"Scratch folders: {', '.join(roots)}")
+        else:
+            self.log_area.append(f'Scratch folders cleared; using {temp_manager.temp_base_dir}')
+
+    def clear_validation_cache(self):
+        """Tools menu: forget saved validation results so every file is re-checked."""
+        self.validation_cache.clear()
+        self.log_area.append('Validation cache cleared.')
+
     def log_area_append(self, text):
         self.log_area.append(text)
         self.log_area.moveCursor(self.log_area.textCursor().End)
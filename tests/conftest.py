@@ -1,9 +1,91 @@
-"""Make the project root importable so tests can ``from xtochd import ...``."""
+"""Make the project root importable so tests can ``from xtochd import ...``.
+
+Also provides the shared fixtures for tests that drive the conversion
+engine end to end.
+"""
 
 import os
+import stat
 import sys
 
+import pytest
+
 HERE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.dirname(HERE)
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+# Stand-in for chdman. By default it copies its ``-i`` input to its ``-o``
+# output, and ``verify`` passes any non-empty file; ``make_fake_chdman``
+# fills in the knobs.
+FAKE_CHDMAN = """\
+import os, shutil, sys
+args = sys.argv[1:]
+argv_log = {argv_log!r}
+if argv_log:
+    with open(argv_log, "a") as log:
+        log.write(" ".join(args) + "\\n")
+for line in {stderr_lines!r}:
+    sys.stderr.write(line)
+    sys.stderr.flush()
+if args and args[0] == "verify":
+    sys.exit(0 if os.path.getsize(args[args.index("-i") + 1]) else 1)
+if "-o" in args:
+    dst = args[args.index("-o") + 1]
+    output = {output!r}
+    if output is None:
+        shutil.copyfile(args[args.index("-i") + 1], dst)
+    else:
+        with open(dst, "wb") as f:
+            f.write(output)
+sys.exit({exit_code})
+"""
+
+
+@pytest.fixture
+def make_fake_chdman(tmp_path):
+    """Factory for executable fake chdmans, for driving the engine end to end.
+
+    ``make_fake_chdman(stderr_lines=..., exit_code=..., output=..., argv_log=...)``
+    returns the script's path. It writes ``stderr_lines`` verbatim (end
+    them with ``\\r`` or ``\\n`` yourself), writes ``output`` bytes to
+    ``-o`` instead of copying ``-i`` when given, appends each command
+    line to ``argv_log`` and exits with ``exit_code``.
+    """
+    if os.name == "nt":
+        pytest.skip("fake chdman relies on a POSIX shebang")
+    made = [0]
+
+    def make(stderr_lines=(), exit_code=0, output=None, argv_log=None):
+        made[0] += 1
+        script = tmp_path / ("chdman" if made[0] == 1 else f"chdman{made[0]}")
+        body = FAKE_CHDMAN.format(
+            argv_log=None if argv_log is None else str(argv_log),
+            stderr_lines=list(stderr_lines),
+            output=output,
+            exit_code=exit_code,
+        )
+        script.write_text(f"#!{sys.executable}\n{body}")
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        return str(script)
+
+    return make
+
+
+@pytest.fixture
+def fake_chdman(make_fake_chdman):
+    """Path to the default fake chdman (copies ``-i`` to ``-o``)."""
+    return make_fake_chdman()
+
+
+@pytest.fixture
+def isolated_temp(tmp_path, monkeypatch):
+    """Point the shared temp_manager (and app_dir) at a pytest tmp dir."""
+    from xtochd.temp_manager import temp_manager
+
+    base = tmp_path / "temp"
+    base.mkdir()
+    monkeypatch.setattr(temp_manager, "temp_base_dir", str(base))
+    # The validation cache also lives under app_dir.
+    monkeypatch.setattr(temp_manager, "app_dir", str(tmp_path))
+    return base
@@ -0,0 +1,113 @@
+"""Tests for the headless ``python -m xtochd convert`` front end."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from xtochd import cli
+
+
+pytestmark = pytest.mark.usefixtures("isolated_temp")
+
+
+def test_convert_folder_exits_zero(tmp_path, fake_chdman, capsys):
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "a.iso").write_bytes(b"\x00" * 4096)
+    (src / "b.iso").write_bytes(b"\x00" * 4096)
+    out = tmp_path / "out"
+    code = cli.main(["convert", str(src), "-o", str(out), "--chdman", fake_chdman, "-j", "2"])
+    assert code == cli.EXIT_OK
+    assert sorted(os.listdir(out)) == ["a.chd", "b.chd"]
+    assert "CONVERSION SUMMARY" in capsys.readouterr().out
+
+
+def test_invalid_files_are_skipped_and_flagged(tmp_path, fake_chdman):
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "tiny.iso").write_bytes(b"\x00" * 10)
+    code = cli.main(["convert", str(src), "-o", str(tmp_path / "out"), "--chdman", fake_chdman])
+    assert code == cli.EXIT_FAILURES
+
+
+def test_engine_crash_is_a_failure_exit(tmp_path, fake_chdman, monkeypatch, capsys):
+    from xtochd.engine import ConversionEngine
+
+    def crash(self):
+        raise RuntimeError("engine bug")
+
+    monkeypatch.setattr(ConversionEngine, "run", crash)
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "a.iso").write_bytes(b"\x00" * 4096)
+    code = cli.main(["convert", str(src), "-o", str(tmp_path / "out"), "--chdman", fake_chdman])
+    assert code == cli.EXIT_FAILURES
+    assert "engine bug" in capsys.readouterr().err
+
+
+def test_missing_chdman_is_a_usage_error(tmp_path):
+    code = cli.main([
+        "convert", str(tmp_path), "-o", str(tmp_path / "out"),
+        "--chdman", str(tmp_path / "nope"),
+    ])
+    assert code == cli.EXIT_USAGE
+
+
+def test_resume_converts_only_unfinished_inputs(tmp_path, fake_chdman, capsys):
+    from xtochd.journal import DONE, RunJournal, journal_path, load_run
+
+    src = tmp_path / "in"
+    src.mkdir()
+    files = []
+    for name in ("a.iso", "b.iso"):
+        (src / name).write_bytes(b"\x00" * 4096)
+        files.append(str(src / name))
+    out = tmp_path / "out"
+    journal = RunJournal(journal_path())
+    journal.begin(files, str(out))
+    journal.record(1, DONE)
+    journal.close()  # no end line: the run was interrupted
+
+    code = cli.main(["resume", "--chdman", fake_chdman])
+    assert code == cli.EXIT_OK
+    assert os.listdir(out) == ["b.chd"]
+    assert load_run().completed
+    assert cli.main(["resume", "--chdman", fake_chdman]) == cli.EXIT_OK
+    assert "Nothing to resume" in capsys.readouterr().out
+
+
+def test_retry_failed_after_a_completed_run(tmp_path, fake_chdman, capsys):
+    from xtochd.journal import DONE, FAILED, RunJournal, journal_path, load_run
+
+    src = tmp_path / "in"
+    src.mkdir()
+    files = []
+    for name in ("a.iso", "b.iso", "c.iso"):
+        (src / name).write_bytes(b"\x00" * 4096)
+        files.append(str(src / name))
+    out = tmp_path / "out"
+    journal = RunJournal(journal_path())
+    journal.begin(files, str(out))
+    journal.record(1, FAILED)
+    journal.record(2, DONE)
+    journal.record(3, FAILED)
+    journal.end(completed=True)
+
+    # A plain resume converts nothing but points at --retry-failed.
+    assert cli.main(["resume", "--chdman", fake_chdman]) == cli.EXIT_OK
+    assert "--retry-failed" in capsys.readouterr().out
+    assert not out.exists()
+
+    assert cli.main(["resume", "--retry-failed", "--chdman", fake_chdman]) == cli.EXIT_OK
+    assert sorted(os.listdir(out)) == ["a.chd", "c.chd"]
+    assert load_run().failed() == []
+
+
+def test_hunk_size_must_be_whole_frames(tmp_path, fake_chdman):
+    code = cli.main([
+        "convert", str(tmp_path), "-o", str(tmp_path / "out"),
+        "--chdman", fake_chdman, "--hunk-size", "4096",
+    ])
+    assert code == cli.EXIT_USAGE
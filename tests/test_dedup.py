@@ -0,0 +1,97 @@
+"""Tests for content-based detection of identical discs."""
+
+from __future__ import annotations
+
+import os
+import zipfile
+
+from xtochd import dedup
+from xtochd.dedup import discs_in, find_duplicates
+
+
+def _data(size, seed=0):
+    return bytes((i * 7 + seed) % 251 for i in range(size))
+
+
+def _cue_disc(directory, stem, payload):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{stem}.bin").write_bytes(payload)
+    (directory / f"{stem}.cue").write_text(
+        f'FILE "{stem}.bin" BINARY\n  TRACK 01 MODE1/2352\n    INDEX 01 00:00:00\n'
+    )
+    return str(directory / f"{stem}.cue")
+
+
+def test_renamed_copies_of_a_disc_are_duplicates(tmp_path):
+    payload = _data(300_000)
+    usa = _cue_disc(tmp_path / "usa", "Game (USA)", payload)
+    eur = _cue_disc(tmp_path / "eur", "Game (Europe)", payload)
+    other = _cue_disc(tmp_path / "other", "Other", _data(300_000, seed=1))
+    result = find_duplicates([usa, eur, other])
+    assert result.files == [usa, other]
+    assert result.dropped == [eur]
+    assert result.aliases == [("Game (Europe)", "Game (USA)")]
+
+
+def test_same_samples_but_different_bytes_are_kept(tmp_path):
+    # Identical first/middle/last windows; only the full digest tells them apart.
+    base = bytearray(_data(400_000))
+    first = tmp_path / "a.iso"
+    second = tmp_path / "b.iso"
+    first.write_bytes(bytes(base))
+    base[100_000] ^= 0xFF
+    second.write_bytes(bytes(base))
+    result = find_duplicates([str(first), str(second)])
+    assert result.dropped == []
+
+
+def test_zipped_copy_matches_loose_disc(tmp_path):
+    payload = _data(250_000)
+    loose = _cue_disc(tmp_path / "loose", "Game", payload)
+    zipped = tmp_path / "Game (Rev A).zip"
+    with zipfile.ZipFile(zipped, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("Game (Rev A).bin", payload)
+        z.writestr(
+            "Game (Rev A).cue",
+            'FILE "Game (Rev A).bin" BINARY\n  TRACK 01 MODE1/2352\n    INDEX 01 00:00:00\n',
+        )
+        z.writestr("readme.txt", b"hello")
+    result = find_duplicates([loose, str(zipped)])
+    assert result.dropped == [str(zipped)]
+    assert result.aliases == [("Game (Rev A)", "Game")]
+
+
+def test_unique_sizes_are_never_read(tmp_path, monkeypatch):
+    a = tmp_path / "a.iso"
+    b = tmp_path / "b.iso"
+    a.write_bytes(_data(10_000))
+    b.write_bytes(_data(20_000))
+
+    def fail(*_args):
+        raise AssertionError("a disc with a unique key was hashed")
+
+    monkeypatch.setattr(dedup, "_sample_digest", fail)
+    assert find_duplicates([str(a), str(b)]).files == [str(a), str(b)]
+
+
+def test_unfingerprintable_inputs_are_kept(tmp_path):
+    rar = tmp_path / "x.rar"
+    rar.write_bytes(b"Rar!\x1a\x07\x00")
+    cue = tmp_path / "lost.cue"
+    cue.write_text('FILE "missing.bin" BINARY\n')
+    assert discs_in(str(rar)) is None
+    assert discs_in(str(cue)) is None
+    assert find_duplicates([str(rar), str(cue)]).files == [str(rar), str(cue)]
+
+
+def test_sample_digest_matches_between_seek_and_stream(tmp_path):
+    payload = _data(500_000)
+    loose = tmp_path / "a.iso"
+    loose.write_bytes(payload)
+    zipped = tmp_path / "b.zip"
+    with zipfile.ZipFile(zipped, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("b.iso", payload)
+    (seek_disc,) = discs_in(str(loose))
+    (stream_disc,) = discs_in(str(zipped))
+    assert dedup._sample_digest(seek_disc) == dedup._sample_digest(stream_disc)
+    assert os.path.getsize(loose) == stream_disc.tracks[0].size
@@ -0,0 +1,586 @@
+"""Tests for ConversionEngine driven against a fake chdman.
+
+The fake is a tiny Python script that copies its ``-i`` input to its ``-o``
+output, so the engine's scheduling, skip and stats logic can be exercised
+without MAME's binary (which is Windows-only in this repo anyway).
+"""
+
+from __future__ import annotations
+
+import os
+import zipfile
+
+import pytest
+
+from xtochd.engine import ConversionEngine, ConversionEvents
+
+pytestmark = pytest.mark.usefixtures("isolated_temp")
+
+
+def _make_zips(directory, *stems):
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for stem in stems:
+        p = directory / f"{stem}.zip"
+        with zipfile.ZipFile(p, "w") as z:
+            z.writestr(f"{stem}.iso", b"\x00" * 4096)
+            z.writestr("readme.txt", b"hello")
+        paths.append(str(p))
+    return paths
+
+
+def _make_isos(directory, *names):
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        p = directory / name
+        p.write_bytes(b"\x00" * 4096)
+        paths.append(str(p))
+    return paths
+
+
+def test_parallel_pool_converts_every_input(tmp_path, fake_chdman):
+    inputs = _make_isos(tmp_path / "in", "a.iso", "b.iso", "c.iso", "d.iso")
+    out = tmp_path / "out"
+    engine = ConversionEngine(inputs, str(out), fake_chdman, max_jobs=3)
+    engine.run()
+    assert engine.stats.successful_conversions == 4
+    assert engine.stats.failed_conversions == 0
+    assert sorted(os.listdir(out)) == ["a.chd", "b.chd", "c.chd", "d.chd"]
+    assert engine.stats.original_size == 4 * 4096
+
+
+def test_same_stem_is_converted_once_across_jobs(tmp_path, fake_chdman):
+    """Two inputs that map to one .chd must not both run chdman."""
+    first = _make_isos(tmp_path / "one", "game.iso")
+    second = _make_isos(tmp_path / "two", "game.iso")
+    engine = ConversionEngine(first + second, str(tmp_path / "out"), fake_chdman, max_jobs=2)
+    engine.run()
+    assert engine.stats.successful_conversions == 1
+    assert engine.stats.skipped_files == 1
+
+
+def test_existing_chd_is_skipped(tmp_path, fake_chdman):
+    inputs = _make_isos(tmp_path / "in", "done.iso")
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "done.chd").write_bytes(b"chd")
+    engine = ConversionEngine(inputs, str(out), fake_chdman, max_jobs=2)
+    engine.run()
+    assert engine.stats.skipped_files_list == ["done.iso"]
+    assert engine.stats.successful_conversions == 0
+
+
+@pytest.mark.parametrize("max_jobs,prefetch", [(1, 0), (1, 1), (2, 2)])
+def test_archive_pipeline_converts_and_frees_temp(tmp_path, fake_chdman, isolated_temp,
+                                                  max_jobs, prefetch):
+    inputs = _make_zips(tmp_path / "in", "a", "b", "c")
+    inputs += _make_isos(tmp_path / "loose", "d.iso")
+    out = tmp_path / "out"
+    engine = ConversionEngine(
+        inputs, str(out), fake_chdman, max_jobs=max_jobs, prefetch_archives=prefetch
+    )
+    engine.run()
+    assert engine.stats.successful_conversions == 4
+    assert sorted(os.listdir(out)) == ["a.chd", "b.chd", "c.chd", "d.chd"]
+    # Each archive's temp dir is released as soon as its job finishes.
+    assert engine.temp_dirs == []
+    assert os.listdir(isolated_temp) == []
+
+
+def test_cancel_before_run_unblocks_pipeline(tmp_path, fake_chdman):
+    inputs = _make_zips(tmp_path / "in", "a", "b")
+    engine = ConversionEngine(inputs, str(tmp_path / "out"), fake_chdman, prefetch_archives=1)
+    engine.cancel()
+    engine.run()
+    assert engine.stats.successful_conversions == 0
+
+
+def test_events_receive_log_and_final_progress(tmp_path, fake_chdman):
+    inputs = _make_isos(tmp_path / "in", "a.iso")
+    logs, progress = [], []
+    engine = ConversionEngine(
+        inputs, str(tmp_path / "out"), fake_chdman,
+        events=ConversionEvents(log_updated=logs.append, progress_updated=progress.append),
+    )
+    engine.run()
+    assert "CONVERSION SUMMARY" in logs
+    assert progress[-1] == 100
+
+
+def _record_extracts(monkeypatch):
+    """Return a list that collects every member name ZipFile.extract is given."""
+    extracted = []
+    real_extract = zipfile.ZipFile.extract
+
+    def extract(self, member, path=None, pwd=None):
+        extracted.append(member)
+        return real_extract(self, member, path, pwd)
+
+    monkeypatch.setattr(zipfile.ZipFile, "extract", extract)
+    return extracted
+
+
+def test_zip_extracts_only_the_index_and_its_tracks(tmp_path, fake_chdman, monkeypatch):
+    src = tmp_path / "in" / "set.zip"
+    src.parent.mkdir()
+    with zipfile.ZipFile(src, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr(
+            "Game/Game.cue",
+            'FILE "game (track 1).bin" BINARY\nFILE "Game (Track 2).bin" BINARY\n',
+        )
+        z.writestr("Game/Game (Track 1).bin", b"\x00" * 4096)
+        z.writestr("Game/Game (Track 2).bin", b"\x00" * 4096)
+        z.writestr("Game/readme.txt", b"hello")
+        z.writestr("Artwork/cover.png", b"png")
+
+    extracted = _record_extracts(monkeypatch)
+    engine = ConversionEngine([str(src)], str(tmp_path / "out"), fake_chdman)
+    engine.run()
+    assert engine.stats.successful_conversions == 1
+    assert sorted(extracted) == [
+        "Game/Game (Track 1).bin", "Game/Game (Track 2).bin", "Game/Game.cue",
+    ]
+
+
+def test_zip_with_unmatched_reference_extracts_everything(tmp_path, fake_chdman, monkeypatch):
+    src = tmp_path / "in" / "odd.zip"
+    src.parent.mkdir()
+    with zipfile.ZipFile(src, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("odd.cue", 'FILE "elsewhere.bin" BINARY\n')
+        z.writestr("odd.bin", b"\x00" * 4096)
+        z.writestr("readme.txt", b"hello")
+
+    extracted = _record_extracts(monkeypatch)
+    ConversionEngine([str(src)], str(tmp_path / "out"), fake_chdman).run()
+    assert sorted(extracted) == ["odd.bin", "odd.cue", "readme.txt"]
+
+
+def test_archive_larger_than_temp_budget_is_skipped(tmp_path, fake_chdman):
+    inputs = _make_zips(tmp_path / "in", "big")
+    engine = ConversionEngine(inputs, str(tmp_path / "out"), fake_chdman, temp_limit=1024)
+    engine.run()
+    assert engine.stats.failed_files == ["big.zip"]
+    assert engine.stats.successful_conversions == 0
+
+
+def test_temp_budget_serialises_archives_that_only_fit_one_at_a_time(
+    tmp_path, fake_chdman, isolated_temp
+):
+    inputs = _make_zips(tmp_path / "in", "a", "b", "c")
+    engine = ConversionEngine(
+        inputs, str(tmp_path / "out"), fake_chdman,
+        max_jobs=3, prefetch_archives=1, temp_limit=6000,
+    )
+    engine.run()
+    assert engine.stats.successful_conversions == 3
+    assert engine.temp_budget.reserved == 0
+    assert os.listdir(isolated_temp) == []
+
+
+def test_parse_bsdtar_verbose_listing():
+    from xtochd.engine import _parse_verbose_listing
+
+    out = (
+        "drwxr-xr-x  0 0      0           0 Oct 16 03:52 set/\n"
+        "-rw-r--r--  0 user   staff    5000 Jan  1  2020 set/My Game (Disc 1).iso\n"
+        "-rw-r--r--  0 0      0           3 Oct 16 03:52 set/readme.txt\n"
+    )
+    assert _parse_verbose_listing(out) == (
+        ["set/My Game (Disc 1).iso", "set/readme.txt"], 5003,
+    )
+    assert _parse_verbose_listing("garbage line\n") is None
+
+
+def test_output_is_staged_as_partial_in_output_dir(tmp_path, fake_chdman):
+    inputs = _make_isos(tmp_path / "in", "game.iso")
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "game.chd.partial").write_bytes(b"stale from a crashed run")
+    engine = ConversionEngine(inputs, str(out), fake_chdman)
+    engine.run()
+    assert engine.stats.successful_conversions == 1
+    assert os.listdir(out) == ["game.chd"]
+    # Nothing is written beside the input any more.
+    assert os.listdir(tmp_path / "in") == ["game.iso"]
+
+
+def test_failed_conversion_leaves_no_partial(tmp_path, make_fake_chdman):
+    failing = make_fake_chdman(output=b"half", exit_code=1)
+    inputs = _make_isos(tmp_path / "in", "bad.iso")
+    out = tmp_path / "out"
+    engine = ConversionEngine(inputs, str(out), failing)
+    engine.run()
+    assert engine.stats.failed_files == ["bad.iso"]
+    assert os.listdir(out) == []
+
+
+def test_journal_records_each_job_outcome(tmp_path, fake_chdman):
+    from xtochd.journal import RunJournal, load_run
+
+    good = _make_isos(tmp_path / "in", "good.iso")
+    zips = _make_zips(tmp_path / "zips", "packed")
+    path = tmp_path / "last_run.jsonl"
+    engine = ConversionEngine(
+        good + zips + [str(tmp_path / "in" / "gone.iso")],
+        str(tmp_path / "out"), fake_chdman, journal=RunJournal(str(path)),
+    )
+    engine.run()
+    record = load_run(str(path))
+    assert record.completed
+    assert [record.state_of(job) for job in (1, 2, 3)] == ["done", "done", "failed"]
+
+
+def test_cancelled_run_leaves_unfinished_jobs_resumable(tmp_path, fake_chdman):
+    from xtochd.journal import RunJournal, load_run
+
+    inputs = _make_isos(tmp_path / "in", "a.iso", "b.iso")
+    path = tmp_path / "last_run.jsonl"
+    engine = ConversionEngine(
+        inputs, str(tmp_path / "out"), fake_chdman, journal=RunJournal(str(path))
+    )
+    engine.cancel()
+    engine.run()
+    record = load_run(str(path))
+    assert record.resumable
+    assert record.remaining() == inputs
+
+
+def test_output_index_lists_finished_chds_once(tmp_path):
+    from xtochd.engine import OutputIndex
+
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "done.chd").write_bytes(b"x")
+    (out / "half.chd.partial").write_bytes(b"x")
+    (out / "notes.txt").write_bytes(b"x")
+    index = OutputIndex(str(out))
+    assert index.load() == 1
+    assert str(out / "done.chd") in index
+    assert "half.chd" not in index
+    index.add(str(out / "new.chd"))
+    assert "new.chd" in index
+
+
+def test_existing_chd_in_zip_is_skipped_without_extracting(tmp_path, fake_chdman, monkeypatch):
+    extracted = _record_extracts(monkeypatch)
+    zips = _make_zips(tmp_path / "in", "game")
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "game.chd").write_bytes(b"already converted")
+    engine = ConversionEngine(zips, str(out), fake_chdman)
+    engine.run()
+    assert engine.stats.skipped_files_list == ["game"]
+    assert extracted == []
+
+
+def test_dedup_converts_identical_discs_once_and_links_the_copy(tmp_path, fake_chdman):
+    first = _make_isos(tmp_path / "usa", "Game (USA).iso")
+    second = _make_isos(tmp_path / "eur", "Game (Europe).iso")
+    out = tmp_path / "out"
+    engine = ConversionEngine(first + second, str(out), fake_chdman, dedup=True)
+    engine.run()
+    assert engine.stats.successful_conversions == 1
+    assert sorted(os.listdir(out)) == ["Game (Europe).chd", "Game (USA).chd"]
+    assert engine.stats.duplicate_files == [("Game (Europe).chd", "Game (USA).chd", True)]
+    assert os.path.samefile(out / "Game (Europe).chd", out / "Game (USA).chd")
+
+
+def test_parse_chdman_progress_lines():
+    from xtochd.engine import parse_chdman_progress
+
+    assert parse_chdman_progress("Compressing, 45.2% complete... (ratio=51.3%)\n") == (0.452, 51.3)
+    assert parse_chdman_progress("Compressing, 100.0% complete...") == (1.0, None)
+    assert parse_chdman_progress("Compression complete ... final ratio = 48.0%") is None
+    assert parse_chdman_progress("chdman - MAME Compressed Hunks of Data manager") is None
+
+
+def test_format_duration():
+    from xtochd.engine import format_duration
+
+    assert format_duration(-1) == "--:--"
+    assert format_duration(75) == "1:15"
+    assert format_duration(3725) == "1:02:05"
+
+
+def test_chdman_progress_drives_job_progress_and_rates(tmp_path, make_fake_chdman):
+    chatty = make_fake_chdman(stderr_lines=[
+        f"Compressing, {pct:.1f}% complete... (ratio=40.0%)\r" for pct in (25.0, 50.0, 100.0)
+    ])
+    inputs = _make_isos(tmp_path / "in", "big.iso")
+    percents, rates, batch = [], [], []
+    events = ConversionEvents(
+        job_progress=lambda job, pct: percents.append(pct),
+        job_rate=lambda job, mbps, eta: rates.append((job, mbps, eta)),
+        batch_rate=lambda mbps, eta: batch.append((mbps, eta)),
+    )
+    engine = ConversionEngine(inputs, str(tmp_path / "out"), chatty, events=events)
+    engine.run()
+    assert engine.stats.successful_conversions == 1
+    # First update and the final 100% always get through the rate limit.
+    assert 25 in percents and percents[-1] == 100
+    assert rates and rates[0][0] == 1 and rates[-1][2] == 0
+    assert batch
+
+
+def _make_cue_sets(directory, *stems, size=4096):
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for stem in stems:
+        (directory / f"{stem}.bin").write_bytes(b"\x00" * size)
+        cue = directory / f"{stem}.cue"
+        cue.write_text(f'FILE "{stem}.bin" BINARY\n  TRACK 01 MODE1/2352\n')
+        paths.append(str(cue))
+    return paths
+
+
+def test_job_rate_is_sized_by_the_discs_own_tracks(tmp_path, fake_chdman, monkeypatch):
+    cues = _make_cue_sets(tmp_path / "in", "a", "b", "c")
+    engine = ConversionEngine(cues, str(tmp_path / "out"), fake_chdman)
+    sizes = []
+    reporter = engine._chdman_progress_reporter
+
+    def recording(job, name, size, span):
+        sizes.append(size)
+        return reporter(job, name, size, span)
+
+    monkeypatch.setattr(engine, "_chdman_progress_reporter", recording)
+    engine.run()
+    assert engine.stats.successful_conversions == 3
+    assert sizes == [4096, 4096, 4096]
+
+
+def test_profile_stats_count_each_index_by_its_own_tracks(tmp_path, fake_chdman):
+    from xtochd.timing import CHDMAN
+
+    cues = _make_cue_sets(tmp_path / "in", "a", "b", "c")
+    engine = ConversionEngine(cues, str(tmp_path / "out"), fake_chdman)
+    engine.run()
+    assert engine.stats.converted_bytes == 3 * 4096
+    assert [s.nbytes for s in engine.stats.spans if s.stage == CHDMAN] == [4096] * 3
+
+
+def test_batch_rate_only_counts_jobs_that_converted(tmp_path):
+    import time
+
+    batch = []
+    engine = ConversionEngine(
+        ["skipped.iso", "running.iso"], str(tmp_path), "chdman",
+        events=ConversionEvents(batch_rate=lambda mbps, eta: batch.append((mbps, eta))),
+    )
+    engine._weigh_jobs({"skipped.iso": 1024**3, "running.iso": 2 * 1024**2})
+    engine._finish_job(1)  # its .chd already existed: no work done
+    engine._run_started = time.monotonic() - 1
+    engine._set_job_progress(2, 0.5)
+    mbps, eta = batch[-1]
+    assert mbps < 1.5  # ~1 MB in ~1 s, not the skipped GB
+    assert eta > 0
+
+
+def test_chdman_output_is_kept_as_a_bounded_tail(tmp_path, make_fake_chdman):
+    from xtochd.engine import CHDMAN_TAIL_LINES
+
+    noisy = make_fake_chdman(
+        stderr_lines=[f"Compressing, {i / 50:.1f}% complete... (ratio=40.0%)\r" for i in range(5000)]
+        + [f"warning {i}\n" for i in range(200)]
+        + ["Error: input file not found\n"],
+        exit_code=1,
+    )
+    engine = ConversionEngine([], str(tmp_path), noisy)
+    code, _out, err = engine._run_chdman([noisy])
+    assert code == 1
+    lines = err.splitlines()
+    assert len(lines) == CHDMAN_TAIL_LINES
+    assert lines[-1] == "Error: input file not found"
+    assert "Compressing" not in err
+
+
+def test_profile_options_reach_chdman_and_stats(tmp_path, make_fake_chdman):
+    from xtochd.profiles import PROFILES
+
+    argv_log = tmp_path / "argv.txt"
+    recorder = make_fake_chdman(argv_log=argv_log)
+    inputs = _make_isos(tmp_path / "in", "game.iso")
+    engine = ConversionEngine(
+        inputs, str(tmp_path / "out"), recorder, profile=PROFILES["fast"]
+    )
+    engine.run()
+    assert "-c cdzs,cdzl,cdfl -np " in argv_log.read_text()
+    assert engine.stats.profile.startswith("fast")
+    assert engine.stats.converted_bytes == 4096
+    assert engine.stats.chdman_seconds > 0
+
+
+def test_scheduler_threads_reach_chdman_and_pinned_profile_wins(tmp_path, make_fake_chdman):
+    from xtochd.profiles import ChdmanProfile
+    from xtochd.scheduling import CpuScheduler
+
+    argv_log = tmp_path / "argv.txt"
+    recorder = make_fake_chdman(argv_log=argv_log)
+    sched = CpuScheduler(cpus=6)
+    engine = ConversionEngine(
+        _make_isos(tmp_path / "one", "a.iso"), str(tmp_path / "out"), recorder,
+        cpu_scheduler=sched,
+    )
+    engine.run()
+    assert argv_log.read_text().split()[-2:] == ["-np", "6"]
+    assert sched.in_use == 0
+
+    argv_log.unlink()
+    pinned = ChdmanProfile("pinned", "", processors=3)
+    engine = ConversionEngine(
+        _make_isos(tmp_path / "two", "b.iso"), str(tmp_path / "out"), recorder,
+        profile=pinned, cpu_scheduler=sched,
+    )
+    engine.run()
+    assert argv_log.read_text().split().count("-np") == 1
+    assert argv_log.read_text().split()[-2:] == ["-np", "3"]
+
+
+def test_largest_first_orders_jobs_by_unpacked_size(tmp_path, fake_chdman):
+    from xtochd.journal import RunJournal, load_run
+
+    small = _make_isos(tmp_path / "in", "small.iso")
+    # Highly compressible: the zip is tiny on disk but unpacks to the most.
+    big = tmp_path / "in" / "big.zip"
+    with zipfile.ZipFile(big, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("big.iso", b"\x00" * 65536)
+    mid = tmp_path / "in" / "mid.iso"
+    mid.write_bytes(b"\x00" * 8192)
+    path = tmp_path / "last_run.jsonl"
+    logs = []
+    engine = ConversionEngine(
+        small + [str(big), str(mid)], str(tmp_path / "out"), fake_chdman,
+        journal=RunJournal(str(path)), order="largest-first",
+        events=ConversionEvents(log_updated=logs.append),
+    )
+    engine.run()
+    assert load_run(str(path)).files == [str(big), str(mid)] + small
+    assert engine.stats.successful_conversions == 3
+    assert "Job order: largest-first" in logs
+
+
+def test_listed_order_sizes_each_input_only_when_its_job_starts(
+    tmp_path, fake_chdman, monkeypatch
+):
+    from xtochd import engine as engine_module
+
+    sized = []
+    input_bytes = engine_module._input_bytes
+
+    def recording(path):
+        sized.append(path)
+        return input_bytes(path)
+
+    monkeypatch.setattr(engine_module, "_input_bytes", recording)
+    inputs = _make_isos(tmp_path / "in", "a.iso", "b.iso")
+    engine = ConversionEngine(inputs, str(tmp_path / "out"), fake_chdman)
+    engine.cancel()
+    engine.run()
+    assert sized == []  # nothing started, nothing sized
+
+    engine = ConversionEngine(inputs, str(tmp_path / "out"), fake_chdman)
+    engine.run()
+    assert engine.stats.successful_conversions == 2
+    assert engine._job_weights == {1: 4096, 2: 4096}
+
+
+def test_unweighed_jobs_count_as_the_mean_of_weighed_ones(tmp_path):
+    engine = ConversionEngine(["a.iso", "b.iso", "c.iso"], str(tmp_path), "chdman")
+    engine._weigh_jobs()
+    assert engine._estimated_total_weight() == 3
+    engine._job_weights, engine._total_weight = {1: 100}, 100
+    assert engine._estimated_total_weight() == 300
+
+
+def test_verify_checks_each_chd_and_removes_a_bad_one(tmp_path, fake_chdman):
+    from xtochd.journal import RunJournal, load_run
+
+    good = _make_isos(tmp_path / "in", "good.iso")
+    bad = tmp_path / "in" / "bad.iso"
+    bad.write_bytes(b"")  # the fake chdman's verify fails empty files
+    out = tmp_path / "out"
+    path = tmp_path / "last_run.jsonl"
+    engine = ConversionEngine(
+        good + [str(bad)], str(out), fake_chdman, max_jobs=2,
+        journal=RunJournal(str(path)), verify=True,
+    )
+    engine.run()
+    assert engine.stats.verified_files == ["good.chd"]
+    assert engine.stats.verify_failed_files == ["bad.chd"]
+    assert (engine.stats.successful_conversions, engine.stats.failed_conversions) == (1, 1)
+    assert [f.name for f in engine.stats.successful_files] == ["good.chd"]
+    assert os.listdir(out) == ["good.chd"]
+    assert "bad.chd" not in engine.existing_outputs
+    record = load_run(str(path))
+    assert record.remaining(retry_failed=True) == [str(bad)]
+
+
+def test_each_job_stage_is_timed_and_summarised(tmp_path, fake_chdman):
+    zips = _make_zips(tmp_path / "zips", "packed")
+    logs = []
+    engine = ConversionEngine(
+        zips, str(tmp_path / "out"), fake_chdman,
+        events=ConversionEvents(log_updated=logs.append),
+    )
+    engine.run()
+    spans = {s.stage: s for s in engine.stats.spans}
+    assert {"temp_dir", "list", "extract", "walk", "chdman", "publish", "cleanup"} <= set(spans)
+    assert all(s.job == 1 for s in engine.stats.spans)
+    assert spans["extract"].nbytes == 4096
+    assert spans["chdman"].nbytes == 4096
+    assert spans["publish"].nbytes == 4096
+    if hasattr(os, "wait4"):
+        assert spans["chdman"].cpu > 0  # the fake chdman's own CPU time
+    assert any(line.startswith("TIMING BY STAGE") for line in logs)
+
+
+def test_corrupt_zip_is_journaled_failed_not_done(tmp_path, fake_chdman):
+    from xtochd.journal import RunJournal, load_run
+
+    bad = tmp_path / "in" / "bad.zip"
+    bad.parent.mkdir()
+    payload = os.urandom(4096)
+    with zipfile.ZipFile(bad, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("bad.iso", payload)
+    # Scramble the deflate stream, leaving the zip directory intact.
+    raw = bytearray(bad.read_bytes())
+    start = raw.index(b"bad.iso") + len("bad.iso")
+    raw[start:start + 200] = b"\xff" * 200
+    bad.write_bytes(bytes(raw))
+    path = tmp_path / "last_run.jsonl"
+    engine = ConversionEngine(
+        [str(bad)], str(tmp_path / "out"), fake_chdman, journal=RunJournal(str(path))
+    )
+    engine.run()
+    assert engine.stats.failed_conversions == 1
+    assert load_run(str(path)).state_of(1) == "failed"
+
+
+def test_job_that_escapes_its_bookkeeping_does_not_abort_the_batch(
+    tmp_path, fake_chdman, monkeypatch
+):
+    from xtochd.journal import RunJournal, load_run
+
+    inputs = _make_isos(tmp_path / "in", "a.iso", "b.iso")
+    path = tmp_path / "last_run.jsonl"
+    logs = []
+    engine = ConversionEngine(
+        inputs, str(tmp_path / "out"), fake_chdman, journal=RunJournal(str(path)),
+        events=ConversionEvents(log_updated=logs.append),
+    )
+    start_job = engine._start_job
+
+    def flaky_start(job):
+        if job == 1:
+            raise RuntimeError("bookkeeping bug")
+        start_job(job)
+
+    monkeypatch.setattr(engine, "_start_job", flaky_start)
+    engine.run()
+    assert engine.stats.successful_conversions == 1
+    assert engine.stats.failed_conversions == 1
+    record = load_run(str(path))
+    assert record.completed
+    assert record.state_of(1) == "failed"
+    assert "CONVERSION SUMMARY" in logs
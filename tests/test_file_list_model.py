@@ -0,0 +1,101 @@
+"""FileListModel: the columnar model behind the main window's file list."""
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import Qt  # noqa: E402
+
+from xtochd.file_list_model import (  # noqa: E402
+    PENDING_MSG,
+    ROLE_FILE_INFO,
+    ROLE_FILE_PATH,
+    FileListModel,
+)
+
+
+def _info(path, **extra):
+    info = {
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "size": 10,
+        "size_str": "10 B",
+        "extension": ".iso",
+        "validation_msg": PENDING_MSG,
+    }
+    info.update(extra)
+    return info
+
+
+def _model(n=3):
+    model = FileListModel()
+    model.append_files(_info(f"/d/f{i}.iso") for i in range(n))
+    return model
+
+
+def test_append_tracks_rows_and_checked_count():
+    model = _model(3)
+    assert model.rowCount() == 3
+    assert model.checked_count == 3
+    assert model.row_of("/d/f2.iso") == 2
+    # Already-listed paths are not added twice.
+    model.append_files([_info("/d/f0.iso")])
+    assert model.rowCount() == 3
+
+
+def test_pending_rows_have_no_is_valid_until_set():
+    model = _model(1)
+    idx = model.index(0)
+    assert "is_valid" not in model.data(idx, ROLE_FILE_INFO)
+    assert model.data(idx, ROLE_FILE_PATH) == "/d/f0.iso"
+
+    assert model.set_file_info("/d/f0.iso", _info("/d/f0.iso", is_valid=False,
+                                                  validation_msg="bad"))
+    info = model.data(idx, ROLE_FILE_INFO)
+    assert info["is_valid"] is False
+    assert info["validation_msg"] == "bad"
+    assert not model.set_file_info("/d/missing.iso", {})
+
+    model.reset_validation()
+    assert "is_valid" not in model.file_info(0)
+    assert model.file_info(0)["validation_msg"] == PENDING_MSG
+
+
+def test_check_state_and_bulk_toggle():
+    model = _model(3)
+    assert model.setData(model.index(1), Qt.Unchecked, Qt.CheckStateRole)
+    assert model.checked_count == 2
+    assert model.checked_paths() == ["/d/f0.iso", "/d/f2.iso"]
+
+    model.set_all_checked(False)
+    assert model.checked_count == 0
+    model.set_all_checked(True)
+    assert model.checked_count == 3
+
+
+def test_remove_paths_reindexes_rows():
+    model = _model(4)
+    model.setData(model.index(1), Qt.Unchecked, Qt.CheckStateRole)
+    model.remove_paths(["/d/f1.iso", "/d/f2.iso", "/d/unknown.iso"])
+    assert model.paths() == ["/d/f0.iso", "/d/f3.iso"]
+    assert model.row_of("/d/f3.iso") == 1
+    assert model.row_of("/d/f1.iso") is None
+    assert model.checked_count == 2
+
+    model.clear()
+    assert model.rowCount() == 0
+    assert model.checked_count == 0
+
+
+def test_summary_follows_rows():
+    model = _model(3)
+    model.set_file_info("/d/f0.iso", _info("/d/f0.iso", size=40, is_valid=True))
+    model.set_file_info("/d/f1.iso", _info("/d/f1.iso", is_valid=False))
+    summary = model.summary
+    assert (summary.valid, summary.invalid, summary.valid_size) == (1, 1, 40)
+
+    model.remove_paths(["/d/f0.iso"])
+    assert (summary.total, summary.valid, summary.valid_size) == (2, 0, 0)
+
+    model.reset_validation()
+    assert summary.pending == 2
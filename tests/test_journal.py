@@ -0,0 +1,118 @@
+"""Tests for the append-only run journal behind "resume last run"."""
+
+from __future__ import annotations
+
+import json
+
+from xtochd.journal import (
+    CONVERTING,
+    DONE,
+    EXTRACTING,
+    FAILED,
+    RunJournal,
+    load_run,
+)
+
+
+def _write_run(path, files, *states, end=None):
+    journal = RunJournal(str(path))
+    journal.begin(files, "/out")
+    for job, state in states:
+        journal.record(job, state)
+    if end is None:
+        journal.close()
+    else:
+        journal.end(completed=end)
+
+
+def test_interrupted_run_lists_unfinished_inputs(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    _write_run(
+        path, ["a.zip", "b.zip", "c.iso", "d.iso"],
+        (1, EXTRACTING), (1, CONVERTING), (1, DONE),
+        (2, EXTRACTING), (3, CONVERTING), (3, FAILED),
+    )
+    record = load_run(str(path))
+    assert record.output_dir == "/out"
+    assert not record.completed
+    assert record.state_of(2) == EXTRACTING
+    assert record.remaining() == ["b.zip", "d.iso"]
+    assert record.remaining(retry_failed=True) == ["b.zip", "c.iso", "d.iso"]
+    assert record.resumable
+
+
+def test_completed_run_is_not_resumable(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    _write_run(path, ["a.iso"], (1, FAILED), end=True)
+    assert not load_run(str(path)).resumable
+
+
+def test_stopped_run_stays_resumable(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    _write_run(path, ["a.iso", "b.iso"], (1, DONE), end=False)
+    record = load_run(str(path))
+    assert record.resumable
+    assert record.remaining() == ["b.iso"]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    _write_run(path, ["a.iso", "b.iso"], (1, DONE))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"job": 2, "state": DONE})[:7])
+    assert load_run(str(path)).remaining() == ["b.iso"]
+
+
+def test_failed_verification_fails_its_job_whatever_the_order(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    journal = RunJournal(str(path))
+    journal.begin(["a.iso", "b.zip"], "/out")
+    journal.record(1, DONE)
+    journal.record_verify(1, "a.chd", True)
+    # Job 2's disc is verified before the job itself is journaled done.
+    journal.record_verify(2, "b.chd", False)
+    journal.record(2, DONE)
+    journal.end(completed=True)
+    record = load_run(str(path))
+    assert record.verified == {"a.chd": True, "b.chd": False}
+    assert record.state_of(1) == DONE
+    assert record.state_of(2) == FAILED
+    assert record.remaining(retry_failed=True) == ["b.zip"]
+
+
+def test_completed_run_only_offers_its_failures_for_retry(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    _write_run(path, ["a.iso", "b.iso"], (1, FAILED), (2, DONE), end=True)
+    record = load_run(str(path))
+    assert record.remaining() == []
+    assert record.remaining(retry_failed=True) == ["a.iso"]
+
+
+def test_carried_failures_survive_a_resume(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    journal = RunJournal(str(path), carried_failures=["old.iso"])
+    journal.begin(["b.iso"], "/out")
+    journal.record(1, DONE)
+    journal.end(completed=True)
+    record = load_run(str(path))
+    assert record.failed() == ["old.iso"]
+    assert record.remaining(retry_failed=True) == ["old.iso"]
+
+
+def test_begin_replaces_the_previous_run(tmp_path):
+    path = tmp_path / "last_run.jsonl"
+    _write_run(path, ["old.iso"], (1, DONE), end=True)
+    _write_run(path, ["new.iso"])
+    assert load_run(str(path)).files == ["new.iso"]
+
+
+def test_missing_journal_loads_as_none(tmp_path):
+    assert load_run(str(tmp_path / "nope.jsonl")) is None
+
+
+def test_unwritable_journal_is_a_no_op(tmp_path):
+    journal = RunJournal(str(tmp_path / "missing-dir" / "last_run.jsonl"))
+    journal.begin(["a.iso"], "/out")
+    journal.record(1, DONE)
+    journal.end(completed=True)
+    assert not journal.enabled
@@ -0,0 +1,33 @@
+"""ListSummary: running totals for the file list."""
+
+from xtochd.list_summary import ListSummary
+
+
+def test_rows_count_by_validation_state():
+    s = ListSummary()
+    s.add_row(True, None, 100)
+    s.add_row(True, True, 200)
+    s.add_row(False, False, 50)
+    assert (s.total, s.checked, s.valid, s.invalid, s.valid_size) == (3, 2, 1, 1, 200)
+    assert s.pending == 1
+
+    s.remove_row(True, True, 200)
+    assert (s.total, s.checked, s.valid, s.valid_size) == (2, 1, 0, 0)
+
+
+def test_validation_and_check_transitions():
+    s = ListSummary()
+    s.add_row(True, None, 100)
+    s.set_validation(None, 100, True, 120)
+    assert (s.valid, s.valid_size, s.pending) == (1, 120, 0)
+    # Re-validated as invalid: the old contribution is backed out.
+    s.set_validation(True, 120, False, 120)
+    assert (s.valid, s.invalid, s.valid_size) == (0, 1, 0)
+
+    s.set_checked(True, False)
+    assert s.checked == 0
+
+    s.clear_validation()
+    assert (s.validated, s.total) == (0, 1)
+    s.reset()
+    assert s == ListSummary()
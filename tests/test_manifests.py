@@ -0,0 +1,34 @@
+"""Tests for the index parsers that drive selective archive extraction."""
+
+from xtochd.manifests import IndexReferences, parse_index, resolve_members
+
+
+def test_cue_quoted_and_unquoted_files():
+    cue = (
+        'FILE "Game (Track 1).bin" BINARY\n'
+        "  TRACK 01 MODE2/2352\n"
+        "FILE track2.bin BINARY\n"
+        'FILE "Game (Track 1).bin" BINARY\n'
+    )
+    assert parse_index("Game.cue", cue).required == ["Game (Track 1).bin", "track2.bin"]
+
+
+def test_gdi_toc_and_ccd():
+    gdi = '3\n1 0 4 2352 track01.bin 0\n2 600 0 2352 "Track 02.raw" 0\n'
+    assert parse_index("disc.gdi", gdi).required == ["track01.bin", "Track 02.raw"]
+
+    toc = 'CD_ROM\n// FILE "old.bin" 0\nTRACK MODE1\nDATAFILE "data.bin"\nFILE audio.bin 0\n'
+    assert parse_index("disc.toc", toc).required == ["data.bin", "audio.bin"]
+
+    refs = parse_index("sub/Disc.ccd", "[CloneCD]\n")
+    assert refs == IndexReferences(required=["Disc.img"], optional=["Disc.sub"])
+
+
+def test_resolve_is_relative_to_index_and_case_insensitive():
+    members = ["set/Game.cue", "set/GAME.BIN", "set/tracks/t2.bin", "readme.txt"]
+    refs = IndexReferences(required=["game.bin", "tracks\\t2.bin"], optional=["x.sub"])
+    assert resolve_members("set/Game.cue", refs, members) == [
+        "set/GAME.BIN", "set/tracks/t2.bin",
+    ]
+    refs.required.append("missing.bin")
+    assert resolve_members("set/Game.cue", refs, members) is None
@@ -0,0 +1,33 @@
+"""Tests for chdman compression profiles."""
+
+from __future__ import annotations
+
+from xtochd.profiles import DEFAULT_PROFILE, PROFILES, ChdmanProfile, valid_hunk_size
+
+
+def test_default_profile_adds_no_options():
+    assert DEFAULT_PROFILE.args() == []
+    assert DEFAULT_PROFILE.summary() == "default (chdman defaults)"
+
+
+def test_profile_maps_to_chdman_options():
+    profile = ChdmanProfile("x", "", codecs=("cdzs", "cdfl"), hunk_size=19584, processors=2)
+    assert profile.args() == ["-c", "cdzs,cdfl", "-hs", "19584", "-np", "2"]
+    assert profile.summary() == "x (codecs cdzs,cdfl, hunk 19584 B, 2 threads)"
+
+
+def test_archival_keeps_lzma_and_fast_drops_it():
+    assert "cdlz" in PROFILES["archival"].codecs
+    assert "cdlz" not in PROFILES["fast"].codecs
+
+
+def test_archival_uses_bigger_whole_frame_hunks():
+    hunk = PROFILES["archival"].hunk_size
+    assert valid_hunk_size(hunk) and hunk > 8 * 2448
+    assert PROFILES["archival"].args()[-2:] == ["-hs", str(hunk)]
+
+
+def test_hunk_size_must_be_whole_cd_frames():
+    assert valid_hunk_size(2448 * 8)
+    assert not valid_hunk_size(4096)
+    assert not valid_hunk_size(0)
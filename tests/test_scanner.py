@@ -0,0 +1,141 @@
+"""Tests for file discovery and the same-disc merge rules in ``xtochd.scanner``."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from xtochd import scanner
+from xtochd.scanner import (
+    DirTimings,
+    FoundFileIndex,
+    iter_scan,
+    merge_found_files,
+    scan_paths,
+)
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    return str(path)
+
+
+def test_scan_skips_hidden_dirs_and_unknown_exts(tmp_path):
+    keep = _touch(tmp_path / "games" / "a.iso")
+    _touch(tmp_path / ".trash" / "b.iso")
+    _touch(tmp_path / "games" / "notes.txt")
+    assert scan_paths([str(tmp_path)]) == [keep]
+
+
+def test_scan_accepts_plain_files_and_reports_each(tmp_path):
+    iso = _touch(tmp_path / "a.iso")
+    seen = []
+    assert scan_paths([iso], on_found=seen.append) == [iso]
+    assert seen == [iso]
+
+
+def test_iter_scan_streams_nested_dirs_without_following_dir_links(tmp_path):
+    expected = {
+        _touch(tmp_path / "a" / "one.cue"),
+        _touch(tmp_path / "a" / "b" / "two.bin"),
+        _touch(tmp_path / "c" / "three.zip"),
+    }
+    try:
+        os.symlink(tmp_path / "a", tmp_path / "link", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pass
+    it = iter_scan([str(tmp_path), str(tmp_path / "missing")])
+    first = next(it)  # results arrive before the walk is exhausted
+    assert {first, *it} == expected
+
+
+def test_parallel_scan_matches_serial_and_times_each_dir(tmp_path):
+    for d in range(6):
+        for f in range(3):
+            _touch(tmp_path / f"d{d}" / f"sub{f}" / f"g{d}{f}.iso")
+    _touch(tmp_path / "d0" / ".hidden" / "skip.iso")
+    _touch(tmp_path / "d1" / "readme.txt")
+
+    timings = DirTimings(keep=3)
+    parallel = scan_paths([str(tmp_path)], workers=4, on_dir_listed=timings)
+    assert sorted(parallel) == sorted(scan_paths([str(tmp_path)]))
+    assert len(parallel) == 18
+    # root + 6 dirs + 18 subdirs; the hidden dir is never listed.
+    assert timings.dirs == 25
+    slowest = timings.slowest()
+    assert len(slowest) == 3
+    assert [t for _, t in slowest] == sorted((t for _, t in slowest), reverse=True)
+
+
+def test_merge_keeps_companions():
+    found = []
+    result = merge_found_files(found, ["d/game.cue", "d/game.bin"])
+    assert found == ["d/game.cue", "d/game.bin"]
+    assert result.duplicates == []
+
+
+def test_merge_better_format_replaces_existing():
+    found = ["d/game.zip"]
+    result = merge_found_files(found, ["e/game.iso"])
+    assert found == ["e/game.iso"]
+    assert result.replaced == ["d/game.zip"]
+    assert result.added == ["e/game.iso"]
+
+
+def test_merge_worse_format_is_reported_duplicate():
+    found = ["d/game.iso"]
+    result = merge_found_files(found, ["e/game.zip", "d/game.iso"])
+    assert found == ["d/game.iso"]
+    assert result.duplicates == [os.path.basename("e/game.zip")]
+    assert result.added == []
+
+
+def test_merge_replacement_within_one_batch_is_not_reported_added():
+    found = []
+    result = merge_found_files(found, ["a/game.zip", "b/game.iso"])
+    assert found == ["b/game.iso"]
+    assert result.added == ["b/game.iso"]
+
+
+def test_merge_with_shared_index_matches_fresh_index():
+    """Merging batch by batch with one kept index == merging everything at once."""
+    batches = [
+        ["a/game.zip", "a/other.cue", "a/other.bin"],
+        ["b/game.iso", "b/other.zip"],
+        ["c/game.bin", "c/third.img"],
+    ]
+    incremental: list[str] = []
+    index = FoundFileIndex()
+    for batch in batches:
+        merge_found_files(incremental, batch, index)
+    assert index.paths == set(incremental)
+
+    combined: list[str] = []
+    merge_found_files(combined, [p for batch in batches for p in batch])
+    assert incremental == combined == [
+        "a/other.cue", "a/other.bin", "b/game.iso", "c/third.img",
+    ]
+
+
+def test_merge_many_distinct_files_stays_fast():
+    paths = [f"dir/game{i}.iso" for i in range(30_000)]
+    found: list[str] = []
+    result = merge_found_files(found, paths)
+    assert len(result.added) == 30_000
+    result = merge_found_files(found, [f"other/game{i}.zip" for i in range(30_000)])
+    assert len(result.duplicates) == 30_000
+
+
+def test_scan_heartbeat_yields_none_while_waiting(tmp_path, monkeypatch):
+    (tmp_path / "a.iso").write_bytes(b"x")
+    list_dir = scanner._list_dir
+
+    def slow_share(path):
+        time.sleep(0.2)
+        return list_dir(path)
+
+    monkeypatch.setattr(scanner, "_list_dir", slow_share)
+    got = list(scanner.iter_scan([str(tmp_path)], heartbeat=0.02))
+    assert None in got
+    assert [p for p in got if p is not None] == [str(tmp_path / "a.iso")]
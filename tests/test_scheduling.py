@@ -0,0 +1,41 @@
+"""Tests for the chdman -np allocator and job ordering."""
+
+from __future__ import annotations
+
+import pytest
+
+from xtochd.scheduling import CpuScheduler, order_jobs
+
+
+def test_concurrent_starts_split_every_core():
+    sched = CpuScheduler(cpus=8)
+    shares = [sched.acquire(3) for _ in range(3)]
+    assert shares == [2, 3, 3]
+    assert sched.in_use == 8
+
+
+def test_straggler_gets_all_free_cores():
+    sched = CpuScheduler(cpus=8)
+    first = [sched.acquire(4) for _ in range(4)]
+    assert first == [2, 2, 2, 2]
+    for threads in first:
+        sched.release(threads)
+    # Queue drained to one disc: it gets the whole machine.
+    assert sched.acquire(1) == 8
+
+
+def test_share_is_at_least_one_thread():
+    sched = CpuScheduler(cpus=2)
+    assert sched.acquire(1) == 2
+    assert sched.acquire(1) == 1
+    assert sched.in_use == 3
+
+
+def test_order_jobs_policies():
+    files = ["small", "big", "mid", "tie"]
+    sizes = {"small": 1, "big": 30, "mid": 10, "tie": 10}
+    assert order_jobs(files, sizes, "listed") == files
+    assert order_jobs(files, sizes, "largest-first") == ["big", "mid", "tie", "small"]
+    assert order_jobs(files, sizes, "smallest-first") == ["small", "mid", "tie", "big"]
+    with pytest.raises(ValueError):
+        order_jobs(files, sizes, "random")
@@ -45,3 +45,38 @@ def test_successful_files_list_holds_dataclasses():
     )
     assert s.successful_files[0].name == "a.chd"
     assert s.successful_files[0].original_size_mb == 1000.0
+
+
+def test_record_helpers_update_counters_and_lists():
+    s = ConversionStats(total_files=3)
+    s.record_success("a.chd", original_size=2 * 1024**2, compressed_size=1024**2)
+    s.record_failure("b.iso", original_size=1024)
+    s.record_skip("c.iso")
+    assert (s.successful_conversions, s.failed_conversions, s.skipped_files) == (1, 1, 1)
+    assert s.original_size == 2 * 1024**2 + 1024
+    assert s.compressed_size == 1024**2
+    assert s.successful_files[0].original_size_mb == 2.0
+    assert s.failed_files == ["b.iso"]
+    assert s.skipped_files_list == ["c.iso"]
+
+
+def test_profile_trade_off_from_recorded_successes():
+    s = ConversionStats(profile="fast")
+    s.record_success("a.chd", original_size=4 * 1024**2, compressed_size=1024**2, seconds=2.0)
+    assert s.profile_ratio == 75.0
+    assert s.profile_throughput == 2.0
+    assert ConversionStats().profile_throughput is None
+
+
+def test_verify_failure_moves_a_success_to_the_failures():
+    s = ConversionStats(total_files=2)
+    s.record_success("a.chd", original_size=4 * 1024**2, compressed_size=1024**2, seconds=2.0)
+    s.record_success("b.chd", original_size=2 * 1024**2, compressed_size=1024**2, seconds=1.0)
+    s.record_verify_failure("b.chd", original_size=2 * 1024**2, compressed_size=1024**2, seconds=1.0)
+    assert (s.successful_conversions, s.failed_conversions) == (1, 1)
+    assert [f.name for f in s.successful_files] == ["a.chd"]
+    assert s.verify_failed_files == ["b.chd"]
+    assert s.success_rate == 50.0
+    assert s.compressed_size == 1024**2
+    assert s.profile_ratio == 75.0
+    assert s.profile_throughput == 2.0
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import os
+import shutil
+import threading
 import time
+from collections import namedtuple
 
 import pytest
 
-from xtochd.temp_manager import TempFileManager
+from xtochd.temp_manager import TempFileManager, TempSpaceBudget
 
 
 @pytest.fixture
@@ -109,3 +112,71 @@ def test_format_size_readable_units():
     assert TempFileManager.format_size(2048).endswith("KB")
     assert TempFileManager.format_size(5 * 1024 * 1024).endswith("MB")
     assert TempFileManager.format_size(3 * 1024**3).endswith("GB")
+
+
+def _fake_free(monkeypatch, free_bytes):
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.setattr(shutil, "disk_usage", lambda _p: usage(0, 0, free_bytes))
+
+
+def test_budget_grants_until_capacity_then_waits(tmp_path, monkeypatch):
+    _fake_free(monkeypatch, 1000)
+    budget = TempSpaceBudget(str(tmp_path), reserve_bytes=100)
+    assert budget.fits_when_idle(900)
+    assert not budget.fits_when_idle(901)
+    assert budget.try_reserve(600)
+    # The disk "filling up" with the first extraction must not shrink what
+    # is left for the second: capacity was sampled while idle.
+    _fake_free(monkeypatch, 400)
+    assert budget.try_reserve(300)
+    assert not budget.try_reserve(1)
+
+    waiter = threading.Thread(target=budget.reserve, args=(500,), kwargs={"poll_seconds": 5})
+    waiter.start()
+    budget.release(600)
+    waiter.join(timeout=2)
+    assert not waiter.is_alive()
+    assert budget.reserved == 800
+
+
+def test_budget_limit_and_cancelled_wait(tmp_path, monkeypatch):
+    _fake_free(monkeypatch, 10**12)
+    budget = TempSpaceBudget(str(tmp_path), reserve_bytes=0, limit_bytes=50)
+    assert not budget.fits_when_idle(51)
+    assert budget.try_reserve(50)
+    assert budget.reserve(1, should_stop=lambda: True) is False
+
+
+def test_choose_temp_base_picks_most_free_space(isolated_manager, tmp_path, monkeypatch):
+    from xtochd import temp_manager as tm
+
+    fast, big = tmp_path / "nvme", tmp_path / "hdd"
+    fast.mkdir()
+    big.mkdir()
+    free = {str(fast): 10 * 1024**3, str(big): 50 * 1024**3}
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.setattr(shutil, "disk_usage", lambda p: usage(0, 0, free[str(p)]))
+
+    roots = [str(fast), str(big), str(tmp_path / "missing")]
+    chosen = isolated_manager.choose_temp_base(roots)
+    assert chosen == str(big / tm.SCRATCH_SUBDIR)
+    assert os.path.isdir(chosen)
+
+    # Nothing with enough room: the app's own temp dir.
+    assert isolated_manager.choose_temp_base(
+        roots, min_free=100 * 1024**3
+    ) == isolated_manager.temp_base_dir
+
+
+def test_scratch_roots_are_swept_and_purged(isolated_manager, tmp_path):
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    isolated_manager.scratch_roots = [str(scratch)]
+    base = isolated_manager.choose_temp_base(min_free=0)
+    d = isolated_manager.create_temp_dir(prefix="unit_", base_dir=base)
+    assert os.path.dirname(d) == base
+    with open(os.path.join(d, "x.bin"), "wb") as f:
+        f.write(b"x" * 10)
+    assert isolated_manager.get_temp_dir_size() == 10
+    assert isolated_manager.purge_temp_base_dir() == 1
+    assert not os.path.exists(d)
@@ -0,0 +1,54 @@
+"""Tests for per-job timing spans and the summary's per-stage table."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from xtochd.timing import JobSpan, measure, stage_report, wait_for
+
+
+def test_measure_records_wall_cpu_and_bytes_even_on_error():
+    spans = []
+    with measure("extract", spans.append, job=3, nbytes=10) as span:
+        span.nbytes += 5
+    with pytest.raises(RuntimeError):
+        with measure("chdman", spans.append, job=3):
+            raise RuntimeError("boom")
+    assert [(s.stage, s.job, s.nbytes) for s in spans] == [
+        ("extract", 3, 15), ("chdman", 3, 0)
+    ]
+    assert all(s.wall >= 0 and s.cpu >= 0 for s in spans)
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="child CPU time needs os.wait4")
+def test_wait_for_reports_exit_code_and_child_cpu():
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "import sys; sum(range(2_000_000)); sys.exit(3)"]
+    )
+    code, cpu = wait_for(proc)
+    assert code == 3 and proc.returncode == 3
+    assert cpu > 0
+
+
+def test_stage_report_orders_stages_and_buckets_durations():
+    mb = 1024 * 1024
+    spans = [
+        JobSpan("chdman", 1, 100 * mb, wall=50.0, cpu=200.0),
+        JobSpan("chdman", 2, 20 * mb, wall=0.5, cpu=1.0),
+        JobSpan("extract", 1, 100 * mb, wall=10.0, cpu=1.0),
+    ]
+    lines = stage_report(spans)
+    assert lines[0].startswith("TIMING BY STAGE")
+    extract, chdman = lines[2].split(), lines[3].split()
+    # stage, spans, wall, cpu, cpu%, MB/s, then one count per bucket.
+    assert extract[:6] == ["extract", "1", "10.0", "1.0", "10", "10.0"]
+    assert chdman[:6] == ["chdman", "2", "50.5", "201.0", "398", "2.4"]
+    assert chdman[6:] == ["0", "1", "0", "1", "0", "0"]
+
+
+def test_stage_report_is_empty_without_spans():
+    assert stage_report([]) == []
@@ -0,0 +1,68 @@
+"""Tests for the persistent ValidationCache."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from xtochd.validation_cache import ValidationCache
+from xtochd.validators import get_file_info
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ValidationCache(str(tmp_path / "cache.sqlite3"))
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def iso(tmp_path):
+    p = tmp_path / "game.iso"
+    p.write_bytes(b"\x00" * 4096)
+    return str(p)
+
+
+def test_round_trip_survives_reopen(tmp_path, iso):
+    db = str(tmp_path / "cache.sqlite3")
+    first = ValidationCache(db)
+    info = get_file_info(iso)
+    first.store({iso: info}, fast_mode=True)
+    first.close()
+
+    second = ValidationCache(db)
+    assert second.lookup([iso], fast_mode=True) == {iso: info}
+    second.close()
+
+
+def test_fast_and_thorough_results_are_separate(cache, iso):
+    cache.store({iso: get_file_info(iso, True)}, fast_mode=True)
+    assert cache.lookup([iso], fast_mode=False) == {}
+
+
+def test_modified_file_is_a_miss(cache, iso):
+    cache.store({iso: get_file_info(iso)}, fast_mode=True)
+    with open(iso, "ab") as f:
+        f.write(b"more")
+    assert cache.lookup([iso], fast_mode=True) == {}
+
+
+def test_touched_file_is_a_miss(cache, iso):
+    cache.store({iso: get_file_info(iso)}, fast_mode=True)
+    st = os.stat(iso)
+    os.utime(iso, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup([iso], fast_mode=True) == {}
+
+
+def test_clear_forgets_everything(cache, iso):
+    cache.store({iso: get_file_info(iso)}, fast_mode=True)
+    cache.clear()
+    assert cache.lookup([iso], fast_mode=True) == {}
+
+
+def test_unopenable_database_degrades_to_noop(tmp_path, iso):
+    c = ValidationCache(str(tmp_path / "missing-dir" / "cache.sqlite3"))
+    assert not c.enabled
+    c.store({iso: get_file_info(iso)}, fast_mode=True)
+    assert c.lookup([iso], fast_mode=True) == {}
@@ -0,0 +1,87 @@
+"""ValidationWorker result delivery, run synchronously (no event loop needed)."""
+
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from xtochd.workers import ValidationWorker  # noqa: E402
+
+
+def _isos(tmp_path, n):
+    paths = []
+    for i in range(n):
+        p = tmp_path / f"disc{i}.iso"
+        p.write_bytes(b"\0" * 4096)
+        paths.append(str(p))
+    return paths
+
+
+def _run(worker):
+    singles, batches, complete = [], [], []
+    worker.validation_progress.connect(lambda p, info: singles.append(p))
+    worker.validation_batch.connect(batches.append)
+    worker.validation_complete.connect(complete.append)
+    worker.run()
+    return singles, batches, complete[0]
+
+
+def test_default_emits_one_progress_signal_per_file(tmp_path):
+    paths = _isos(tmp_path, 5)
+    singles, batches, results = _run(ValidationWorker(paths, max_workers=2))
+    assert sorted(singles) == sorted(paths)
+    assert batches == []
+    assert set(results) == set(paths)
+
+
+def test_batching_coalesces_results(tmp_path):
+    paths = _isos(tmp_path, 10)
+    worker = ValidationWorker(paths, max_workers=2, batch_size=4, batch_interval=60)
+    singles, batches, results = _run(worker)
+    assert singles == []
+    assert all(len(b) <= 4 for b in batches)
+    # Nothing is lost or delivered twice; the tail is flushed at the end.
+    delivered = [p for b in batches for p in b]
+    assert sorted(delivered) == sorted(paths)
+    assert len(batches) == 3
+    assert set(results) == set(paths)
+
+
+def test_scan_worker_streams_batches_then_completes(tmp_path):
+    from xtochd.workers import ScanWorker
+
+    paths = _isos(tmp_path, 7)
+    worker = ScanWorker(str(tmp_path), batch_size=3, batch_interval=60)
+    batches, complete = [], []
+    worker.scan_batch.connect(batches.append)
+    worker.scan_complete.connect(complete.append)
+    worker.run()
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert sorted(complete[0]) == sorted(paths)
+
+
+def test_scan_flushes_a_partial_batch_while_a_directory_is_slow(tmp_path, monkeypatch):
+    import time
+
+    from xtochd import scanner
+    from xtochd.workers import ScanWorker
+
+    (tmp_path / "a.iso").write_bytes(b"x")
+    (tmp_path / "slow").mkdir()
+    (tmp_path / "slow" / "b.iso").write_bytes(b"x")
+    list_dir = scanner._list_dir
+
+    def slow_share(path):
+        if path.endswith("slow"):
+            time.sleep(0.5)
+        return list_dir(path)
+
+    monkeypatch.setattr(scanner, "_list_dir", slow_share)
+    worker = ScanWorker(str(tmp_path), batch_size=100, batch_interval=0.05)
+    batches = []
+    worker.scan_batch.connect(batches.append)
+    worker.run()
+    # a.iso goes out on its own instead of waiting for the slow listing.
+    assert [[os.path.basename(p) for p in b] for b in batches] == [["a.iso"], ["b.iso"]]
+
@@ -3,11 +3,22 @@
 Modules:
     constants     - file-extension sets and disk-format priorities
     stats         - ConversionStats dataclass
+    timing        - per-job stage timing spans and the summary's timing table
     temp_manager  - crash-proof temp-directory management
     theme         - light/dark Qt stylesheets
     validators    - disc-image validation and conversion-candidate filtering
+    manifests     - track references parsed from .cue/.gdi/.toc/.ccd indexes
     archive       - helpers for .zip/.rar/.7z extraction
+    scanner       - file discovery and same-disc de-duplication
+    engine        - Qt-free conversion pipeline (ConversionEngine)
+    profiles      - chdman codec / hunk-size / thread-count profiles
+    scheduling    - CPU core shares for concurrent chdman runs (-np), job order
+    dedup         - content fingerprints to convert byte-identical discs once
+    journal       - append-only per-run job journal for resuming interrupted runs
+    list_summary  - running checked/valid/size totals for the file list
+    file_list_model - Qt item model behind the main window's file list
     workers       - QThread subclasses for scanning, validation, conversion
+    cli           - headless ``python -m xtochd convert`` / ``resume`` front end
 
 The CHDConverterGUI main window lives in ``main.py`` at the project root
 (entry point for the PyInstaller build).
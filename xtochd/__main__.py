@@ -0,0 +1,7 @@
+"""``python -m xtochd`` entry point; see ``xtochd.cli``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,351 @@
+"""Headless command-line front end.
+
+Runs the same scan -> de-duplicate -> validate -> convert pipeline as the
+GUI, without a Qt event loop, so batches can run on headless servers or
+under cron::
+
+    python -m xtochd convert <inputs...> -o <output_dir> [--jobs N]
+    python -m xtochd resume [--jobs N]
+
+Every run is journaled (see ``xtochd.journal``); ``resume`` finishes the
+last one if it was interrupted, skipping the inputs it already completed.
+
+Exit status: 0 if every disc converted (or was skipped as already done),
+1 if any conversion failed, 2 on usage errors, 130 when interrupted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+from . import __version__
+from .engine import ConversionEngine, ConversionEvents
+from .journal import RunJournal, journal_path, load_run
+from .profiles import PROFILES, ChdmanProfile, get_profile, valid_hunk_size
+from .scanner import DirTimings, merge_found_files, scan_paths
+from .scheduling import ORDER_LISTED, ORDER_POLICIES
+from .temp_manager import temp_manager
+from .validation_cache import ValidationCache
+from .validators import get_file_info
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def find_chdman() -> str | None:
+    """Locate chdman the way the GUI does, then fall back to PATH."""
+    for directory in (temp_manager.app_dir, os.getcwd()):
+        for name in ("chdman.exe", "chdman"):
+            candidate = os.path.join(directory, name)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+    return shutil.which("chdman")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m xtochd",
+        description="Batch-convert disc images and archives to CHD.",
+    )
+    parser.add_argument("--version", action="version", version=f"XtoCHD {__version__}")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    convert = sub.add_parser("convert", help="convert files and folders to CHD")
+    convert.add_argument("inputs", nargs="+", help="files or folders to convert")
+    convert.add_argument(
+        "-o", "--output", required=True, help="directory the .chd files are written to"
+    )
+    convert.add_argument(
+        "--scan-jobs", type=int, default=8,
+        help="directories listed in parallel while scanning (default: 8)",
+    )
+    convert.add_argument(
+        "--thorough", action="store_true",
+        help="thorough validation (full ZIP integrity test, ISO header scan)",
+    )
+    convert.add_argument(
+        "--no-cache", action="store_true",
+        help="ignore and don't update the saved validation results",
+    )
+    _add_engine_options(convert)
+
+    resume = sub.add_parser(
+        "resume", help="finish the last run if it was interrupted"
+    )
+    resume.add_argument(
+        "--retry-failed", action="store_true",
+        help="also retry inputs that failed in the last run",
+    )
+    _add_engine_options(resume)
+    return parser
+
+
+def _add_engine_options(parser: argparse.ArgumentParser) -> None:
+    """Options shared by ``convert`` and ``resume``."""
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="discs to convert in parallel (default: 1)"
+    )
+    parser.add_argument(
+        "--prefetch", type=int, default=1,
+        help="archives to extract ahead of the running conversions (default: 1)",
+    )
+    parser.add_argument(
+        "--scratch", action="append", metavar="DIR", default=[],
+        help="fast folder to extract archives onto (repeatable; the one with "
+             "the most free space is used)",
+    )
+    parser.add_argument(
+        "--temp-limit", type=float, metavar="GB",
+        help="cap on temp space used for extraction, in GB (default: free space)",
+    )
+    parser.add_argument(
+        "--profile", choices=sorted(PROFILES), default="default",
+        help="chdman compression profile: archival = smallest files, "
+             "fast = quickest (default: chdman's defaults)",
+    )
+    parser.add_argument(
+        "--hunk-size", type=int, metavar="BYTES",
+        help="override the profile's chdman hunk size (-hs; a multiple of 2448)",
+    )
+    parser.add_argument(
+        "--processors", type=int, metavar="N",
+        help="override the profile's chdman thread count (-np)",
+    )
+    parser.add_argument(
+        "--dedup", action="store_true",
+        help="convert byte-identical discs once and hard-link the other copies",
+    )
+    parser.add_argument(
+        "--order", choices=ORDER_POLICIES, default=ORDER_LISTED,
+        help="which discs start first: largest-first shortens parallel batches, "
+             "smallest-first gets the first .chd out sooner (default: listed)",
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="check each new .chd with chdman verify while later discs convert; "
+             "one that fails is deleted so it can be converted again",
+    )
+    parser.add_argument("--chdman", help="path to chdman (default: auto-detect)")
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="also print transient status lines"
+    )
+
+
+def _validate(
+    paths: list[str],
+    fast_validation: bool,
+    jobs: int,
+    cache: ValidationCache | None,
+) -> tuple[list[str], list[dict]]:
+    """Split ``paths`` into (valid paths, info dicts of invalid files), order preserved."""
+    infos = cache.lookup(paths, fast_validation) if cache is not None else {}
+    pending = [p for p in paths if p not in infos]
+    workers = max(1, min(jobs * 2, os.cpu_count() or 4, len(pending) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fresh = dict(zip(pending, executor.map(
+            lambda p: get_file_info(p, fast_validation), pending
+        )))
+    if cache is not None:
+        cache.store(fresh, fast_validation)
+    infos.update(fresh)
+    valid = [p for p in paths if infos[p]["is_valid"]]
+    invalid = [infos[p] for p in paths if not infos[p]["is_valid"]]
+    return valid, invalid
+
+
+def _resolve_chdman(args: argparse.Namespace) -> str | None:
+    chdman_path = args.chdman or find_chdman()
+    if not chdman_path or not os.path.isfile(chdman_path):
+        print("error: chdman not found; pass --chdman PATH", file=sys.stderr)
+        return None
+    return chdman_path
+
+
+def _prepare_temp(args: argparse.Namespace) -> None:
+    temp_manager.scratch_roots = list(args.scratch)
+    cleaned = temp_manager.cleanup_orphaned_temp_dirs()
+    if cleaned:
+        print(f"Startup cleanup: removed {cleaned} orphaned temp directories.")
+
+
+def run_convert(args: argparse.Namespace) -> int:
+    chdman_path = _resolve_chdman(args)
+    if chdman_path is None:
+        return EXIT_USAGE
+    missing = [p for p in args.inputs if not os.path.exists(p)]
+    if missing:
+        print(f"error: input not found: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_USAGE
+
+    _prepare_temp(args)
+
+    files: list[str] = []
+    timings = DirTimings(keep=5)
+    merge = merge_found_files(
+        files, scan_paths(args.inputs, workers=args.scan_jobs, on_dir_listed=timings)
+    )
+    if args.verbose and timings.dirs:
+        print(
+            f"Listed {timings.dirs} folder(s); slowest: "
+            + ", ".join(f"{p} ({t:.2f}s)" for p, t in timings.slowest()),
+            file=sys.stderr,
+        )
+    if merge.duplicates:
+        print(f"Skipped {len(merge.duplicates)} duplicate(s): {', '.join(merge.duplicates)}")
+    if not files:
+        print("No convertible files found.")
+        return EXIT_OK
+
+    cache = None if args.no_cache else ValidationCache.open_default()
+    files, invalid = _validate(files, not args.thorough, args.jobs, cache)
+    for info in invalid:
+        print(f"Invalid, skipping: {info['path']} ({info['validation_msg']})")
+    if not files:
+        print("No valid files to convert.")
+        return EXIT_FAILURES if invalid else EXIT_OK
+
+    status = _run_engine(args, files, args.output, chdman_path)
+    if status == EXIT_OK and invalid:
+        return EXIT_FAILURES
+    return status
+
+
+def run_resume(args: argparse.Namespace) -> int:
+    record = load_run(journal_path())
+    if record is None:
+        print("Nothing to resume: no conversion run has been recorded.")
+        return EXIT_OK
+    files = record.remaining(retry_failed=args.retry_failed)
+    if not files:
+        if record.completed and not args.retry_failed and record.failed():
+            print(
+                f"Nothing to resume: the last run finished. "
+                f"{len(record.failed())} input(s) failed; use --retry-failed "
+                f"to convert them again."
+            )
+        else:
+            print("Nothing to resume: every input of the last run was handled.")
+        return EXIT_OK
+    # Failures this run won't retry stay on record for a later --retry-failed.
+    carried = [] if args.retry_failed else record.failed()
+    chdman_path = _resolve_chdman(args)
+    if chdman_path is None:
+        return EXIT_USAGE
+    gone = [p for p in files if not os.path.exists(p)]
+    if gone:
+        print(f"Skipping {len(gone)} input(s) that no longer exist: {', '.join(gone)}")
+        files = [p for p in files if os.path.exists(p)]
+        if not files:
+            return EXIT_FAILURES
+    print(
+        f"Resuming last run: {len(files)} of {len(record.files)} input(s) left, "
+        f"output to {record.output_dir}"
+    )
+    _prepare_temp(args)
+    return _run_engine(
+        args, files, record.output_dir, chdman_path, carried_failures=carried
+    )
+
+
+def _profile(args: argparse.Namespace) -> ChdmanProfile:
+    profile = get_profile(args.profile)
+    if args.hunk_size is not None or args.processors is not None:
+        profile = dataclasses.replace(
+            profile,
+            name=f"{profile.name}+custom",
+            hunk_size=args.hunk_size or profile.hunk_size,
+            processors=args.processors or profile.processors,
+        )
+    return profile
+
+
+def _run_engine(
+    args: argparse.Namespace,
+    files: list[str],
+    output_dir: str,
+    chdman_path: str,
+    carried_failures: list[str] | None = None,
+) -> int:
+    """Convert ``files`` with a journaled engine; returns the exit status."""
+    events = ConversionEvents(log_updated=print)
+    if args.verbose:
+        events.progress_text = lambda text: print(text, file=sys.stderr)
+    engine = ConversionEngine(
+        files,
+        output_dir,
+        chdman_path,
+        max_jobs=args.jobs,
+        prefetch_archives=args.prefetch,
+        events=events,
+        temp_limit=None if args.temp_limit is None else int(args.temp_limit * 1024**3),
+        journal=RunJournal(journal_path(), carried_failures=carried_failures),
+        dedup=args.dedup,
+        profile=_profile(args),
+        order=args.order,
+        verify=args.verify,
+    )
+
+    # Run the engine off the main thread so Ctrl+C lands here and can
+    # cancel cleanly (killing chdman) instead of tearing the pool down.
+    # A thread's exception would otherwise vanish; keep it for the exit status.
+    crashed: list[BaseException] = []
+
+    def run() -> None:
+        try:
+            engine.run()
+        except BaseException as e:
+            crashed.append(e)
+
+    runner = threading.Thread(target=run, name="conversion")
+    runner.start()
+    try:
+        while runner.is_alive():
+            runner.join(timeout=0.5)
+    except KeyboardInterrupt:
+        print("Interrupted, stopping conversion...", file=sys.stderr)
+        engine.cancel()
+        runner.join()
+    finally:
+        engine.cleanup_temp_dirs()
+
+    if crashed:
+        print(f"Conversion aborted: {crashed[0]!r}", file=sys.stderr)
+        return EXIT_FAILURES
+    if engine.cancelled:
+        return EXIT_INTERRUPTED
+    if engine.stats.failed_conversions or engine.stats.verify_failed_files:
+        return EXIT_FAILURES
+    return EXIT_OK
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command not in ("convert", "resume"):
+        return EXIT_USAGE
+    if args.jobs < 1:
+        print("error: --jobs must be at least 1", file=sys.stderr)
+        return EXIT_USAGE
+    if args.temp_limit is not None and args.temp_limit <= 0:
+        print("error: --temp-limit must be positive", file=sys.stderr)
+        return EXIT_USAGE
+    if args.hunk_size is not None and not valid_hunk_size(args.hunk_size):
+        print("error: --hunk-size must be a positive multiple of 2448", file=sys.stderr)
+        return EXIT_USAGE
+    if args.processors is not None and args.processors < 1:
+        print("error: --processors must be at least 1", file=sys.stderr)
+        return EXIT_USAGE
+    if args.command == "resume":
+        return run_resume(args)
+    if args.scan_jobs < 1:
+        print("error: --scan-jobs must be at least 1", file=sys.stderr)
+        return EXIT_USAGE
+    return run_convert(args)
@@ -73,6 +73,14 @@ GDI_READ_BYTES: Final[int] = 64     # GDI headers are tiny: first line = track c
 TOC_READ_BYTES: Final[int] = 512
 CCD_READ_BYTES: Final[int] = 256
 
+# Largest index file read out of an archive to decide which members to
+# extract. Real manifests are a few KB; anything bigger is not one.
+INDEX_MAX_READ_BYTES: Final[int] = 1024 * 1024
+
 # How long a temp subdirectory from a previous run has to be idle before the
 # startup sweep deletes it as orphaned.
 ORPHAN_TEMP_AGE_SECONDS: Final[int] = 60 * 60
+
+# Free space the temp-space budget always leaves on the temp volume, so an
+# extraction never fills the disk to the last byte.
+TEMP_FREE_RESERVE_BYTES: Final[int] = 512 * 1024 * 1024
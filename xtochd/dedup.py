@@ -0,0 +1,265 @@
+"""Finding inputs that hold byte-identical discs, so each is converted once.
+
+Libraries often carry the same dump several times - under another archive
+name, in a regional "set", or as both a loose copy and a zipped one. The
+scanner only de-duplicates by file name, so each copy used to cost a full
+chdman run. ``find_duplicates`` compares the discs themselves, in tiers
+that only read data when a cheaper tier can't tell two discs apart:
+
+1. a free key: the index's layout (its text with the referenced file names
+   blanked out) plus the size of every track, from ``stat`` or the zip
+   directory;
+2. on a key collision, a sampled digest of each track's first, middle and
+   last 64 KiB;
+3. on a sample collision, a digest of every byte.
+
+An input is dropped only when every disc in it matches a disc from an
+earlier, kept input; its discs are returned as aliases of those. Inputs
+that can't be fingerprinted cheaply (.rar/.7z, unreadable files, indexes
+whose tracks can't be found) are always kept.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Callable, Iterable, Iterator
+
+from .constants import INDEX_EXTS, INDEX_MAX_READ_BYTES
+from .manifests import parse_index, resolve_members
+from .validators import filter_conversion_candidates
+
+log = logging.getLogger(__name__)
+
+SAMPLE_BYTES = 64 * 1024
+_READ_CHUNK = 1024 * 1024
+
+
+@dataclass
+class Track:
+    """One data file of a disc: a loose file or a zip member."""
+
+    size: int
+    path: str  # loose file, or the zip holding ``member``
+    member: str | None = None
+    compressed: bool = False  # a zip member that has to be inflated to seek
+
+    @contextmanager
+    def reader(self) -> Iterator[IO[bytes]]:
+        if self.member is None:
+            with open(self.path, "rb") as f:
+                yield f
+        else:
+            with zipfile.ZipFile(self.path) as z, z.open(self.member) as f:
+                yield f
+
+
+@dataclass
+class Disc:
+    """One conversion candidate and what it would be compared by."""
+
+    source: str  # the input it comes from
+    output_stem: str  # its .chd is <output_stem>.chd
+    layout: str  # digest of the index with file names blanked (or the image type)
+    tracks: list[Track] = field(default_factory=list)
+    _sample: str | None = field(default=None, repr=False)
+    _full: str | None = field(default=None, repr=False)
+
+    @property
+    def key(self) -> tuple:
+        return (self.layout, tuple(t.size for t in self.tracks))
+
+
+@dataclass
+class DedupResult:
+    files: list[str] = field(default_factory=list)  # inputs to convert, in order
+    dropped: list[str] = field(default_factory=list)  # inputs that were duplicates
+    aliases: list[tuple[str, str]] = field(default_factory=list)  # (stem, canonical stem)
+
+
+def find_duplicates(
+    files: Iterable[str], should_stop: Callable[[], bool] = lambda: False
+) -> DedupResult:
+    """Split ``files`` into inputs worth converting and duplicates of them.
+
+    Earlier inputs win. If ``should_stop`` turns true midway, the inputs
+    not yet examined are kept as they are.
+    """
+    result = DedupResult()
+    kept_by_key: dict[tuple, list[Disc]] = {}
+    files = list(files)
+    for position, path in enumerate(files):
+        if should_stop():
+            result.files.extend(files[position:])
+            break
+        discs = discs_in(path)
+        if not discs:
+            result.files.append(path)
+            continue
+        matches = [_find_match(d, kept_by_key.get(d.key, ())) for d in discs]
+        if all(m is not None for m in matches):
+            result.dropped.append(path)
+            for disc, canonical in zip(discs, matches):
+                result.aliases.append((disc.output_stem, canonical.output_stem))
+            continue
+        result.files.append(path)
+        for disc in discs:
+            kept_by_key.setdefault(disc.key, []).append(disc)
+    return result
+
+
+def _find_match(disc: Disc, candidates: Iterable[Disc]) -> Disc | None:
+    for other in candidates:
+        try:
+            if _sample_digest(disc) != _sample_digest(other):
+                continue
+            if _full_digest(disc) == _full_digest(other):
+                return other
+        except (OSError, zipfile.BadZipFile, RuntimeError) as e:
+            log.debug("Could not compare %s with %s: %s", disc.source, other.source, e)
+    return None
+
+
+# -- Fingerprints -------------------------------------------------------------
+
+
+def _windows(size: int) -> list[int]:
+    """Offsets of the sampled windows of a ``size``-byte track."""
+    if size <= 3 * SAMPLE_BYTES:
+        return [0]  # small enough that the "sample" is the whole track
+    return [0, (size - SAMPLE_BYTES) // 2, size - SAMPLE_BYTES]
+
+
+def _window_len(size: int) -> int:
+    return SAMPLE_BYTES if size > 3 * SAMPLE_BYTES else size
+
+
+def _sample_digest(disc: Disc) -> str:
+    if disc._sample is not None:
+        return disc._sample
+    if any(t.compressed for t in disc.tracks):
+        # Seeking an inflating stream means inflating up to the offset
+        # anyway: take the samples and the full digest in one pass.
+        _hash_in_one_pass(disc)
+        return disc._sample
+    h = hashlib.blake2b(digest_size=20)
+    for track in disc.tracks:
+        with track.reader() as f:
+            for offset in _windows(track.size):
+                f.seek(offset)
+                h.update(f.read(_window_len(track.size)))
+    disc._sample = h.hexdigest()
+    return disc._sample
+
+
+def _full_digest(disc: Disc) -> str:
+    if disc._full is None:
+        _hash_in_one_pass(disc)
+    return disc._full
+
+
+def _hash_in_one_pass(disc: Disc) -> None:
+    """Read every track once, filling in both the sample and full digests."""
+    sample = hashlib.blake2b(digest_size=20)
+    full = hashlib.blake2b(digest_size=20)
+    for track in disc.tracks:
+        windows = _windows(track.size)
+        window_len = _window_len(track.size)
+        data = bytearray()  # the sampled windows, in stream order
+        pos = 0
+        with track.reader() as f:
+            while True:
+                chunk = f.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                full.update(chunk)
+                for start in windows:
+                    lo, hi = max(start, pos), min(start + window_len, pos + len(chunk))
+                    if lo < hi:
+                        data += chunk[lo - pos:hi - pos]
+                pos += len(chunk)
+        sample.update(bytes(data))
+    disc._sample = sample.hexdigest()
+    disc._full = full.hexdigest()
+
+
+# -- Discovering discs --------------------------------------------------------
+
+
+def discs_in(path: str) -> list[Disc] | None:
+    """The discs ``path`` would be converted into, or None if not fingerprintable."""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == ".zip":
+            return _discs_in_zip(path)
+        if ext in (".rar", ".7z"):
+            return None
+        disc = _loose_disc(path, ext)
+    except (OSError, zipfile.BadZipFile, RuntimeError) as e:
+        log.debug("Not fingerprinting %s: %s", path, e)
+        return None
+    return None if disc is None else [disc]
+
+
+def _loose_disc(path: str, ext: str) -> Disc | None:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if ext not in INDEX_EXTS:
+        return Disc(path, stem, ext, [Track(os.path.getsize(path), path)])
+    if os.path.getsize(path) > INDEX_MAX_READ_BYTES:
+        return None
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8", errors="ignore")
+    directory = os.path.dirname(path)
+    names = os.listdir(directory or ".")
+    refs = parse_index(path, text)
+    members = resolve_members(os.path.basename(path), refs, names)
+    if not members:
+        return None
+    tracks = []
+    for member in members:
+        track_path = os.path.join(directory, member)
+        tracks.append(Track(os.path.getsize(track_path), track_path))
+    return Disc(path, stem, _layout(ext, text, refs.required), tracks)
+
+
+def _discs_in_zip(zip_path: str) -> list[Disc] | None:
+    with zipfile.ZipFile(zip_path) as z:
+        infos = {i.filename: i for i in z.infolist() if not i.is_dir()}
+        discs = []
+        for entry in filter_conversion_candidates(list(infos)):
+            stem = os.path.splitext(os.path.basename(entry))[0]
+            ext = os.path.splitext(entry)[1].lower()
+            if ext in INDEX_EXTS:
+                if infos[entry].file_size > INDEX_MAX_READ_BYTES:
+                    return None
+                text = z.read(entry).decode("utf-8", errors="ignore")
+                refs = parse_index(entry, text)
+                members = resolve_members(entry, refs, infos)
+                if not members:
+                    return None
+                layout = _layout(ext, text, refs.required)
+            else:
+                members, layout = [entry], ext
+            tracks = [
+                Track(
+                    infos[m].file_size, zip_path, m,
+                    compressed=infos[m].compress_type != zipfile.ZIP_STORED,
+                )
+                for m in members
+            ]
+            discs.append(Disc(zip_path, stem, layout, tracks))
+    return discs
+
+
+def _layout(ext: str, text: str, refs: list[str]) -> str:
+    """Digest of an index with its file names blanked, so renamed copies match."""
+    # Longest first, so a name that contains another isn't half-replaced;
+    # numbered by position, so the same layout maps to the same text.
+    for i in sorted(range(len(refs)), key=lambda i: len(refs[i]), reverse=True):
+        text = text.replace(refs[i], f"\0{i}")
+    normalised = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+    return ext + ":" + hashlib.blake2b(normalised.encode(), digest_size=16).hexdigest()
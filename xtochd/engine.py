@@ -0,0 +1,1579 @@
+"""The CHD conversion engine: archive extraction, chdman, stats.
+
+This module has no Qt dependency so the same pipeline can run inside the
+GUI's ``ConversionWorker`` QThread or from the headless command line
+(``python -m xtochd convert``). Progress and log output are reported
+through a ``ConversionEvents`` bundle of plain callbacks.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Callable
+
+from .constants import (
+    ARCHIVE_EXTS,
+    COMPATIBLE_EXTS,
+    DISK_IMAGE_EXTS,
+    INDEX_EXTS,
+    INDEX_MAX_READ_BYTES,
+    TRACK_EXTS,
+)
+from .dedup import find_duplicates
+from .journal import CONVERTING, DONE, EXTRACTING, FAILED, RunJournal
+from .manifests import parse_index, resolve_members
+from .profiles import DEFAULT_PROFILE, ChdmanProfile
+from .scheduling import ORDER_LISTED, CpuScheduler, order_jobs
+from .stats import ConversionStats
+from .temp_manager import TempSpaceBudget, temp_manager
+from .timing import (
+    CHDMAN,
+    CLEANUP,
+    EXTRACT,
+    LIST,
+    PUBLISH,
+    TEMP_DIR,
+    VERIFY,
+    WALK,
+    JobSpan,
+    measure,
+    stage_report,
+    wait_for,
+)
+from .validators import filter_conversion_candidates
+
+log = logging.getLogger(__name__)
+
+# Platforms other than Windows don't have CREATE_NO_WINDOW; fall back to 0.
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def _ignore(*_args) -> None:
+    pass
+
+
+@dataclass
+class ConversionEvents:
+    """Callbacks a ConversionEngine reports through. Unset ones are no-ops.
+
+    The names mirror ``ConversionWorker``'s Qt signals, which are wired in
+    one-to-one.
+    """
+
+    progress_updated: Callable[[int], None] = _ignore  # overall percent
+    progress_text: Callable[[str], None] = _ignore  # transient status line
+    log_updated: Callable[[str], None] = _ignore  # permanent log line
+    job_progress: Callable[[int, int], None] = _ignore  # job number, percent
+    # Throughput in MB/s and ETA in seconds (-1 while unknown), per running
+    # chdman job and for the whole batch (weighted by input bytes).
+    job_rate: Callable[[int, float, float], None] = _ignore  # job, MB/s, ETA
+    batch_rate: Callable[[float, float], None] = _ignore  # MB/s, ETA
+
+
+def _bsdtar_path() -> str | None:
+    """Locate a tar binary that handles .rar/.7z via libarchive.
+
+    Windows 10 1803+ ships bsdtar at ``%SystemRoot%\\System32\\tar.exe``.
+    We target it by absolute path because Git for Windows puts a GNU tar on
+    PATH that doesn't understand rar/7z and would shadow it.
+    """
+    if os.name == "nt":
+        system_tar = os.path.join(
+            os.environ.get("SystemRoot", r"C:\Windows"), "System32", "tar.exe"
+        )
+        if os.path.isfile(system_tar):
+            return system_tar
+    for candidate in ("bsdtar", "tar"):
+        found = shutil.which(candidate)
+        if found:
+            return found
+    return None
+
+
+def _is_within(path: str, directory: str) -> bool:
+    """True if ``path`` lives somewhere under ``directory``."""
+    try:
+        return os.path.commonpath(
+            [os.path.abspath(path), os.path.abspath(directory)]
+        ) == os.path.abspath(directory)
+    except ValueError:  # different drives on Windows
+        return False
+
+
+# One ``bsdtar -tv`` line, ls -l style: mode, links, owner, group, size,
+# date ("Jan  1 12:00" or "Jan  1  2020"), name.
+_BSDTAR_VERBOSE_LINE = re.compile(
+    r"^(?P<mode>[-dlbcps]\S{9})\S*\s+\d+\s+\S+\s+\S+\s+(?P<size>\d+)\s+"
+    r"\S+\s+\d+\s+(?:\d{1,2}:\d{2}|\d{4})\s(?P<name>.+)$"
+)
+
+
+def _parse_verbose_listing(output: str) -> tuple[list[str], int] | None:
+    """(file entries, total size) from ``bsdtar -tv`` output; None if unrecognised."""
+    entries: list[str] = []
+    total = 0
+    for line in output.splitlines():
+        if not line:
+            continue
+        m = _BSDTAR_VERBOSE_LINE.match(line)
+        if m is None:
+            return None
+        if m.group("mode")[0] != "-":
+            continue  # directories, links, devices
+        entries.append(m.group("name"))
+        total += int(m.group("size"))
+    return entries, total
+
+
+def _input_bytes(path: str) -> int:
+    """Rough size of one input: its tracks for an index, else the file itself.
+
+    A zip counts as what it unpacks to, read from its directory; .rar/.7z
+    count as their packed size, which would otherwise take a bsdtar run
+    per archive to refine.
+    """
+    try:
+        if os.path.splitext(path)[1].lower() == ".zip":
+            try:
+                with zipfile.ZipFile(path) as z:
+                    unpacked = sum(i.file_size for i in z.infolist() if not i.is_dir())
+                if unpacked:
+                    return unpacked
+            except (zipfile.BadZipFile, RuntimeError):
+                pass  # extraction will report it; weigh it by its size
+        if os.path.splitext(path)[1].lower() in INDEX_EXTS:
+            if os.path.getsize(path) <= INDEX_MAX_READ_BYTES:
+                with open(path, "rb") as f:
+                    text = f.read().decode("utf-8", errors="ignore")
+                directory = os.path.dirname(path)
+                refs = parse_index(path, text)
+                total = 0
+                for ref in refs.required + refs.optional:
+                    track = os.path.join(directory, ref.replace("\\", os.sep))
+                    if os.path.isfile(track):
+                        total += os.path.getsize(track)
+                if total:
+                    return total
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+# chdman createcd's progress line, e.g. "Compressing, 45.2% complete...
+# (ratio=51.3%)". Updates are separated by \r, which the text-mode pipe
+# turns into line breaks.
+_CHDMAN_PROGRESS = re.compile(
+    r"Compressing,\s+(?P<pct>\d+(?:\.\d+)?)%\s+complete"
+    r"(?:.*?ratio=(?P<ratio>\d+(?:\.\d+)?)%)?"
+)
+
+# chdman output kept for error reports: the last N lines of each stream,
+# each cut at this many characters. Progress lines are parsed, not kept.
+CHDMAN_TAIL_LINES = 40
+_MAX_LINE_CHARS = 4096
+
+# Minimum seconds between throughput/ETA reports (per job, and for the batch).
+RATE_REPORT_INTERVAL = 0.5
+
+
+def parse_chdman_progress(line: str) -> tuple[float, float | None] | None:
+    """(fraction done, compression ratio %) from a chdman stderr line, else None."""
+    m = _CHDMAN_PROGRESS.search(line)
+    if m is None:
+        return None
+    ratio = m.group("ratio")
+    return (
+        min(float(m.group("pct")) / 100, 1.0),
+        float(ratio) if ratio is not None else None,
+    )
+
+
+def format_duration(seconds: float) -> str:
+    """``h:mm:ss`` / ``m:ss`` for an ETA; ``--:--`` when unknown (negative)."""
+    if seconds < 0:
+        return "--:--"
+    minutes, secs = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+# chdman writes to ``<name>.chd`` + this suffix in the output dir; the file
+# is renamed to ``<name>.chd`` only once chdman has succeeded.
+PARTIAL_SUFFIX = ".partial"
+
+
+class OutputIndex:
+    """The ``.chd`` files in the output folder, listed once per run.
+
+    Skip decisions ("does ``<stem>.chd`` exist yet?") used to be one
+    ``os.path.exists`` per candidate - thousands of round trips when the
+    output folder is on a network share. The folder is instead read with a
+    single ``os.scandir`` when the run starts, and the engine ``add``s
+    each ``.chd`` it publishes. CHDs some other program writes into the
+    folder mid-run aren't seen until the next run.
+
+    Names are compared with ``os.path.normcase``, so lookups are
+    case-insensitive on Windows like the filesystem itself.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._names: set[str] = set()
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """(Re)read the folder; returns how many CHDs it holds."""
+        names: set[str] = set()
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.lower().endswith(".chd"):
+                        names.add(os.path.normcase(entry.name))
+        except OSError as e:
+            log.debug("Could not list output folder %s: %s", self.directory, e)
+        with self._lock:
+            self._names = names
+        return len(names)
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, str):
+            return False
+        with self._lock:
+            return os.path.normcase(os.path.basename(path)) in self._names
+
+    def add(self, path: str) -> None:
+        with self._lock:
+            self._names.add(os.path.normcase(os.path.basename(path)))
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            self._names.discard(os.path.normcase(os.path.basename(path)))
+
+
+class ConversionEngine:
+    """Runs a batch of CHD conversions; blocking, Qt-free.
+
+    Up to ``max_jobs`` inputs are processed at once on a thread pool. Each
+    job owns its own ``chdman`` / bsdtar subprocess; every live process is
+    tracked in ``self._procs`` under ``_proc_lock`` so ``cancel()`` can kill
+    all of them synchronously.
+
+    Archives are additionally pipelined: a prefetch thread extracts them in
+    job order while chdman is busy on earlier jobs, running at most
+    ``prefetch_archives`` archives ahead of the conversions so temp usage
+    stays bounded. ``max_jobs=1, prefetch_archives=0`` reproduces the old
+    strictly sequential behaviour.
+
+    Given a ``RunJournal``, every job's state change is recorded durably
+    so the run can be resumed after an interruption (``xtochd.journal``).
+
+    ``order`` decides which inputs start first: as listed, or by estimated
+    bytes, largest or smallest first (``xtochd.scheduling``).
+
+    With ``verify``, each published .chd is checked with ``chdman verify``
+    on a second pool, so verification overlaps the next conversions and
+    reads the file while it is still in the page cache.
+
+    Everything the engine has to say goes through ``events``; callbacks
+    may fire from any of the engine's threads.
+    """
+
+    def __init__(
+        self,
+        files: list[str],
+        output_dir: str,
+        chdman_path: str,
+        max_jobs: int = 1,
+        prefetch_archives: int = 1,
+        events: ConversionEvents | None = None,
+        temp_limit: int | None = None,
+        scratch_roots: list[str] | None = None,
+        journal: RunJournal | None = None,
+        dedup: bool = False,
+        profile: ChdmanProfile | None = None,
+        cpu_scheduler: CpuScheduler | None = None,
+        order: str = ORDER_LISTED,
+        verify: bool = False,
+    ) -> None:
+        self.events = events if events is not None else ConversionEvents()
+        self.files = files
+        self.output_dir = output_dir
+        self.chdman_path = chdman_path
+        self.max_jobs = max(1, max_jobs)
+        self.prefetch_archives = max(0, prefetch_archives)
+        # Admission control for extraction: each archive reserves its
+        # estimated unpacked size (optionally capped at ``temp_limit``
+        # bytes) before it touches the temp volume.
+        self.temp_budget = TempSpaceBudget(
+            temp_manager.temp_base_dir, limit_bytes=temp_limit
+        )
+        # Where this run's temp dirs go: once ``run`` starts, the roomiest
+        # of ``scratch_roots`` (default: temp_manager.scratch_roots), else
+        # temp_manager's own base.
+        self.scratch_roots = scratch_roots
+        self.temp_base = temp_manager.temp_base_dir
+        self._temp_reservations: dict[str, int] = {}
+        self._reservation_lock = threading.Lock()
+        self.temp_dirs: list[str] = []
+        # chdman codec / hunk-size / thread options (``xtochd.profiles``).
+        self.profile = profile if profile is not None else DEFAULT_PROFILE
+        # Splits the cores between concurrent chdmans via -np, unless the
+        # profile pins a thread count itself.
+        self.cpu_scheduler = cpu_scheduler if cpu_scheduler is not None else CpuScheduler()
+        # Which inputs start first (``xtochd.scheduling.ORDER_POLICIES``).
+        self.order = order
+        self.stats = ConversionStats(
+            total_files=len(files), profile=self.profile.summary(), job_order=order
+        )
+        self.cancelled = False
+        self._procs: set[subprocess.Popen] = set()
+        self._proc_lock = threading.Lock()
+        # Fraction complete (0..1) of each running job, keyed by job number.
+        # Jobs are weighted by input size, so the overall bar (and the batch
+        # ETA) is (bytes of finished jobs + sum of fraction * bytes) / total.
+        # The batch MB/s only counts jobs that converted something: a skip
+        # or an early failure moves the bar but processed nothing.
+        self._job_fractions: dict[int, float] = {}
+        self._job_weights: dict[int, int] = {}
+        self._total_weight = 0
+        self._weight_finished = 0
+        self._weight_processed = 0
+        self._converted_jobs: set[int] = set()
+        self._jobs_finished = 0
+        self._run_started = time.monotonic()
+        self._last_batch_rate = 0.0
+        self._progress_lock = threading.Lock()
+        # Output paths some job is currently producing, so two inputs that
+        # share a stem never race each other onto the same .chd.
+        self._claimed_outputs: set[str] = set()
+        self._claim_lock = threading.Lock()
+        # Archive pipeline: job number -> future resolving to the extracted
+        # temp dir (or None). Each extracted-but-unconverted archive holds
+        # one ``_extract_slots`` permit until its job frees the temp dir.
+        self._extracted: dict[int, Future] = {}
+        self._extract_slots: threading.Semaphore | None = None
+        # Each job's state goes to ``journal`` (if any) so an interrupted
+        # run can be resumed. ``_current.job`` is the job the calling
+        # thread works for, so failures can be pinned on it.
+        self.journal = journal
+        # Convert byte-identical discs once (``xtochd.dedup``); the copies'
+        # (.chd stem, canonical stem) pairs wait in ``_aliases`` until the
+        # canonical .chd exists.
+        self.dedup = dedup
+        self._aliases: list[tuple[str, str]] = []
+        self.existing_outputs = OutputIndex(output_dir)
+        self._current = threading.local()
+        self._failed_jobs: set[int] = set()
+        # ``chdman verify`` every .chd this run publishes, on its own pool
+        # (created by ``run``) so conversions don't wait for it.
+        self.verify = verify
+        self._verify_pool: ThreadPoolExecutor | None = None
+
+    # -- Cancellation ------------------------------------------------------
+
+    def cancel(self) -> None:
+        """Set the cancel flag and kill every in-flight subprocess."""
+        self.cancelled = True
+        self._kill_running_processes()
+
+    def _kill_running_processes(self) -> None:
+        with self._proc_lock:
+            procs = list(self._procs)
+        for proc in procs:
+            self._kill_process(proc)
+
+    def _kill_process(self, proc: subprocess.Popen) -> None:
+        if proc.poll() is not None:
+            return
+        try:
+            if os.name == "nt":
+                # Kill the tree: chdman may spawn helpers we don't track.
+                subprocess.run(
+                    ["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                    capture_output=True,
+                    creationflags=_CREATE_NO_WINDOW,
+                )
+            else:
+                proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                try:
+                    proc.kill()
+                except OSError:
+                    pass
+        except OSError as e:
+            self.events.log_updated(f"Warning: failed to kill chdman: {e}")
+
+    def _check_cancelled(self) -> bool:
+        if self.cancelled:
+            self.events.progress_text("Stopping conversion...")
+            return True
+        return False
+
+    def _register_proc(self, proc: subprocess.Popen) -> None:
+        with self._proc_lock:
+            self._procs.add(proc)
+        # cancel() may have run between Popen and registration; make sure
+        # a process started in that window doesn't outlive the run.
+        if self.cancelled:
+            self._kill_process(proc)
+
+    def _unregister_proc(self, proc: subprocess.Popen) -> None:
+        with self._proc_lock:
+            self._procs.discard(proc)
+
+    # -- Progress ----------------------------------------------------------
+
+    def _weigh_jobs(self, sizes: dict[str, int] | None = None) -> None:
+        """Weigh jobs by input bytes so progress and ETA go by bytes, not file count.
+
+        Without ``sizes``, ``_weigh_job`` weighs each job as it starts.
+        """
+        self._job_weights = {
+            idx: max(sizes.get(file_path, 0), 1)
+            for idx, file_path in enumerate(self.files, start=1)
+        } if sizes is not None else {}
+        self._total_weight = sum(self._job_weights.values())
+        self._run_started = time.monotonic()
+
+    def _weigh_job(self, job: int, file_path: str) -> None:
+        """Size job ``job`` if ``run`` didn't, on the thread that is about to work on it."""
+        if job in self._job_weights:
+            return
+        weight = max(_input_bytes(file_path), 1)
+        with self._progress_lock:
+            if job not in self._job_weights:
+                self._job_weights[job] = weight
+                self._total_weight += weight
+
+    def _estimated_total_weight(self) -> float:
+        """All jobs' weight, counting any not yet weighed as the mean of those that are."""
+        weighed = len(self._job_weights)
+        if not weighed:
+            return len(self.files) or 1
+        return self._total_weight * max(len(self.files), weighed) / weighed
+
+    def _set_job_progress(self, job: int, fraction: float) -> None:
+        """Record how far job ``job`` has got and refresh the overall bar."""
+        fraction = max(0.0, min(fraction, 1.0))
+        now = time.monotonic()
+        report_rate = False
+        with self._progress_lock:
+            self._job_fractions[job] = fraction
+            running = sum(
+                f * self._job_weights.get(j, 1) for j, f in self._job_fractions.items()
+            )
+            done = self._weight_finished + running
+            processed = self._weight_processed + running
+            total = self._estimated_total_weight()
+            if now - self._last_batch_rate >= RATE_REPORT_INTERVAL:
+                self._last_batch_rate = now
+                report_rate = True
+        self.events.job_progress(job, int(fraction * 100))
+        self.events.progress_updated(min(int(done / total * 100), 99))
+        if report_rate:
+            elapsed = now - self._run_started
+            rate = processed / elapsed if elapsed > 0 else 0.0
+            eta = (total - done) / rate if rate > 0 else -1.0
+            self.events.batch_rate(rate / 1024**2, eta)
+
+    def _start_job(self, job: int) -> None:
+        # setdefault: a prefetched archive has already reported extraction.
+        with self._progress_lock:
+            self._job_fractions.setdefault(job, 0.0)
+
+    def _finish_job(self, job: int) -> None:
+        with self._progress_lock:
+            self._job_fractions.pop(job, None)
+            self._jobs_finished += 1
+            self._weight_finished += self._job_weights.get(job, 1)
+            if job in self._converted_jobs and job not in self._failed_jobs:
+                self._weight_processed += self._job_weights.get(job, 1)
+        self.events.job_progress(job, 100)
+
+    def _journal(self, job: int, state: str) -> None:
+        if self.journal is not None:
+            self.journal.record(job, state)
+
+    def _span(self, stage: str, nbytes: int = 0, job: int | None = None):
+        """``timing.measure`` a stage of ``job`` (default: the calling thread's)."""
+        if job is None:
+            job = getattr(self._current, "job", None)
+        return measure(stage, self.stats.record_span, job, nbytes)
+
+    def _fail(self, name: str, original_size: int = 0) -> None:
+        """``stats.record_failure`` that also marks the calling thread's job failed."""
+        self.stats.record_failure(name, original_size)
+        job = getattr(self._current, "job", None)
+        if job is not None:
+            with self._progress_lock:
+                self._failed_jobs.add(job)
+
+    def _claim_output(self, path: str) -> bool:
+        """Reserve ``path`` for the calling job. False if another job holds it."""
+        with self._claim_lock:
+            if path in self._claimed_outputs:
+                return False
+            self._claimed_outputs.add(path)
+            return True
+
+    def _release_output(self, path: str) -> None:
+        with self._claim_lock:
+            self._claimed_outputs.discard(path)
+
+    # -- Entry point -------------------------------------------------------
+
+    def run(self) -> None:
+        """Convert every file in ``self.files``; returns when the batch is done."""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+        except OSError as e:
+            self.events.log_updated(f"Failed to create output directory: {e}")
+            return
+
+        self.existing_outputs.load()
+        self.temp_base = temp_manager.choose_temp_base(self.scratch_roots)
+        self.temp_budget.directory = self.temp_base
+        if self.temp_base != temp_manager.temp_base_dir:
+            self.events.log_updated(f"Extracting to scratch folder: {self.temp_base}")
+        if self.profile != DEFAULT_PROFILE:
+            self.events.log_updated(f"Compression profile: {self.profile.summary()}")
+        if self.dedup:
+            self._drop_duplicates()
+        # Ordering by size needs every input sized up front, and those sizes
+        # weigh the jobs too. In listed order that would be a zip directory
+        # or index read per input before anything starts (round trips on a
+        # share), so each job is weighed as it starts instead.
+        sizes = None
+        if self.order != ORDER_LISTED:
+            sizes = {file_path: _input_bytes(file_path) for file_path in self.files}
+            self.files = order_jobs(self.files, sizes, self.order)
+            self.events.log_updated(f"Job order: {self.order}")
+        if self.journal is not None:
+            self.journal.begin(self.files, self.output_dir)
+        self._weigh_jobs(sizes)
+
+        total_files = len(self.files)
+        effective_jobs = max(1, min(self.max_jobs, total_files or 1))
+        if effective_jobs > 1:
+            self.events.log_updated(
+                f"Running up to {effective_jobs} conversions in parallel."
+            )
+
+        archive_jobs = [
+            (idx, file_path)
+            for idx, file_path in enumerate(self.files, start=1)
+            if os.path.splitext(file_path)[1].lower() in ARCHIVE_EXTS
+        ]
+        if self.verify:
+            self._verify_pool = ThreadPoolExecutor(
+                max_workers=effective_jobs, thread_name_prefix="verify"
+            )
+        prefetcher = None
+        if self.prefetch_archives and archive_jobs:
+            prefetcher = self._start_prefetcher(
+                archive_jobs, total_files, effective_jobs
+            )
+
+        with ThreadPoolExecutor(max_workers=effective_jobs) as executor:
+            futures = {
+                executor.submit(self._run_job, file_path, idx, total_files): (idx, file_path)
+                for idx, file_path in enumerate(self.files, start=1)
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    # _run_job fails its own job on error; this only catches
+                    # what escapes its bookkeeping, so one job can't cut the
+                    # batch (summary, journal end) short.
+                    idx, file_path = futures[future]
+                    log.exception("Job %d (%s) crashed", idx, file_path)
+                    self.events.log_updated(f"Error processing {file_path}: {e}")
+                    self.stats.record_failure(os.path.basename(file_path))
+                    self._journal(idx, FAILED)
+
+        if prefetcher is not None:
+            prefetcher.join()
+        if self._verify_pool is not None:
+            self._verify_pool.shutdown(wait=True)
+            self._verify_pool = None
+        if self.journal is not None:
+            self.journal.end(completed=not self.cancelled)
+
+        if self._aliases and not self.cancelled:
+            self._link_duplicates()
+
+        if not self.cancelled:
+            self.events.progress_updated(100)
+            self.events.progress_text("Conversion complete!")
+            self.events.log_updated("Conversion complete.")
+            self._emit_summary()
+        else:
+            self.events.progress_text("Conversion stopped.")
+            self.events.log_updated("Conversion stopped by user.")
+
+    def _run_job(self, file_path: str, idx: int, total_files: int) -> None:
+        """Convert one user-selected input (loose image or archive)."""
+        if self._check_cancelled():
+            return
+
+        ext = os.path.splitext(file_path)[1].lower()
+        self._current.job = idx
+        self._weigh_job(idx, file_path)
+        self._start_job(idx)
+        self.events.progress_text(
+            f"Processing {os.path.basename(file_path)} ({idx}/{total_files})"
+        )
+        try:
+            if idx in self._extracted:
+                self.events.log_updated(f"Processing archive: {file_path}")
+                self._convert_prefetched(idx, total_files)
+            elif ext == ".zip":
+                self.events.log_updated(f"Processing zip: {file_path}")
+                self._process_zip_file(file_path, idx, total_files)
+            elif ext in ARCHIVE_EXTS:
+                self.events.log_updated(f"Processing archive: {file_path}")
+                self._process_archive_file(file_path, idx, total_files)
+            else:
+                self._journal(idx, CONVERTING)
+                self._convert_single_file(file_path, idx, total_files)
+        except Exception as e:
+            # A job that blew up must not pass for done: fail it and let
+            # the rest of the batch carry on.
+            log.exception("Job %d (%s) failed", idx, file_path)
+            if not self.cancelled:
+                self.events.log_updated(f"Error processing {file_path}: {e}")
+                self._fail(os.path.basename(file_path))
+                self._journal(idx, FAILED)
+        else:
+            # A job cut short by Stop keeps its last state, so it is redone
+            # on resume.
+            if not self.cancelled:
+                self._journal(idx, FAILED if idx in self._failed_jobs else DONE)
+        finally:
+            self._current.job = None
+            self._finish_job(idx)
+
+    # -- Duplicate discs ---------------------------------------------------
+
+    def _drop_duplicates(self) -> None:
+        """Take inputs whose discs all duplicate an earlier input's off the run."""
+        self.events.progress_text("Checking for identical discs...")
+        result = find_duplicates(self.files, should_stop=lambda: self.cancelled)
+        for path in result.dropped:
+            self.events.log_updated(
+                f"Identical disc already queued, not converting again: {path}"
+            )
+        self.files = result.files
+        self._aliases = result.aliases
+
+    def _link_duplicates(self) -> None:
+        """Give each dropped duplicate its own .chd name, as a hard link where possible."""
+        for stem, canonical_stem in self._aliases:
+            canonical = os.path.join(self.output_dir, canonical_stem + ".chd")
+            alias = os.path.join(self.output_dir, stem + ".chd")
+            if canonical not in self.existing_outputs:
+                continue  # the canonical disc failed; nothing to point at
+            linked = False
+            if alias not in self.existing_outputs:
+                try:
+                    os.link(canonical, alias)
+                    self.existing_outputs.add(alias)
+                    linked = True
+                except OSError as e:
+                    # FAT/exFAT and some shares have no hard links.
+                    log.debug("Could not hard-link %s: %s", alias, e)
+            self.stats.record_duplicate(
+                os.path.basename(alias), os.path.basename(canonical), linked
+            )
+
+    # -- Archive pipeline --------------------------------------------------
+
+    def _start_prefetcher(
+        self,
+        archive_jobs: list[tuple[int, str]],
+        total_files: int,
+        effective_jobs: int,
+    ) -> threading.Thread:
+        # One permit per archive allowed on disk at once: one for every
+        # conversion that can be running plus the look-ahead.
+        self._extract_slots = threading.Semaphore(
+            effective_jobs + self.prefetch_archives
+        )
+        for idx, _path in archive_jobs:
+            self._extracted[idx] = Future()
+        thread = threading.Thread(
+            target=self._prefetch_archives,
+            args=(archive_jobs, total_files),
+            name="archive-prefetch",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _prefetch_archives(
+        self, archive_jobs: list[tuple[int, str]], total_files: int
+    ) -> None:
+        """Producer half of the pipeline: extract archives in job order."""
+        try:
+            for idx, archive_path in archive_jobs:
+                if not self._acquire_extract_slot():
+                    break
+                future = self._extracted[idx]
+                self._current.job = idx
+                self._weigh_job(idx, archive_path)
+                try:
+                    if archive_path.lower().endswith(".zip"):
+                        temp_dir = self._extract_zip(archive_path, idx, total_files)
+                    else:
+                        temp_dir = self._extract_archive(
+                            archive_path, idx, total_files
+                        )
+                except BaseException as e:  # surfaced by the consuming job
+                    future.set_exception(e)
+                else:
+                    future.set_result(temp_dir)
+        finally:
+            # After a cancel, unblock every job still waiting on us.
+            for future in self._extracted.values():
+                if not future.done():
+                    future.set_result(None)
+
+    def _acquire_extract_slot(self) -> bool:
+        """Wait for temp space to free up; False if the run is cancelled meanwhile."""
+        while not self.cancelled:
+            if self._extract_slots.acquire(timeout=0.2):
+                return True
+        return False
+
+    def _convert_prefetched(self, idx: int, total_files: int) -> None:
+        """Consumer half: convert what the prefetcher unpacked, then free it."""
+        try:
+            temp_dir = self._extracted[idx].result()
+            if temp_dir is not None:
+                try:
+                    self._convert_extracted(temp_dir, idx, total_files)
+                finally:
+                    self._discard_temp_dir(temp_dir)
+        finally:
+            self._extract_slots.release()
+
+    # -- Summary -----------------------------------------------------------
+
+    def _emit_summary(self) -> None:
+        s = self.stats
+        lines: list[str] = []
+        lines.append("=" * 50)
+        lines.append("CONVERSION SUMMARY")
+        lines.append("=" * 50)
+
+        if s.successful_files:
+            lines.append("SUCCESSFULLY CONVERTED:")
+            for f in s.successful_files:
+                lines.append(
+                    f"  ✓ {f.name} ({f.original_size_mb:.1f} MB → {f.compressed_size_mb:.1f} MB)"
+                )
+            lines.append("")
+
+        if s.skipped_files_list:
+            lines.append("SKIPPED (CHD already exists):")
+            for name in s.skipped_files_list:
+                lines.append(f"  ⏭ {name}")
+            lines.append("")
+
+        if s.duplicate_files:
+            lines.append("IDENTICAL DISCS (converted once):")
+            for name, canonical, linked in s.duplicate_files:
+                how = "hard link to" if linked else "same disc as"
+                if name == canonical:
+                    lines.append(f"  = {name} (another copy of the same disc)")
+                else:
+                    lines.append(f"  = {name}: {how} {canonical}")
+            lines.append("")
+
+        if s.failed_files:
+            lines.append("FAILED CONVERSIONS:")
+            for name in s.failed_files:
+                lines.append(f"  ✗ {name}")
+            lines.append("")
+
+        if s.verify_failed_files:
+            lines.append("FAILED VERIFICATION (removed, convert again):")
+            for name in s.verify_failed_files:
+                lines.append(f"  ✗ {name}")
+            lines.append("")
+
+        lines.append(f"Total files processed: {s.total_files}")
+        lines.append(f"Successfully converted: {s.successful_conversions}")
+        lines.append(f"Failed conversions: {s.failed_conversions}")
+        lines.append(f"Skipped (already exist): {s.skipped_files}")
+        if s.duplicate_files:
+            lines.append(f"Identical discs not reconverted: {len(s.duplicate_files)}")
+        if s.verified_files or s.verify_failed_files:
+            lines.append(f"Verified with chdman verify: {len(s.verified_files)}")
+            lines.append(f"Failed verification: {len(s.verify_failed_files)}")
+        if s.success_rate is not None:
+            lines.append(f"Success rate: {s.success_rate:.1f}%")
+        if s.job_order:
+            lines.append(f"Job order: {s.job_order}")
+
+        if s.original_size > 0:
+            original_gb = s.original_size / (1024**3)
+            compressed_gb = s.compressed_size / (1024**3)
+            saved_gb = original_gb - compressed_gb
+            lines.append("")
+            lines.append("SIZE STATISTICS:")
+            lines.append(f"Original total size: {original_gb:.2f} GB")
+            lines.append(f"Compressed total size: {compressed_gb:.2f} GB")
+            lines.append(f"Space saved: {saved_gb:.2f} GB")
+            if s.compression_ratio is not None:
+                lines.append(f"Compression ratio: {s.compression_ratio:.1f}%")
+
+        if s.profile_ratio is not None:
+            lines.append("")
+            lines.append(f"PROFILE: {s.profile}")
+            trade_off = f"Saved {s.profile_ratio:.1f}% of converted data"
+            if s.profile_throughput is not None:
+                trade_off += f" at {s.profile_throughput:.1f} MB/s per job"
+            lines.append(trade_off)
+
+        timing = stage_report(s.spans)
+        if timing:
+            lines.append("")
+            lines.extend(timing)
+
+        lines.append("=" * 50)
+        for line in lines:
+            self.events.log_updated(line)
+
+    # -- Archive handlers --------------------------------------------------
+    #
+    # Each archive is handled in two halves: ``_extract_*`` unpacks it into
+    # a fresh temp dir (I/O-bound) and ``_convert_extracted`` runs chdman on
+    # what came out (CPU-bound). ``_process_*`` chains the two for the
+    # inline path; the prefetcher calls the extract half ahead of time.
+
+    def _process_zip_file(
+        self, zip_path: str, current_file: int, total_files: int
+    ) -> None:
+        temp_dir = self._extract_zip(zip_path, current_file, total_files)
+        if temp_dir is not None:
+            try:
+                self._convert_extracted(temp_dir, current_file, total_files)
+            finally:
+                self._discard_temp_dir(temp_dir)
+
+    def _process_archive_file(
+        self, archive_path: str, current_file: int, total_files: int
+    ) -> None:
+        """Extract .rar/.7z via bsdtar (libarchive) and convert images inside."""
+        temp_dir = self._extract_archive(archive_path, current_file, total_files)
+        if temp_dir is not None:
+            try:
+                self._convert_extracted(temp_dir, current_file, total_files)
+            finally:
+                self._discard_temp_dir(temp_dir)
+
+    def _extract_zip(
+        self, zip_path: str, current_file: int, _total_files: int
+    ) -> str | None:
+        """Unpack ``zip_path`` into a new temp dir.
+
+        Returns the temp dir, or None when there is nothing left to convert
+        (every candidate already has a .chd, the zip is unreadable, or the
+        run was cancelled). On None the temp dir has already been removed.
+        """
+        if self._check_cancelled():
+            return None
+
+        self._journal(current_file, EXTRACTING)
+        self.events.progress_text(f"Extracting {os.path.basename(zip_path)}...")
+        with self._span(TEMP_DIR):
+            temp_dir = temp_manager.create_temp_dir(
+                prefix="chdconv_zip_", base_dir=self.temp_base
+            )
+        self.temp_dirs.append(temp_dir)
+        if self._unzip_into(zip_path, temp_dir, current_file):
+            return temp_dir
+        self._discard_temp_dir(temp_dir)
+        return None
+
+    def _unzip_into(self, zip_path: str, temp_dir: str, current_file: int) -> bool:
+        try:
+            with ExitStack() as stack:
+                # Listing: reading the zip directory and choosing members.
+                with self._span(LIST):
+                    z = stack.enter_context(zipfile.ZipFile(zip_path, "r"))
+                    zip_files = [n for n in z.namelist() if not n.endswith("/")]
+
+                    # Cheap pre-check: if every candidate already has a .chd,
+                    # avoid extracting. Uses the same candidate-filter the real
+                    # conversion does so the count actually matches reality.
+                    candidate_entries = filter_conversion_candidates(zip_files)
+                    missing: list[str] = []
+                    for entry in candidate_entries:
+                        base_name = os.path.splitext(os.path.basename(entry))[0]
+                        if base_name + ".chd" in self.existing_outputs:
+                            self.events.log_updated(
+                                f"Skipped: {base_name} (CHD already exists)"
+                            )
+                            self.stats.record_skip(base_name)
+                        else:
+                            missing.append(entry)
+                    if not candidate_entries:
+                        self.events.log_updated(
+                            f"No disk images found in {os.path.basename(zip_path)}."
+                        )
+                        return False
+                    if not missing:
+                        self.events.log_updated(
+                            f"All disk images in {os.path.basename(zip_path)} "
+                            f"already have CHD versions. Skipping extraction."
+                        )
+                        return False
+
+                    members = self._select_zip_members(z, zip_path, zip_files, missing)
+                    needed = sum(z.getinfo(m).file_size for m in members)
+                if not self._reserve_temp_space(temp_dir, needed, zip_path):
+                    return False
+                total_members = len(members) or 1
+                with self._span(EXTRACT, needed):
+                    for i, zip_file in enumerate(members):
+                        if self._check_cancelled():
+                            return False
+                        z.extract(zip_file, temp_dir)
+                        # Extraction counts as the first 20% of this job.
+                        self._set_job_progress(
+                            current_file, (i + 1) / total_members * 0.2
+                        )
+                        self.events.progress_text(
+                            f"Extracting {zip_file} from {os.path.basename(zip_path)}"
+                        )
+        except (OSError, zipfile.BadZipFile, zlib.error) as e:
+            self.events.log_updated(f"Failed to process zip {zip_path}: {e}")
+            self._fail(os.path.basename(zip_path))
+            return False
+
+        return not self._check_cancelled()
+
+    def _reserve_temp_space(self, temp_dir: str, nbytes: int, archive_path: str) -> bool:
+        """Reserve room to unpack ``nbytes`` into ``temp_dir``, waiting if need be.
+
+        False (with the archive logged as failed) when it can't fit even on
+        an otherwise idle temp volume, or when the run is cancelled while
+        waiting. The reservation is released by ``_discard_temp_dir``.
+        """
+        name = os.path.basename(archive_path)
+        budget = self.temp_budget
+        if not budget.fits_when_idle(nbytes):
+            free = budget.free_bytes()
+            self.events.log_updated(
+                f"Skipped {name}: needs about {temp_manager.format_size(nbytes)} of "
+                f"temp space, but only "
+                f"{temp_manager.format_size(free or 0)} is free"
+                + (" within the temp limit." if budget.limit_bytes is not None else ".")
+            )
+            self._fail(name)
+            return False
+        if not budget.try_reserve(nbytes):
+            self.events.progress_text(
+                f"Waiting for temp space to unpack {name} "
+                f"({temp_manager.format_size(nbytes)})..."
+            )
+            if not budget.reserve(nbytes, should_stop=lambda: self.cancelled):
+                return False
+        with self._reservation_lock:
+            self._temp_reservations[temp_dir] = nbytes
+        return True
+
+    def _select_zip_members(
+        self,
+        z: zipfile.ZipFile,
+        zip_path: str,
+        zip_files: list[str],
+        candidates: list[str],
+    ) -> list[str]:
+        """The members needed to convert ``candidates``: each index plus its tracks.
+
+        Falls back to every member when an index can't be read or names a
+        file the archive doesn't (visibly) contain - chdman then sees the
+        same tree it always did.
+        """
+        selected: dict[str, None] = {}  # ordered set
+        for entry in candidates:
+            selected[entry] = None
+            if os.path.splitext(entry)[1].lower() not in INDEX_EXTS:
+                continue
+            resolved = None
+            if z.getinfo(entry).file_size <= INDEX_MAX_READ_BYTES:
+                text = z.read(entry).decode("utf-8", errors="ignore")
+                resolved = resolve_members(entry, parse_index(entry, text), zip_files)
+            if not resolved:
+                self.events.log_updated(
+                    f"Could not match the tracks {os.path.basename(entry)} "
+                    f"references; extracting all of {os.path.basename(zip_path)}."
+                )
+                return zip_files
+            selected.update(dict.fromkeys(resolved))
+
+        skipped = len(zip_files) - len(selected)
+        if skipped:
+            self.events.log_updated(
+                f"Extracting {len(selected)} of {len(zip_files)} file(s) from "
+                f"{os.path.basename(zip_path)} ({skipped} not needed for conversion)."
+            )
+        return list(selected)
+
+    def _extract_archive(
+        self, archive_path: str, current_file: int, _total_files: int
+    ) -> str | None:
+        """Unpack a .rar/.7z into a new temp dir; same contract as ``_extract_zip``."""
+        if self._check_cancelled():
+            return None
+
+        tar_path = _bsdtar_path()
+        if tar_path is None:
+            self.events.log_updated(
+                f"Cannot extract {os.path.basename(archive_path)}: no bsdtar/tar "
+                f"with rar/7z support found on this system."
+            )
+            self._fail(os.path.basename(archive_path))
+            return None
+
+        self._journal(current_file, EXTRACTING)
+        self.events.progress_text(f"Listing {os.path.basename(archive_path)}...")
+        with self._span(TEMP_DIR):
+            temp_dir = temp_manager.create_temp_dir(
+                prefix="chdconv_arc_", base_dir=self.temp_base
+            )
+        self.temp_dirs.append(temp_dir)
+        if self._untar_into(tar_path, archive_path, temp_dir):
+            self._set_job_progress(current_file, 0.2)
+            return temp_dir
+        self._discard_temp_dir(temp_dir)
+        return None
+
+    def _list_archive(
+        self, tar_path: str, archive_path: str
+    ) -> tuple[list[str], int] | None:
+        """(file entries, total unpacked bytes) from ``bsdtar -tv``; None on error.
+
+        If the verbose listing can't be parsed, names come from a plain
+        ``-t`` listing and the archive's own size stands in for the
+        unpacked size (an underestimate for compressed archives).
+        """
+        for verbose in (True, False):
+            result = subprocess.run(
+                [tar_path, "-tvf" if verbose else "-tf", archive_path],
+                capture_output=True,
+                text=True,
+                creationflags=_CREATE_NO_WINDOW,
+            )
+            if result.returncode != 0:
+                self.events.log_updated(
+                    f"Failed to list {os.path.basename(archive_path)}: "
+                    f"{result.stderr.strip()}"
+                )
+                return None
+            if verbose:
+                parsed = _parse_verbose_listing(result.stdout)
+                if parsed is not None:
+                    return parsed
+                log.debug("Unrecognised bsdtar -tv output for %s", archive_path)
+                continue
+            entries = [
+                e for e in result.stdout.splitlines() if e and not e.endswith("/")
+            ]
+            return entries, os.path.getsize(archive_path)
+        return None
+
+    def _untar_into(self, tar_path: str, archive_path: str, temp_dir: str) -> bool:
+        try:
+            with self._span(LIST):
+                listing = self._list_archive(tar_path, archive_path)
+            if listing is None:
+                self._fail(os.path.basename(archive_path))
+                return False
+            entries, unpacked_size = listing
+            disk_entries = filter_conversion_candidates(entries)
+
+            if disk_entries:
+                missing: list[str] = []
+                for entry in disk_entries:
+                    base_name = os.path.splitext(os.path.basename(entry))[0]
+                    if base_name + ".chd" in self.existing_outputs:
+                        self.events.log_updated(
+                            f"Skipped: {base_name} (CHD already exists)"
+                        )
+                        self.stats.record_skip(base_name)
+                    else:
+                        missing.append(entry)
+                if not missing:
+                    self.events.log_updated(
+                        f"All disk images in {os.path.basename(archive_path)} "
+                        f"already have CHD versions. Skipping extraction."
+                    )
+                    return False
+
+            if self._check_cancelled():
+                return False
+            if not self._reserve_temp_space(temp_dir, unpacked_size, archive_path):
+                return False
+
+            self.events.progress_text(
+                f"Extracting {os.path.basename(archive_path)}..."
+            )
+            with self._span(EXTRACT, unpacked_size) as timing:
+                # bsdtar -x prints nothing to stdout, so draining stderr alone
+                # can't deadlock; waiting with ``wait_for`` keeps its CPU time.
+                extract_proc = subprocess.Popen(
+                    [tar_path, "-xf", archive_path, "-C", temp_dir],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    creationflags=_CREATE_NO_WINDOW,
+                )
+                self._register_proc(extract_proc)
+                try:
+                    with extract_proc.stderr:
+                        err = extract_proc.stderr.read()
+                    _code, timing.cpu = wait_for(extract_proc)
+                finally:
+                    self._unregister_proc(extract_proc)
+
+            if self.cancelled:
+                return False
+            if extract_proc.returncode != 0:
+                self.events.log_updated(
+                    f"Failed to extract {os.path.basename(archive_path)}: "
+                    f"{err.strip()}"
+                )
+                self._fail(os.path.basename(archive_path))
+                return False
+        except OSError as e:
+            self.events.log_updated(
+                f"Failed to process archive {archive_path}: {e}"
+            )
+            self._fail(os.path.basename(archive_path))
+            return False
+        return True
+
+    def _convert_extracted(
+        self, temp_dir: str, current_file: int, total_files: int
+    ) -> None:
+        """Run chdman on every conversion candidate unpacked into ``temp_dir``."""
+        if self._check_cancelled():
+            return
+        self._journal(current_file, CONVERTING)
+        self.events.progress_text("Scanning extracted files...")
+        with self._span(WALK):
+            candidates = self._walk_candidates(temp_dir)
+        for i, extracted in enumerate(candidates):
+            if self._check_cancelled():
+                return
+            self.events.progress_text(
+                f"Converting extracted file {os.path.basename(extracted)} "
+                f"({i+1}/{len(candidates)})"
+            )
+            # Extraction was the first 20% of the job; the discs share the rest.
+            span = (
+                0.2 + 0.8 * i / len(candidates),
+                0.2 + 0.8 * (i + 1) / len(candidates),
+            )
+            self._convert_single_file(extracted, current_file, total_files, span)
+
+    def _walk_candidates(self, temp_dir: str) -> list[str]:
+        """Find disk-image files under ``temp_dir`` and filter to conversion targets."""
+        all_found: list[str] = []
+        for root, _dirs, files in os.walk(temp_dir):
+            for fname in files:
+                if self.cancelled:
+                    return []
+                ext = os.path.splitext(fname)[1].lower()
+                if ext in DISK_IMAGE_EXTS or ext in INDEX_EXTS or ext in TRACK_EXTS:
+                    all_found.append(os.path.join(root, fname))
+        return filter_conversion_candidates(all_found)
+
+    # -- Single-file conversion -------------------------------------------
+
+    def _convert_single_file(
+        self,
+        file_path: str,
+        current_file: int,
+        total_files: int,
+        span: tuple[float, float] = (0.0, 1.0),
+    ) -> None:
+        if self._check_cancelled():
+            return
+
+        base_name = os.path.basename(file_path)
+        stem = os.path.splitext(base_name)[0]
+        output_chd_path = os.path.join(self.output_dir, stem + ".chd")
+
+        # Claim before the existence check: a job that held the claim only
+        # releases it after its .chd has landed in ``existing_outputs``, so
+        # the check below always sees the finished file rather than racing
+        # the rename.
+        if not self._claim_output(output_chd_path):
+            self.events.log_updated(
+                f"Skipped: {base_name} "
+                f"(another job is already producing {os.path.basename(output_chd_path)})"
+            )
+            self.stats.record_skip(base_name)
+            return
+        try:
+            if output_chd_path in self.existing_outputs:
+                self.events.log_updated(
+                    f"Skipped: {base_name} "
+                    f"(CHD already exists: {os.path.basename(output_chd_path)})"
+                )
+                self.stats.record_skip(base_name)
+                return
+            self._convert_to(
+                file_path, output_chd_path, current_file, total_files, span
+            )
+        finally:
+            self._release_output(output_chd_path)
+
+    def _convert_to(
+        self,
+        file_path: str,
+        output_chd_path: str,
+        current_file: int,
+        _total_files: int,
+        span: tuple[float, float] = (0.0, 1.0),
+    ) -> None:
+        """Run chdman on ``file_path``, staging its output beside ``output_chd_path``.
+
+        chdman's own progress moves job ``current_file`` across ``span``
+        (the slice of the job this disc accounts for).
+        """
+        ext = os.path.splitext(file_path)[1].lower()
+        base_name = os.path.basename(file_path)
+
+        self.events.log_updated(f"Converting: {file_path}")
+        self.events.progress_text(f"Converting {base_name} to CHD format...")
+
+        # An index is a tiny manifest: count the tracks it references (and
+        # only those; its folder may hold other discs).
+        original_size = _input_bytes(file_path)
+
+        if ext not in COMPATIBLE_EXTS:
+            self.events.log_updated(
+                f"Skipped unsupported file type ({ext}): {file_path}"
+            )
+            self._fail(base_name, original_size)
+            return
+
+        # Stage in the output dir itself: chdman's write lands on the final
+        # volume once, and finishing is an atomic same-directory rename.
+        # (Writing beside the input meant a second full copy whenever the
+        # source was a temp dir or share on another device, and failed
+        # outright on read-only sources.)
+        partial_chd = output_chd_path + PARTIAL_SUFFIX
+        # A leftover from a crashed run would make chdman refuse to start.
+        self._discard_incomplete_output(partial_chd)
+        cmd = [
+            self.chdman_path,
+            "createcd",
+            "-i",
+            file_path,
+            "-o",
+            partial_chd,
+            *self.profile.args(),
+        ]
+        threads = self._acquire_threads()
+        if threads:
+            cmd += ["-np", str(threads)]
+
+        self.events.progress_text(
+            f"Running CHD conversion on {base_name}"
+            + (f" ({threads} threads)..." if threads else "...")
+        )
+        on_progress = self._chdman_progress_reporter(
+            current_file, base_name, original_size, span
+        )
+        began = time.monotonic()
+        try:
+            with self._span(CHDMAN, original_size) as timing:
+                return_code, _stdout, stderr = self._run_chdman(
+                    cmd, on_progress, timing=timing
+                )
+        except OSError as e:
+            self._discard_incomplete_output(partial_chd)
+            self.events.log_updated(f"Exception: {e}")
+            self.events.progress_text(f"✗ Error: {base_name}")
+            self._fail(base_name, original_size)
+            return
+        finally:
+            if threads:
+                self.cpu_scheduler.release(threads)
+
+        if self.cancelled:
+            self._discard_incomplete_output(partial_chd)
+            return
+
+        if return_code != 0:
+            self._discard_incomplete_output(partial_chd)
+            self.events.log_updated(f"Error converting {file_path}: {stderr}")
+            self.events.progress_text(f"✗ Failed: {base_name}")
+            self._fail(base_name, original_size)
+            return
+
+        # Success - publish the finished .chd under its real name.
+        try:
+            with self._span(PUBLISH) as timing:
+                os.replace(partial_chd, output_chd_path)
+                self.existing_outputs.add(output_chd_path)
+                compressed_size = timing.nbytes = os.path.getsize(output_chd_path)
+        except OSError as e:
+            self._discard_incomplete_output(partial_chd)
+            self.events.log_updated(f"Error finalising {output_chd_path}: {e}")
+            self.events.progress_text(f"✗ Failed to finalise: {base_name}")
+            self._fail(base_name, original_size)
+            return
+
+        seconds = time.monotonic() - began
+        self.stats.record_success(
+            os.path.basename(output_chd_path), original_size, compressed_size,
+            seconds=seconds,
+        )
+        with self._progress_lock:
+            self._converted_jobs.add(current_file)
+        self.events.log_updated(f"Success: {output_chd_path}")
+        self.events.progress_text(f"✓ Completed: {os.path.basename(output_chd_path)}")
+        with self._span(CLEANUP):
+            self._cleanup_temp_files_for_file(file_path)
+        if self._verify_pool is not None:
+            self._verify_pool.submit(
+                self._verify_output, current_file, output_chd_path,
+                original_size, compressed_size, seconds,
+            )
+
+    def _verify_output(
+        self,
+        job: int,
+        chd_path: str,
+        original_size: int = 0,
+        compressed_size: int = 0,
+        seconds: float = 0.0,
+    ) -> None:
+        """``chdman verify`` a published .chd; one that fails is deleted.
+
+        Removing it (and marking job ``job`` failed in the journal) means
+        the next run, or ``resume --retry-failed``, converts the disc again
+        instead of skipping it as done. Its conversion moves from the
+        successes to the failures in ``stats``, sizes and time included.
+        """
+        if self.cancelled:
+            return
+        name = os.path.basename(chd_path)
+        self.events.progress_text(f"Verifying {name}...")
+        try:
+            with self._span(VERIFY, job=job) as timing:
+                timing.nbytes = os.path.getsize(chd_path)
+                return_code, _stdout, stderr = self._run_chdman(
+                    [self.chdman_path, "verify", "-i", chd_path], timing=timing
+                )
+        except OSError as e:
+            self.events.log_updated(f"Could not verify {chd_path}: {e}")
+            return
+        if self.cancelled:
+            return
+
+        ok = return_code == 0
+        if ok:
+            self.stats.record_verify(name, True)
+        else:
+            self.stats.record_verify_failure(name, original_size, compressed_size, seconds)
+        if self.journal is not None:
+            self.journal.record_verify(job, name, ok)
+        if ok:
+            self.events.log_updated(f"Verified: {chd_path}")
+            return
+        self.events.log_updated(f"Verification FAILED for {chd_path}: {stderr.strip()}")
+        self.events.progress_text(f"✗ Failed verification: {name}")
+        self.existing_outputs.discard(chd_path)
+        try:
+            os.remove(chd_path)
+        except OSError as e:
+            self.events.log_updated(f"Warning: could not remove {chd_path}: {e}")
+
+    def _acquire_threads(self) -> int:
+        """chdman's ``-np`` for a conversion starting now; 0 if the profile pins it."""
+        if self.profile.processors:
+            return 0
+        with self._progress_lock:
+            jobs_left = len(self.files) - self._jobs_finished
+        return self.cpu_scheduler.acquire(max(1, min(self.max_jobs, jobs_left)))
+
+    def _chdman_progress_reporter(
+        self, job: int, name: str, size: int, span: tuple[float, float]
+    ) -> Callable[[float, float | None], None]:
+        """Callback turning chdman's progress lines into job progress, MB/s and ETA."""
+        start, end = span
+        began = time.monotonic()
+        last_report = -RATE_REPORT_INTERVAL
+
+        def report(fraction: float, ratio: float | None) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report < RATE_REPORT_INTERVAL and fraction < 1.0:
+                return
+            last_report = now
+            self._set_job_progress(job, start + (end - start) * fraction)
+            elapsed = now - began
+            done = fraction * size
+            rate = done / elapsed if elapsed > 0 else 0.0
+            eta = (size - done) / rate if rate > 0 else -1.0
+            self.events.job_rate(job, rate / 1024**2, eta)
+            self.events.progress_text(
+                f"Converting {name}: {fraction * 100:.1f}%, "
+                f"{rate / 1024**2:.1f} MB/s, ETA {format_duration(eta)}"
+                + (f" (ratio {ratio:.1f}%)" if ratio is not None else "")
+            )
+
+        return report
+
+    def _run_chdman(
+        self,
+        cmd: list[str],
+        on_progress: Callable[[float, float | None], None] | None = None,
+        timing: JobSpan | None = None,
+    ) -> tuple[int, str, str]:
+        """Run chdman and return (return_code, stdout tail, stderr tail).
+
+        - ``stdin=DEVNULL`` so chdman never blocks on an interactive prompt.
+        - stdout/stderr drained in background threads: newer chdman emits
+          continuous progress to stderr, which fills Windows' ~4 KB pipe
+          buffer and would deadlock ``subprocess.run(capture_output=True)``.
+        - The running process is registered in ``self._procs`` so
+          ``cancel()`` can kill it synchronously, whichever job owns it.
+        - stderr is parsed as it streams: each progress line goes to
+          ``on_progress(fraction, ratio)`` and is then dropped. Only the
+          last ``CHDMAN_TAIL_LINES`` other lines of each stream are kept
+          (in a ring buffer), so memory stays flat however long chdman
+          runs and however many jobs run at once.
+        - chdman's own CPU time is added to ``timing``, if given.
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            creationflags=_CREATE_NO_WINDOW,
+        )
+        self._register_proc(proc)
+
+        stdout_tail: deque[str] = deque(maxlen=CHDMAN_TAIL_LINES)
+        stderr_tail: deque[str] = deque(maxlen=CHDMAN_TAIL_LINES)
+
+        def drain(stream, sink: deque[str], parse: bool = False) -> None:
+            try:
+                # Bounded reads: a stream that never ends a line can't
+                # grow one string without limit either.
+                for line in iter(lambda: stream.readline(_MAX_LINE_CHARS), ""):
+                    if parse:
+                        progress = parse_chdman_progress(line)
+                        if progress is not None:
+                            if on_progress is not None:
+                                on_progress(*progress)
+                            continue
+                    sink.append(line)
+            finally:
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+
+        t_out = threading.Thread(
+            target=drain, args=(proc.stdout, stdout_tail), daemon=True
+        )
+        t_err = threading.Thread(
+            target=drain, args=(proc.stderr, stderr_tail, True), daemon=True
+        )
+        t_out.start()
+        t_err.start()
+
+        return_code, cpu = wait_for(proc)
+        if timing is not None:
+            timing.cpu += cpu
+        t_out.join(timeout=2)
+        t_err.join(timeout=2)
+
+        self._unregister_proc(proc)
+
+        return return_code, "".join(stdout_tail), "".join(stderr_tail)
+
+    def _discard_incomplete_output(self, path: str) -> None:
+        # No exists() pre-check: on a share that's one more round trip.
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.events.log_updated(f"Could not remove incomplete file: {e}")
+
+    def _cleanup_temp_files_for_file(self, file_path: str) -> None:
+        """Delete any leftover temp files whose name shares the converted file's stem.
+
+        Only the temp dir that ``file_path`` was extracted into is touched:
+        with several jobs in flight, another archive's temp dir may hold a
+        disc whose name happens to contain this stem.
+        """
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        for temp_dir in list(self.temp_dirs):
+            if not os.path.exists(temp_dir) or not _is_within(file_path, temp_dir):
+                continue
+            for root, _dirs, files in os.walk(temp_dir):
+                for name in files:
+                    if stem in name:
+                        try:
+                            os.remove(os.path.join(root, name))
+                        except OSError:
+                            pass
+
+    def _discard_temp_dir(self, temp_dir: str) -> None:
+        """Delete one archive's temp dir as soon as its job is done with it.
+
+        Freeing the space per archive (rather than at the end of the run)
+        keeps temp usage proportional to the archives in flight, not to
+        the size of the whole batch.
+        """
+        with self._reservation_lock:
+            reserved = self._temp_reservations.pop(temp_dir, None)
+        with self._span(CLEANUP, reserved or 0):
+            temp_manager.cleanup_temp_dir(temp_dir)
+        try:
+            self.temp_dirs.remove(temp_dir)
+        except ValueError:
+            pass
+        if reserved is not None:
+            self.temp_budget.release(reserved)
+
+    def cleanup_temp_dirs(self) -> int:
+        """Public: remove every temp dir this worker created. Returns count cleaned."""
+        cleaned = 0
+        for d in self.temp_dirs:
+            if temp_manager.cleanup_temp_dir(d):
+                cleaned += 1
+        self.temp_dirs = []
+        return cleaned
@@ -0,0 +1,243 @@
+"""Qt item model behind the main window's file list.
+
+A ``QListWidget`` with one ``QListWidgetItem`` (and one Python dict) per
+file gets slow with libraries in the 100k range: every row is a heap of
+Qt and Python objects, and anything that wants a count walks them all.
+``FileListModel`` instead keeps one plain list per field ("columnar"
+storage) plus a path -> row map, so looking up a row, toggling its check
+box or applying its validation result is O(1). The checked / valid /
+invalid / size totals live in a ``ListSummary`` that is adjusted as rows
+change rather than recounted.
+
+The view's ``FileListDelegate`` paints from ``ROLE_FILE_INFO``; the model
+builds that dict on demand for the rows actually being painted.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Iterable
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from .list_summary import ListSummary
+
+# Custom data roles. ROLE_FILE_INFO carries a ``get_file_info``-shaped
+# dict; 'is_valid' is absent from it while validation is still pending.
+ROLE_FILE_INFO = Qt.UserRole + 1
+ROLE_FILE_PATH = Qt.UserRole + 2
+
+PENDING_MSG = "Validating..."
+
+
+class FileListModel(QAbstractListModel):
+    """One row per found file, stored column-wise."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._paths: list[str] = []
+        self._names: list[str] = []
+        self._sizes: list[int] = []
+        self._size_strs: list[str] = []
+        self._exts: list[str] = []
+        self._valid: list[bool | None] = []  # None = validation pending
+        self._msgs: list[str] = []
+        self._checked: list[bool] = []
+        self._row_of: dict[str, int] = {}
+        self.summary = ListSummary()
+
+    # -- QAbstractListModel ------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self._names[row]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        if role == ROLE_FILE_INFO:
+            return self.file_info(row)
+        if role == ROLE_FILE_PATH:
+            return self._paths[row]
+        if role == Qt.ToolTipRole:
+            # Built lazily: only rows the user hovers ever pay for it.
+            if self._valid[row] is None:
+                return self._paths[row]
+            return (
+                f"{self._paths[row]}\n"
+                f"{self._size_strs[row]}  ({self._exts[row]})\n"
+                f"{self._msgs[row]}"
+            )
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        self._set_checked(index.row(), value == Qt.Checked)
+        return True
+
+    # -- Row access --------------------------------------------------------
+
+    def path_at(self, row: int) -> str:
+        return self._paths[row]
+
+    def row_of(self, path: str) -> int | None:
+        return self._row_of.get(path)
+
+    def paths(self) -> list[str]:
+        return list(self._paths)
+
+    def is_checked(self, row: int) -> bool:
+        return self._checked[row]
+
+    def checked_paths(self) -> list[str]:
+        return [p for p, c in zip(self._paths, self._checked) if c]
+
+    @property
+    def checked_count(self) -> int:
+        return self.summary.checked
+
+    def file_info(self, row: int) -> dict:
+        """The row as a ``get_file_info``-shaped dict."""
+        info = {
+            "name": self._names[row],
+            "path": self._paths[row],
+            "size": self._sizes[row],
+            "size_str": self._size_strs[row],
+            "extension": self._exts[row],
+            "validation_msg": self._msgs[row],
+        }
+        if self._valid[row] is not None:
+            info["is_valid"] = self._valid[row]
+        return info
+
+    # -- Mutation ----------------------------------------------------------
+
+    def append_files(self, infos: Iterable[dict], checked: bool = True) -> None:
+        """Append one row per info dict (pending if it has no 'is_valid')."""
+        infos = [i for i in infos if i["path"] not in self._row_of]
+        if not infos:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(infos) - 1)
+        for offset, info in enumerate(infos):
+            path = info["path"]
+            self._row_of[path] = first + offset
+            self._paths.append(path)
+            self._names.append(info.get("name") or os.path.basename(path))
+            self._sizes.append(info.get("size", 0))
+            self._size_strs.append(info.get("size_str", ""))
+            self._exts.append(info.get("extension", ""))
+            self._valid.append(info.get("is_valid"))
+            self._msgs.append(info.get("validation_msg", PENDING_MSG))
+            self._checked.append(checked)
+            self.summary.add_row(checked, self._valid[-1], self._sizes[-1])
+        self.endInsertRows()
+
+    def remove_paths(self, paths: Iterable[str]) -> None:
+        """Drop the rows for ``paths`` (unknown paths are ignored)."""
+        rows = sorted(
+            (self._row_of[p] for p in set(paths) if p in self._row_of),
+            reverse=True,
+        )
+        if not rows:
+            return
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.summary.remove_row(
+                self._checked[row], self._valid[row], self._sizes[row]
+            )
+            for column in self._columns():
+                del column[row]
+            self.endRemoveRows()
+        self._row_of = {p: i for i, p in enumerate(self._paths)}
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        for column in self._columns():
+            column.clear()
+        self._row_of.clear()
+        self.summary.reset()
+        self.endResetModel()
+
+    def set_file_info(self, path: str, info: dict) -> bool:
+        """Apply a validation result to ``path``'s row. False if not listed."""
+        row = self._row_of.get(path)
+        if row is None:
+            return False
+        self._apply_info(row, info)
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx, [ROLE_FILE_INFO, Qt.ToolTipRole])
+        return True
+
+    def set_file_infos(self, infos: dict[str, dict]) -> int:
+        """Bulk ``set_file_info``: one ``dataChanged`` for the whole batch.
+
+        Returns how many of the paths are listed (and were updated).
+        """
+        rows = []
+        for path, info in infos.items():
+            row = self._row_of.get(path)
+            if row is not None:
+                self._apply_info(row, info)
+                rows.append(row)
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows)), self.index(max(rows)),
+                [ROLE_FILE_INFO, Qt.ToolTipRole],
+            )
+        return len(rows)
+
+    def reset_validation(self) -> None:
+        """Put every row back into the pending state."""
+        if not self._paths:
+            return
+        self._valid = [None] * len(self._paths)
+        self._msgs = [PENDING_MSG] * len(self._paths)
+        self.summary.clear_validation()
+        self.dataChanged.emit(
+            self.index(0), self.index(len(self._paths) - 1),
+            [ROLE_FILE_INFO, Qt.ToolTipRole],
+        )
+
+    def set_all_checked(self, checked: bool) -> None:
+        if not self._paths:
+            return
+        self._checked = [checked] * len(self._paths)
+        self.summary.checked = len(self._paths) if checked else 0
+        self.dataChanged.emit(
+            self.index(0), self.index(len(self._paths) - 1), [Qt.CheckStateRole]
+        )
+
+    def _apply_info(self, row: int, info: dict) -> None:
+        old_valid, old_size = self._valid[row], self._sizes[row]
+        self._sizes[row] = info.get("size", self._sizes[row])
+        self._size_strs[row] = info.get("size_str", self._size_strs[row])
+        self._valid[row] = info.get("is_valid")
+        self._msgs[row] = info.get("validation_msg", "")
+        self.summary.set_validation(
+            old_valid, old_size, self._valid[row], self._sizes[row]
+        )
+
+    def _set_checked(self, row: int, checked: bool) -> None:
+        if self._checked[row] == checked:
+            return
+        self._checked[row] = checked
+        self.summary.set_checked(not checked, checked)
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx, [Qt.CheckStateRole])
+
+    def _columns(self) -> tuple[list, ...]:
+        return (
+            self._paths, self._names, self._sizes, self._size_strs,
+            self._exts, self._valid, self._msgs, self._checked,
+        )
@@ -0,0 +1,222 @@
+"""Append-only journal of a conversion run, so an interrupted run can resume.
+
+A long batch (thousands of archives, many hours) that dies halfway - a
+crash, a reboot, a closed laptop lid - used to leave only the ``.chd``
+files themselves as a record of progress. Starting again meant rescanning,
+re-validating and, for every archive whose discs hadn't all landed yet,
+unpacking it again just to find out.
+
+``RunJournal`` writes one JSON line per event to ``last_run.jsonl`` beside
+the app: a header with the run's inputs and output folder, then each job's
+state as it moves through ``extracting`` -> ``converting`` -> ``done`` /
+``failed``, the ``chdman verify`` result of each .chd when the run
+verifies, and a closing line when the run ends. Every line is flushed
+and fsync'd, so the file is as current as the last state change. A run
+without a closing line (or one that was stopped) is resumable:
+``load_run`` reads it back and ``RunRecord.remaining`` lists the inputs
+that never reached ``done``. A resumed run journals only the inputs it
+runs, so it carries the earlier run's failures it didn't retry over in
+its header; ``--retry-failed`` can still find them after any number of
+resumes.
+
+Like the validation cache, the journal never fails a conversion: if it
+can't be written it logs a warning and stops recording.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+from .temp_manager import temp_manager
+
+log = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = "last_run.jsonl"
+
+# Job states, in the order a job moves through them.
+QUEUED = "queued"
+EXTRACTING = "extracting"
+CONVERTING = "converting"
+DONE = "done"
+FAILED = "failed"
+
+
+def journal_path() -> str:
+    """Where the GUI and the command line keep the last run's journal."""
+    return os.path.join(temp_manager.app_dir, JOURNAL_FILENAME)
+
+
+@dataclass
+class RunRecord:
+    """A run as read back from its journal."""
+
+    output_dir: str
+    files: list[str]
+    states: dict[int, str] = field(default_factory=dict)  # job number (1-based) -> state
+    completed: bool = False  # ran to the end without being stopped
+    verified: dict[str, bool] = field(default_factory=dict)  # .chd name -> passed verify
+    # Inputs that failed in an earlier run and weren't part of this one.
+    carried_failures: list[str] = field(default_factory=list)
+
+    def state_of(self, job: int) -> str:
+        return self.states.get(job, QUEUED)
+
+    def remaining(self, retry_failed: bool = False) -> list[str]:
+        """Inputs still to do, in run order: never finished, or failed if asked.
+
+        A completed run has nothing unfinished, so it only yields its
+        failures, and only when ``retry_failed`` is set.
+        """
+        if retry_failed:
+            return self._in_states(QUEUED, EXTRACTING, CONVERTING, FAILED) + [
+                p for p in self.carried_failures if p not in self.files
+            ]
+        if self.completed:
+            return []
+        return self._in_states(QUEUED, EXTRACTING, CONVERTING)
+
+    def failed(self) -> list[str]:
+        """Inputs that failed, in this run or (carried over) an earlier one."""
+        return self._in_states(FAILED) + [
+            p for p in self.carried_failures if p not in self.files
+        ]
+
+    def _in_states(self, *states: str) -> list[str]:
+        return [
+            path
+            for job, path in enumerate(self.files, start=1)
+            if self.state_of(job) in states
+        ]
+
+    @property
+    def resumable(self) -> bool:
+        return bool(self.remaining())
+
+
+class RunJournal:
+    """Thread-safe writer for one run's journal file.
+
+    ``carried_failures`` are inputs an earlier run failed that this run
+    doesn't retry; they are written into the header so they stay on record.
+    """
+
+    def __init__(self, path: str, carried_failures: list[str] | None = None) -> None:
+        self.path = path
+        self.carried_failures = list(carried_failures or [])
+        self._lock = threading.Lock()
+        self._fh = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._fh is not None
+
+    def begin(self, files: list[str], output_dir: str) -> None:
+        """Start a new run, replacing whatever the file recorded before."""
+        with self._lock:
+            self._close_locked()
+            try:
+                self._fh = open(self.path, "w", encoding="utf-8")
+            except OSError as e:
+                log.warning("Run journal disabled (%s): %s", self.path, e)
+                return
+            header = {
+                "run": 1,
+                "started": time.time(),
+                "output_dir": output_dir,
+                "files": list(files),
+            }
+            if self.carried_failures:
+                header["carried_failures"] = self.carried_failures
+            self._write_locked(header)
+
+    def record(self, job: int, state: str) -> None:
+        """Job number ``job`` (1-based, as in the engine) reached ``state``."""
+        with self._lock:
+            self._write_locked({"job": job, "state": state})
+
+    def record_verify(self, job: int, chd_name: str, ok: bool) -> None:
+        """``chd_name``, produced by job ``job``, passed (or failed) ``chdman verify``."""
+        with self._lock:
+            self._write_locked({"job": job, "verify": chd_name, "ok": ok})
+
+    def end(self, completed: bool) -> None:
+        """Close the run; a stopped run (``completed=False``) stays resumable."""
+        with self._lock:
+            self._write_locked({"end": "completed" if completed else "stopped"})
+            self._close_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _write_locked(self, entry: dict) -> None:
+        if self._fh is None:
+            return
+        try:
+            self._fh.write(json.dumps(entry) + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        except (OSError, ValueError) as e:
+            log.warning("Run journal disabled (%s): %s", self.path, e)
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._fh is None:
+            return
+        try:
+            self._fh.close()
+        except OSError:
+            pass
+        self._fh = None
+
+
+def load_run(path: str | None = None) -> RunRecord | None:
+    """Read the journal at ``path`` (default: ``journal_path()``), or None.
+
+    A torn final line - the process died mid-write - is ignored, as is
+    anything else that isn't valid JSON.
+    """
+    path = path or journal_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    record: RunRecord | None = None
+    # Verification can finish before or after its job's "done" line; a
+    # .chd that failed it fails the job either way.
+    bad_jobs: set[int] = set()
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(entry, dict):
+            continue
+        if "run" in entry:
+            record = RunRecord(
+                output_dir=entry.get("output_dir", ""),
+                files=list(entry.get("files", [])),
+                carried_failures=list(entry.get("carried_failures", [])),
+            )
+            bad_jobs = set()
+        elif record is None:
+            continue
+        elif "verify" in entry:
+            ok = bool(entry.get("ok"))
+            record.verified[str(entry["verify"])] = ok
+            if not ok and "job" in entry:
+                bad_jobs.add(int(entry["job"]))
+        elif "job" in entry:
+            record.states[int(entry["job"])] = entry.get("state", QUEUED)
+        elif "end" in entry:
+            record.completed = entry["end"] == "completed"
+    if record is not None:
+        for job in bad_jobs:
+            record.states[job] = FAILED
+    return record
@@ -0,0 +1,72 @@
+"""Running totals for the file list: checked, valid, invalid, valid bytes.
+
+The summary label and the status bar used to recount these by walking
+every row and the whole ``file_info_cache`` - once per
+``validation_progress`` signal, which made validating N files O(N^2) on
+the GUI thread. ``ListSummary`` is instead adjusted by the owner of the
+rows (``FileListModel``) whenever one row is added, removed, checked or
+validated, so reading it is O(1).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class ListSummary:
+    """Aggregate counters over a file list. Not thread-safe (GUI thread only)."""
+
+    total: int = 0
+    checked: int = 0
+    valid: int = 0
+    invalid: int = 0  # validated and rejected; pending rows count as neither
+    valid_size: int = 0  # bytes
+
+    @property
+    def validated(self) -> int:
+        return self.valid + self.invalid
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.validated
+
+    def add_row(self, checked: bool, is_valid: bool | None, size: int) -> None:
+        self.total += 1
+        self.checked += checked
+        self._count(is_valid, size, +1)
+
+    def remove_row(self, checked: bool, is_valid: bool | None, size: int) -> None:
+        self.total -= 1
+        self.checked -= checked
+        self._count(is_valid, size, -1)
+
+    def set_checked(self, was_checked: bool, checked: bool) -> None:
+        self.checked += checked - was_checked
+
+    def set_validation(
+        self,
+        old_valid: bool | None,
+        old_size: int,
+        new_valid: bool | None,
+        new_size: int,
+    ) -> None:
+        """One row's validation result (or pending state) changed."""
+        self._count(old_valid, old_size, -1)
+        self._count(new_valid, new_size, +1)
+
+    def clear_validation(self) -> None:
+        """Every row went back to pending."""
+        self.valid = self.invalid = self.valid_size = 0
+
+    def reset(self) -> None:
+        self.total = self.checked = self.valid = self.invalid = self.valid_size = 0
+
+    def _count(self, is_valid: bool | None, size: int, sign: int) -> None:
+        if is_valid is None:
+            return
+        if is_valid:
+            self.valid += sign
+            self.valid_size += sign * size
+        else:
+            self.invalid += sign
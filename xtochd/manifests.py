@@ -0,0 +1,92 @@
+"""Reading the track files a disc index (.cue/.gdi/.toc/.ccd) refers to.
+
+Used to extract only what a disc needs from an archive: the chosen index
+plus the files it references, instead of every member (readmes, artwork,
+scans, unrelated discs) of a "full set" zip.
+
+Parsing is deliberately forgiving - the result only decides what to
+unpack. Callers fall back to extracting everything when a reference can't
+be matched, so a manifest we misread costs temp space, never a disc.
+"""
+
+from __future__ import annotations
+
+import os
+import posixpath
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+# CUE:  FILE "Track 01.bin" BINARY   |   FILE track01.bin BINARY
+_CUE_FILE = re.compile(r'^\s*FILE\s+(?:"([^"]+)"|(.+?))\s+\S+\s*$', re.IGNORECASE)
+# GDI (after the track-count line):  1 0 4 2352 "Track 01.bin" 0
+_GDI_TRACK = re.compile(r'^\s*\d+\s+\d+\s+\d+\s+\d+\s+(?:"([^"]+)"|(\S+))')
+# TOC:  FILE "audio.bin" 0 ...   |   DATAFILE "data.bin"   |   AUDIOFILE ...
+_TOC_FILE = re.compile(
+    r'\b(?:FILE|DATAFILE|AUDIOFILE)\s+(?:"([^"]+)"|(\S+))', re.IGNORECASE
+)
+
+
+@dataclass
+class IndexReferences:
+    """Files an index names, relative to the index's own directory."""
+
+    required: list[str] = field(default_factory=list)
+    optional: list[str] = field(default_factory=list)  # used if present (.ccd's .sub)
+
+
+def parse_index(index_name: str, text: str) -> IndexReferences:
+    """Return the files referenced by the index ``index_name`` with contents ``text``."""
+    ext = os.path.splitext(index_name)[1].lower()
+    refs = IndexReferences()
+    if ext == ".cue":
+        for line in text.splitlines():
+            m = _CUE_FILE.match(line)
+            if m:
+                refs.required.append(m.group(1) or m.group(2))
+    elif ext == ".gdi":
+        for line in text.splitlines()[1:]:
+            m = _GDI_TRACK.match(line)
+            if m:
+                refs.required.append(m.group(1) or m.group(2))
+    elif ext == ".toc":
+        for line in text.splitlines():
+            line = line.split("//", 1)[0]
+            for m in _TOC_FILE.finditer(line):
+                refs.required.append(m.group(1) or m.group(2))
+    elif ext == ".ccd":
+        # CloneCD names nothing: the image and subchannel share its stem.
+        stem = os.path.splitext(os.path.basename(index_name))[0]
+        refs.required.append(stem + ".img")
+        refs.optional.append(stem + ".sub")
+    # Keep order, drop repeats (multi-session cues can name a file twice).
+    refs.required = list(dict.fromkeys(refs.required))
+    return refs
+
+
+def resolve_members(
+    index_member: str, refs: IndexReferences, members: Iterable[str]
+) -> list[str] | None:
+    """Map ``refs`` onto archive member names, or None if any required one is missing.
+
+    Matching is case-insensitive and accepts Windows-style separators,
+    since dumps authored on Windows rarely agree with the archive on case.
+    """
+    by_lower = {m.lower(): m for m in members}
+    base = posixpath.dirname(index_member.replace("\\", "/"))
+
+    def lookup(ref: str) -> str | None:
+        rel = ref.replace("\\", "/")
+        return by_lower.get(posixpath.normpath(posixpath.join(base, rel)).lower())
+
+    resolved: list[str] = []
+    for ref in refs.required:
+        member = lookup(ref)
+        if member is None:
+            return None
+        resolved.append(member)
+    for ref in refs.optional:
+        member = lookup(ref)
+        if member is not None:
+            resolved.append(member)
+    return resolved
@@ -0,0 +1,89 @@
+"""chdman compression profiles: codec list, hunk size and processor count.
+
+``chdman createcd`` picks, per hunk, whichever of its ``-c`` codecs
+compresses best, so the codec list is the main ratio/speed dial: LZMA
+(``cdlz``) gives the smallest files and is by far the slowest to
+compress, zstd (``cdzs``) and zlib (``cdzl``) are quick, and FLAC
+(``cdfl``) handles audio tracks. ``-hs`` sets the hunk size (a multiple of
+the 2448-byte CD frame; bigger hunks compress a little better but make
+random reads coarser) and ``-np`` the number of compression threads.
+
+A ``ChdmanProfile`` bundles the three; ``None`` leaves chdman's default.
+The built-in profiles cover the two ends - ``archival`` for one-off runs
+where size matters most, ``fast`` for nightly incremental batches - with
+``default`` reproducing a plain ``createcd``. ``archival`` also doubles
+chdman's 8-frame CD hunk, trading read granularity for a smaller file;
+``fast`` keeps the default hunk, which compresses no slower. None of them
+pins ``-np``: the engine's ``CpuScheduler`` splits the cores between
+concurrent jobs instead.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# A CD frame as chdman stores it: 2352 bytes of sector data + 96 of subcode.
+CD_FRAME_BYTES = 2448
+# chdman createcd's default hunk: 8 frames.
+DEFAULT_CD_HUNK_BYTES = 8 * CD_FRAME_BYTES
+
+
+@dataclass(frozen=True)
+class ChdmanProfile:
+    name: str
+    description: str
+    codecs: tuple[str, ...] | None = None  # -c
+    hunk_size: int | None = None  # -hs, bytes
+    processors: int | None = None  # -np
+
+    def args(self) -> list[str]:
+        """The ``createcd`` options this profile adds."""
+        args: list[str] = []
+        if self.codecs:
+            args += ["-c", ",".join(self.codecs)]
+        if self.hunk_size:
+            args += ["-hs", str(self.hunk_size)]
+        if self.processors:
+            args += ["-np", str(self.processors)]
+        return args
+
+    def summary(self) -> str:
+        """One line for logs: name plus whatever it changes."""
+        parts = []
+        if self.codecs:
+            parts.append("codecs " + ",".join(self.codecs))
+        if self.hunk_size:
+            parts.append(f"hunk {self.hunk_size} B")
+        if self.processors:
+            parts.append(f"{self.processors} threads")
+        return f"{self.name} ({', '.join(parts) or 'chdman defaults'})"
+
+
+PROFILES: dict[str, ChdmanProfile] = {
+    "default": ChdmanProfile(
+        "default", "chdman's own defaults (cdlz, cdzl, cdfl)"
+    ),
+    "archival": ChdmanProfile(
+        "archival",
+        "smallest files: every CD codec, LZMA included, double-size hunks; slowest",
+        codecs=("cdlz", "cdzs", "cdzl", "cdfl"),
+        hunk_size=2 * DEFAULT_CD_HUNK_BYTES,
+    ),
+    "fast": ChdmanProfile(
+        "fast",
+        "quickest: no LZMA, zstd/zlib for data, FLAC for audio; larger files",
+        codecs=("cdzs", "cdzl", "cdfl"),
+    ),
+}
+
+DEFAULT_PROFILE = PROFILES["default"]
+
+
+def get_profile(name: str) -> ChdmanProfile:
+    """The built-in profile called ``name`` (``KeyError`` if there is none)."""
+    return PROFILES[name]
+
+
+def valid_hunk_size(nbytes: int) -> bool:
+    """chdman only accepts CD hunks made of whole frames."""
+    return nbytes > 0 and nbytes % CD_FRAME_BYTES == 0
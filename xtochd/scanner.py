@@ -0,0 +1,338 @@
+"""Finding convertible files on disk and merging them into the file list.
+
+Shared by the GUI (via ``ScanWorker`` and ``CHDConverterGUI.scan_completed``)
+and the headless command line, so both apply the same hidden-directory
+skip, extension filter, and same-disc duplicate rules.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+from .constants import COMPATIBLE_EXTS
+
+log = logging.getLogger(__name__)
+
+# Multi-file disc formats where a "duplicate" base name is actually a
+# required companion, not a replacement.
+MULTI_FILE_FORMATS: dict[str, tuple[str, ...]] = {
+    ".cue": (".bin",),
+    ".toc": (".bin",),
+    ".ccd": (".img", ".sub"),
+}
+
+# Format priority when the same base name appears in two formats: pick the
+# smaller number. Anything not listed drops to 999.
+FORMAT_PRIORITY: dict[str, int] = {
+    ".iso": 1, ".cue": 2, ".bin": 3, ".img": 4,
+    ".zip": 5, ".nrg": 6, ".gdi": 7, ".toc": 8,
+    ".ccd": 9, ".vcd": 10,
+    ".cdr": 11, ".hdi": 12, ".vhd": 13, ".vmdk": 14, ".dsk": 15,
+}
+
+
+@dataclass
+class DirListing:
+    """One directory as listed by the walker, with how long the listing took."""
+
+    path: str
+    files: list[str] = field(default_factory=list)  # COMPATIBLE files only
+    subdirs: list[str] = field(default_factory=list)  # to descend into
+    entries: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+class DirTimings:
+    """``on_dir_listed`` callback that keeps totals and the slowest listings.
+
+    Only the ``keep`` slowest directories are retained, so memory stays
+    flat on trees with hundreds of thousands of folders. Safe to call from
+    the walker's pool threads.
+    """
+
+    def __init__(self, keep: int = 10) -> None:
+        self.keep = keep
+        self.dirs = 0
+        self.seconds = 0.0
+        self._slowest: list[tuple[float, str]] = []  # min-heap of (seconds, path)
+        self._lock = threading.Lock()
+
+    def __call__(self, listing: DirListing) -> None:
+        with self._lock:
+            self.dirs += 1
+            self.seconds += listing.seconds
+            item = (listing.seconds, listing.path)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, item)
+            elif item > self._slowest[0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def slowest(self) -> list[tuple[str, float]]:
+        """``(path, seconds)`` for the slowest directories, slowest first."""
+        with self._lock:
+            return [(p, t) for t, p in sorted(self._slowest, reverse=True)]
+
+
+def _list_dir(directory: str) -> DirListing:
+    """List one directory, classifying entries from ``DirEntry`` type info.
+
+    ``DirEntry.is_dir`` answers from the directory read itself on every
+    platform we support, so no per-file ``stat`` round trip is made - on
+    SMB/NFS shares those round trips, not the listing, are the slow part.
+    """
+    listing = DirListing(directory)
+    start = time.perf_counter()
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                listing.entries += 1
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk: skip hidden dirs, don't follow dir links.
+                    if not entry.name.startswith(".") and not entry.is_symlink():
+                        listing.subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in COMPATIBLE_EXTS:
+                    listing.files.append(entry.path)
+    except OSError as e:
+        log.debug("Skipping unreadable directory %s: %s", directory, e)
+        listing.error = str(e)
+    listing.seconds = time.perf_counter() - start
+    return listing
+
+
+def iter_scan(
+    input_paths: Iterable[str],
+    workers: int = 1,
+    on_dir_listed: Callable[[DirListing], None] | None = None,
+    heartbeat: float | None = None,
+) -> Iterator[str | None]:
+    """Yield every COMPATIBLE file under ``input_paths`` as it is found.
+
+    Plain files are taken as-is if their extension is accepted; directories
+    are walked recursively with ``os.scandir``, skipping hidden directories
+    (names starting with '.') and, like ``os.walk``, not following
+    directory symlinks or failing on unreadable directories. Being a
+    generator, the first results reach the caller long before a walk of a
+    large network share finishes.
+
+    With ``workers > 1`` subdirectories are listed concurrently on a
+    thread pool, hiding per-directory latency on network shares; results
+    then arrive in completion order rather than walk order.
+    ``on_dir_listed`` receives each ``DirListing`` (with its timing) as
+    the directory is done.
+
+    With ``heartbeat`` set, directories are always listed off the calling
+    thread, and ``None`` is yielded whenever that many seconds pass with
+    no listing finished - so a caller batching results can flush on time
+    while one slow directory of a network share is still being read.
+    """
+    roots: list[str] = []
+    for input_path in input_paths:
+        if os.path.isfile(input_path):
+            if os.path.splitext(input_path)[1].lower() in COMPATIBLE_EXTS:
+                yield input_path
+        else:
+            roots.append(input_path)
+    if not roots:
+        return
+    if workers <= 1 and heartbeat is None:
+        for root in roots:
+            yield from _walk_serial(root, on_dir_listed)
+    else:
+        yield from _walk_parallel(roots, max(1, workers), on_dir_listed, heartbeat)
+
+
+def _walk_serial(
+    root: str, on_dir_listed: Callable[[DirListing], None] | None
+) -> Iterator[str]:
+    stack = [root]
+    while stack:
+        listing = _list_dir(stack.pop())
+        if on_dir_listed is not None:
+            on_dir_listed(listing)
+        yield from listing.files
+        # Reversed so subdirectories are visited in listing order.
+        stack.extend(reversed(listing.subdirs))
+
+
+def _walk_parallel(
+    roots: list[str],
+    workers: int,
+    on_dir_listed: Callable[[DirListing], None] | None,
+    heartbeat: float | None = None,
+) -> Iterator[str | None]:
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan")
+    # Listings are handed over through a queue as they finish: O(1) per
+    # directory, where re-``wait``ing on every pending future would cost
+    # O(pending) per directory and go quadratic on a large tree.
+    finished: queue.Queue[Future] = queue.Queue()
+
+    def submit(path: str) -> None:
+        executor.submit(_list_dir, path).add_done_callback(finished.put)
+
+    try:
+        for root in roots:
+            submit(root)
+        outstanding = len(roots)
+        while outstanding:
+            try:
+                future = finished.get(timeout=heartbeat)
+            except queue.Empty:
+                yield None
+                continue
+            listing = future.result()
+            outstanding -= 1
+            for d in listing.subdirs:
+                submit(d)
+            outstanding += len(listing.subdirs)
+            if on_dir_listed is not None:
+                on_dir_listed(listing)
+            yield from listing.files
+    finally:
+        # Also reached when the caller stops iterating early.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_paths(
+    input_paths: Iterable[str],
+    on_found: Callable[[str], None] | None = None,
+    workers: int = 1,
+    on_dir_listed: Callable[[DirListing], None] | None = None,
+) -> list[str]:
+    """Return every COMPATIBLE file under ``input_paths`` (see ``iter_scan``).
+
+    ``on_found`` is called with each path as it is discovered.
+    """
+    found: list[str] = []
+    for path in iter_scan(input_paths, workers, on_dir_listed):
+        found.append(path)
+        if on_found is not None:
+            on_found(path)
+    return found
+
+
+def _is_companion(ext_a: str, ext_b: str) -> bool:
+    return (
+        ext_b in MULTI_FILE_FORMATS.get(ext_a, ())
+        or ext_a in MULTI_FILE_FORMATS.get(ext_b, ())
+    )
+
+
+class FoundFileIndex:
+    """Lookup structures kept in step with a found-files list.
+
+    ``paths`` answers "already listed?" in O(1) and ``by_stem`` maps each
+    base name to its ``(path, ext)`` entries in list order, so merging a
+    new scan touches only the entries that share a name instead of the
+    whole list.
+    """
+
+    def __init__(self, paths: Iterable[str] = ()) -> None:
+        self.paths: set[str] = set()
+        self.by_stem: dict[str, list[tuple[str, str]]] = {}
+        for path in paths:
+            self.add(path)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.paths
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def add(self, path: str) -> None:
+        stem, ext = os.path.splitext(os.path.basename(path))
+        self.paths.add(path)
+        self.by_stem.setdefault(stem, []).append((path, ext.lower()))
+
+    def remove(self, path: str) -> None:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        self.paths.discard(path)
+        entries = self.by_stem.get(stem)
+        if not entries:
+            return
+        entries[:] = [e for e in entries if e[0] != path]
+        if not entries:
+            del self.by_stem[stem]
+
+
+@dataclass
+class MergeResult:
+    """What ``merge_found_files`` did to the list it was given."""
+
+    added: list[str] = field(default_factory=list)
+    replaced: list[str] = field(default_factory=list)  # removed in favour of a better format
+    duplicates: list[str] = field(default_factory=list)  # basenames of rejected new files
+
+
+def merge_found_files(
+    found_files: list[str],
+    new_paths: Iterable[str],
+    index: FoundFileIndex | None = None,
+) -> MergeResult:
+    """Merge ``new_paths`` into ``found_files`` in place, de-duplicating by base name.
+
+    Two files with the same stem are the same disc unless one is a
+    companion of the other (e.g. .cue + .bin). For real duplicates the
+    format with the better ``FORMAT_PRIORITY`` wins: a better new file
+    replaces the existing entry, otherwise the new file is rejected.
+
+    Runs in time linear in the list plus the new paths. Callers that merge
+    repeatedly should keep one ``index`` alongside ``found_files`` and pass
+    it every time; without one, an index is built from ``found_files``.
+    """
+    if index is None:
+        index = FoundFileIndex(found_files)
+    result = MergeResult()
+    added: list[str] = []
+    replaced: set[str] = set()
+    for file_path in new_paths:
+        if file_path in index:
+            continue
+
+        file_name = os.path.basename(file_path)
+        file_base, file_ext = os.path.splitext(file_name)
+        file_ext = file_ext.lower()
+
+        is_duplicate = False
+        should_replace = None
+
+        for existing, existing_ext in index.by_stem.get(file_base, ()):
+            if _is_companion(existing_ext, file_ext):
+                continue
+
+            new_priority = FORMAT_PRIORITY.get(file_ext, 999)
+            existing_priority = FORMAT_PRIORITY.get(existing_ext, 999)
+            if new_priority < existing_priority:
+                should_replace = existing
+                break
+            result.duplicates.append(file_name)
+            is_duplicate = True
+            break
+
+        if should_replace is not None:
+            index.remove(should_replace)
+            replaced.add(should_replace)
+            result.replaced.append(should_replace)
+
+        if not is_duplicate:
+            index.add(file_path)
+            found_files.append(file_path)
+            added.append(file_path)
+
+    if replaced:
+        # One compaction pass instead of a list.remove() per replacement.
+        found_files[:] = [p for p in found_files if p not in replaced]
+    result.added = [p for p in added if p not in replaced]
+    return result
@@ -0,0 +1,79 @@
+"""Sharing the machine between concurrent chdman processes.
+
+Two halves: ``CpuScheduler`` splits the cores between the chdmans that
+run at once, and ``order_jobs`` decides which inputs go first.
+
+chdman compresses on every core by default, so N parallel jobs used to
+start N x ``os.cpu_count()`` compression threads and spend the surplus on
+context switches. ``CpuScheduler`` instead hands each chdman an ``-np``
+share when it starts: the free cores divided between this start and the
+other conversions that can still be starting side by side.
+
+A running chdman can't be re-threaded, so rebalancing happens at each
+start: as the queue drains, fewer jobs compete and every new start gets a
+bigger share, up to all cores for the last disc.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+
+class CpuScheduler:
+    """Thread-safe ``-np`` allocator over ``cpus`` cores."""
+
+    def __init__(self, cpus: int | None = None) -> None:
+        self.cpus = max(1, cpus or os.cpu_count() or 1)
+        self._in_use = 0
+        self._holders = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_use(self) -> int:
+        with self._lock:
+            return self._in_use
+
+    def acquire(self, concurrent: int) -> int:
+        """Threads for a chdman starting now, with ``concurrent`` conversions expected.
+
+        ``concurrent`` counts this one, e.g. ``min(max_jobs, jobs left)``.
+        Always at least 1, even if others already hold every core.
+        """
+        with self._lock:
+            free = self.cpus - self._in_use
+            # Slots still to be filled, this one included; jobs already
+            # holding cores have had their share.
+            waiting = max(1, concurrent - self._holders)
+            threads = max(1, free // waiting)
+            self._in_use += threads
+            self._holders += 1
+            return threads
+
+    def release(self, threads: int) -> None:
+        with self._lock:
+            self._in_use = max(0, self._in_use - threads)
+            self._holders = max(0, self._holders - 1)
+
+
+# Job order policies. Largest-first keeps a big disc from starting last
+# and running alone while the other workers sit idle (classic LPT
+# scheduling); smallest-first gets the first .chd files out quickly.
+ORDER_LISTED = "listed"
+ORDER_LARGEST_FIRST = "largest-first"
+ORDER_SMALLEST_FIRST = "smallest-first"
+ORDER_POLICIES: tuple[str, ...] = (ORDER_LISTED, ORDER_LARGEST_FIRST, ORDER_SMALLEST_FIRST)
+
+
+def order_jobs(files: list[str], sizes: dict[str, int], policy: str) -> list[str]:
+    """``files`` in the order ``policy`` runs them, by estimated bytes in ``sizes``.
+
+    The sort is stable, so equal sizes keep their listed order.
+    """
+    if policy == ORDER_LARGEST_FIRST:
+        return sorted(files, key=lambda p: sizes.get(p, 0), reverse=True)
+    if policy == ORDER_SMALLEST_FIRST:
+        return sorted(files, key=lambda p: sizes.get(p, 0))
+    if policy != ORDER_LISTED:
+        raise ValueError(f"unknown job order: {policy}")
+    return list(files)
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 
+from .timing import JobSpan
+
 
 @dataclass
 class SuccessfulFile:
@@ -15,7 +18,11 @@ class SuccessfulFile:
 
 @dataclass
 class ConversionStats:
-    """Mutable per-run counters. Owned by a single ConversionWorker instance."""
+    """Mutable per-run counters. Owned by a single ConversionWorker instance.
+
+    The worker may run several conversion jobs at once, so every mutation
+    goes through one of the ``record_*`` helpers, which hold ``_lock``.
+    """
 
     total_files: int = 0
     successful_conversions: int = 0
@@ -25,9 +32,101 @@ class ConversionStats:
     original_size: int = 0  # bytes
     compressed_size: int = 0  # bytes
 
+    # The chdman profile the run used (``ChdmanProfile.summary()``) and what
+    # it bought: input bytes that converted successfully, their .chd bytes,
+    # and the chdman wall time they took - its ratio/speed trade-off.
+    profile: str = ""
+    converted_bytes: int = 0
+    converted_chd_bytes: int = 0
+    chdman_seconds: float = 0.0
+    # The order jobs were started in (``xtochd.scheduling.ORDER_POLICIES``).
+    job_order: str = ""
+
     successful_files: list[SuccessfulFile] = field(default_factory=list)
     failed_files: list[str] = field(default_factory=list)
     skipped_files_list: list[str] = field(default_factory=list)
+    # Identical discs converted once: (name, canonical name, hard-linked?).
+    duplicate_files: list[tuple[str, str, bool]] = field(default_factory=list)
+    # .chd files that passed / failed ``chdman verify`` (verify runs only).
+    verified_files: list[str] = field(default_factory=list)
+    verify_failed_files: list[str] = field(default_factory=list)
+    # Every timed stage of every job (``xtochd.timing``), for the summary's
+    # per-stage table.
+    spans: list[JobSpan] = field(default_factory=list)
+
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_success(
+        self,
+        name: str,
+        original_size: int,
+        compressed_size: int,
+        seconds: float = 0.0,
+    ) -> None:
+        with self._lock:
+            self.successful_conversions += 1
+            self.original_size += original_size
+            self.compressed_size += compressed_size
+            self.converted_bytes += original_size
+            self.converted_chd_bytes += compressed_size
+            self.chdman_seconds += seconds
+            self.successful_files.append(
+                SuccessfulFile(
+                    name=name,
+                    original_size_mb=original_size / (1024**2),
+                    compressed_size_mb=compressed_size / (1024**2),
+                )
+            )
+
+    def record_failure(self, name: str, original_size: int = 0) -> None:
+        with self._lock:
+            self.failed_conversions += 1
+            self.original_size += original_size
+            self.failed_files.append(name)
+
+    def record_skip(self, name: str) -> None:
+        with self._lock:
+            self.skipped_files += 1
+            self.skipped_files_list.append(name)
+
+    def record_duplicate(self, name: str, canonical: str, linked: bool) -> None:
+        with self._lock:
+            self.duplicate_files.append((name, canonical, linked))
+
+    def record_verify(self, name: str, ok: bool) -> None:
+        with self._lock:
+            (self.verified_files if ok else self.verify_failed_files).append(name)
+
+    def record_verify_failure(
+        self,
+        name: str,
+        original_size: int,
+        compressed_size: int,
+        seconds: float = 0.0,
+    ) -> None:
+        """Turn ``name``'s ``record_success`` into a failure: its .chd failed verify.
+
+        The .chd is deleted, so its bytes leave the space-saved and profile
+        totals. It is listed under ``verify_failed_files``, not ``failed_files``.
+        """
+        with self._lock:
+            self.verify_failed_files.append(name)
+            for i, f in enumerate(self.successful_files):
+                if f.name == name:
+                    del self.successful_files[i]
+                    break
+            self.successful_conversions -= 1
+            self.failed_conversions += 1
+            self.compressed_size -= compressed_size
+            self.converted_bytes -= original_size
+            self.converted_chd_bytes -= compressed_size
+            self.chdman_seconds -= seconds
+
+    def record_span(self, span: JobSpan) -> None:
+        with self._lock:
+            self.spans.append(span)
 
     @property
     def total_processed(self) -> int:
@@ -40,6 +139,24 @@ class ConversionStats:
             return None
         return self.successful_conversions / self.total_processed * 100
 
+    @property
+    def profile_ratio(self) -> float | None:
+        """Space saved by the profile on what it converted, as a percentage."""
+        if self.converted_bytes == 0:
+            return None
+        return (1 - self.converted_chd_bytes / self.converted_bytes) * 100
+
+    @property
+    def profile_throughput(self) -> float | None:
+        """Input MB per second of chdman time, or None if nothing was timed.
+
+        Summed over jobs, so with parallel jobs this is per-job speed, not
+        the batch's wall-clock rate.
+        """
+        if self.chdman_seconds <= 0:
+            return None
+        return self.converted_bytes / (1024**2) / self.chdman_seconds
+
     @property
     def compression_ratio(self) -> float | None:
         """Bytes saved as a percentage of the original, or None if nothing was measured."""
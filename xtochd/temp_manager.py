@@ -15,14 +15,20 @@ import os
 import shutil
 import sys
 import tempfile
+import threading
 import time
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
-from .constants import ORPHAN_TEMP_AGE_SECONDS
+from .constants import ORPHAN_TEMP_AGE_SECONDS, TEMP_FREE_RESERVE_BYTES
 
 log = logging.getLogger(__name__)
 
+# Folder created inside each user-configured scratch root; keeping our
+# temp dirs under it means the orphan sweep never touches anything else
+# on a shared scratch volume.
+SCRATCH_SUBDIR = "XtoCHD-temp"
+
 
 class TempFileManager:
     """Manages temp subdirectories under ``<app_dir>/temp/``.
@@ -30,6 +36,9 @@ class TempFileManager:
     ``app_dir`` points at the folder containing the frozen .exe (under
     PyInstaller) or main.py (when running from source), so the user can
     always find working files beside the app they launched.
+
+    ``scratch_roots`` lists optional faster volumes (NVMe, tmpfs, ...) to
+    extract onto instead; ``choose_temp_base`` picks one per run.
     """
 
     def __init__(self) -> None:
@@ -42,6 +51,7 @@ class TempFileManager:
             )
         self.temp_base_dir: str = os.path.join(self.app_dir, "temp")
         self.temp_dirs: list[str] = []
+        self.scratch_roots: list[str] = []
         self.cleanup_on_exit: bool = True
 
         self._ensure_temp_dir()
@@ -53,7 +63,57 @@ class TempFileManager:
         except OSError as e:
             log.warning("Could not create temp directory %s: %s", self.temp_base_dir, e)
 
-    def create_temp_dir(self, prefix: str = "chdconv_") -> str:
+    def base_dirs(self) -> list[str]:
+        """Every directory our temp subdirectories may live in."""
+        bases = [self.temp_base_dir]
+        for root in self.scratch_roots:
+            base = os.path.join(root, SCRATCH_SUBDIR)
+            if base not in bases:
+                bases.append(base)
+        return bases
+
+    def choose_temp_base(
+        self,
+        scratch_roots: Optional[list[str]] = None,
+        min_free: int = TEMP_FREE_RESERVE_BYTES,
+    ) -> str:
+        """Pick the temp base for a run: the scratch root with the most free space.
+
+        Only scratch roots (``self.scratch_roots`` unless given) that exist
+        and have at least ``min_free`` bytes free qualify. Which drive the
+        output is on doesn't matter: chdman reads the extracted tracks and
+        writes its .chd straight into the output folder, so nothing is
+        moved from scratch afterwards.
+        Falls back to ``temp_base_dir`` when no scratch root qualifies.
+        """
+        roots = self.scratch_roots if scratch_roots is None else scratch_roots
+        best: Optional[str] = None
+        best_free = -1
+        for root in roots:
+            try:
+                if not os.path.isdir(root):
+                    continue
+                free = shutil.disk_usage(root).free
+            except OSError as e:
+                log.warning("Ignoring scratch folder %s: %s", root, e)
+                continue
+            if free < min_free:
+                continue
+            if free > best_free:
+                best, best_free = root, free
+        if best is None:
+            return self.temp_base_dir
+        base = os.path.join(best, SCRATCH_SUBDIR)
+        try:
+            os.makedirs(base, exist_ok=True)
+        except OSError as e:
+            log.warning("Could not use scratch folder %s: %s", best, e)
+            return self.temp_base_dir
+        return base
+
+    def create_temp_dir(
+        self, prefix: str = "chdconv_", base_dir: Optional[str] = None
+    ) -> str:
         """Create a new temp subdirectory and remember it for cleanup.
 
         Uses ``tempfile.mkdtemp`` under the hood so back-to-back calls in
@@ -62,19 +122,22 @@ class TempFileManager:
         archives quickly). The timestamp is still included as a prefix so
         the orphan sweep's age check keeps working as expected.
 
-        Falls back to the system temp root if the app's temp directory is
+        ``base_dir`` (default ``temp_base_dir``) is usually the result of
+        ``choose_temp_base``. Falls back to the system temp root if it is
         unwritable (e.g. app installed to Program Files without elevation).
         """
+        base_dir = base_dir or self.temp_base_dir
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         dated_prefix = f"{prefix}{timestamp}_{os.getpid()}_"
         try:
-            temp_dir = tempfile.mkdtemp(prefix=dated_prefix, dir=self.temp_base_dir)
+            os.makedirs(base_dir, exist_ok=True)
+            temp_dir = tempfile.mkdtemp(prefix=dated_prefix, dir=base_dir)
             self.temp_dirs.append(temp_dir)
             return temp_dir
         except OSError as e:
             log.warning(
                 "Could not create temp directory in %s, falling back: %s",
-                self.temp_base_dir, e,
+                base_dir, e,
             )
             fallback_dir = tempfile.mkdtemp(prefix=dated_prefix)
             self.temp_dirs.append(fallback_dir)
@@ -112,63 +175,63 @@ class TempFileManager:
         """Sweep temp subdirs left by prior runs. Age-gated so the startup
         sweep never deletes a subdirectory belonging to an in-flight
         conversion that another XtoCHD instance might be running."""
-        if not os.path.exists(self.temp_base_dir):
-            return 0
         cleaned = 0
-        try:
-            for item in os.listdir(self.temp_base_dir):
-                item_path = os.path.join(self.temp_base_dir, item)
-                if not os.path.isdir(item_path):
-                    continue
-                try:
-                    age_seconds = time.time() - os.stat(item_path).st_mtime
-                    if age_seconds > ORPHAN_TEMP_AGE_SECONDS:
-                        shutil.rmtree(item_path)
-                        cleaned += 1
-                except OSError as e:
-                    log.warning("Could not check/clean temp dir %s: %s", item_path, e)
-        except OSError as e:
-            log.warning("Could not scan temp directory: %s", e)
+        for item_path in self._subdirs():
+            try:
+                age_seconds = time.time() - os.stat(item_path).st_mtime
+                if age_seconds > ORPHAN_TEMP_AGE_SECONDS:
+                    shutil.rmtree(item_path)
+                    cleaned += 1
+            except OSError as e:
+                log.warning("Could not check/clean temp dir %s: %s", item_path, e)
         return cleaned
 
     def purge_temp_base_dir(self) -> int:
-        """Delete every subdirectory under the temp base regardless of age.
+        """Delete every subdirectory under the temp bases regardless of age.
 
         This is what the user is asking for when they click "Clean Temp
         Directory" in the Tools menu: a forceful cleanup, not the gentle
         age-gated sweep the startup path uses. Any directories we know
         we're currently using are also removed from the tracker.
         """
-        if not os.path.exists(self.temp_base_dir):
-            return 0
         cleaned = 0
-        try:
-            for item in os.listdir(self.temp_base_dir):
-                item_path = os.path.join(self.temp_base_dir, item)
-                if not os.path.isdir(item_path):
-                    continue
-                try:
-                    shutil.rmtree(item_path)
-                    cleaned += 1
-                    if item_path in self.temp_dirs:
-                        self.temp_dirs.remove(item_path)
-                except OSError as e:
-                    log.warning("Could not purge temp dir %s: %s", item_path, e)
-        except OSError as e:
-            log.warning("Could not scan temp directory: %s", e)
+        for item_path in self._subdirs():
+            try:
+                shutil.rmtree(item_path)
+                cleaned += 1
+                if item_path in self.temp_dirs:
+                    self.temp_dirs.remove(item_path)
+            except OSError as e:
+                log.warning("Could not purge temp dir %s: %s", item_path, e)
         return cleaned
 
+    def _subdirs(self) -> list[str]:
+        """Immediate subdirectories of every temp base (scratch roots included)."""
+        found: list[str] = []
+        for base in self.base_dirs():
+            if not os.path.exists(base):
+                continue
+            try:
+                for item in os.listdir(base):
+                    item_path = os.path.join(base, item)
+                    if os.path.isdir(item_path):
+                        found.append(item_path)
+            except OSError as e:
+                log.warning("Could not scan temp directory %s: %s", base, e)
+        return found
+
     def get_temp_dir_size(self) -> int:
-        """Return total bytes under the temp base directory (0 if missing)."""
-        if not os.path.exists(self.temp_base_dir):
-            return 0
+        """Return total bytes under the temp base directories (0 if missing)."""
         total = 0
-        for root, _dirs, files in os.walk(self.temp_base_dir):
-            for f in files:
-                try:
-                    total += os.path.getsize(os.path.join(root, f))
-                except OSError:
-                    pass
+        for base in self.base_dirs():
+            if not os.path.exists(base):
+                continue
+            for root, _dirs, files in os.walk(base):
+                for f in files:
+                    try:
+                        total += os.path.getsize(os.path.join(root, f))
+                    except OSError:
+                        pass
         return total
 
     @staticmethod
@@ -184,5 +247,90 @@ class TempFileManager:
         return f"{size_bytes:.1f} {units[i]}"
 
 
+class TempSpaceBudget:
+    """Admission control for extracting archives onto the temp volume.
+
+    Each extraction reserves its estimated uncompressed size before any
+    byte is written. A reservation is granted while the outstanding total
+    fits in the volume's free space (less ``reserve_bytes`` headroom) and
+    under the optional ``limit_bytes`` cap; otherwise the caller waits for
+    another extraction's temp dir to be freed, or - if it couldn't fit
+    even with nothing else on disk - skips the archive up front instead
+    of failing halfway through.
+
+    Free space is sampled when nothing is reserved. Bytes that in-flight
+    extractions have already written are covered by their reservations,
+    so they are not subtracted twice.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        reserve_bytes: int = TEMP_FREE_RESERVE_BYTES,
+        limit_bytes: Optional[int] = None,
+    ) -> None:
+        self.directory = directory
+        self.reserve_bytes = reserve_bytes
+        self.limit_bytes = limit_bytes
+        self.reserved = 0
+        self._outstanding = 0
+        self._capacity: Optional[int] = None
+        self._cond = threading.Condition()
+
+    def free_bytes(self) -> Optional[int]:
+        """Free bytes on the temp volume, or None if it can't be measured."""
+        try:
+            return shutil.disk_usage(self.directory).free
+        except OSError as e:
+            log.warning("Could not measure free space in %s: %s", self.directory, e)
+            return None
+
+    def _current_capacity(self) -> Optional[int]:
+        if self._outstanding == 0 or self._capacity is None:
+            free = self.free_bytes()
+            self._capacity = None if free is None else max(0, free - self.reserve_bytes)
+        capacity = self._capacity
+        if self.limit_bytes is not None:
+            capacity = self.limit_bytes if capacity is None else min(capacity, self.limit_bytes)
+        return capacity
+
+    def fits_when_idle(self, nbytes: int) -> bool:
+        """Could ``nbytes`` ever be granted (i.e. with nothing else reserved)?"""
+        with self._cond:
+            # While others hold reservations, capacity is the sample taken
+            # when the volume was last idle - what it returns to.
+            capacity = self._current_capacity()
+            return capacity is None or nbytes <= capacity
+
+    def try_reserve(self, nbytes: int) -> bool:
+        with self._cond:
+            capacity = self._current_capacity()
+            if capacity is not None and self.reserved + nbytes > capacity:
+                return False
+            self.reserved += nbytes
+            self._outstanding += 1
+            return True
+
+    def reserve(
+        self,
+        nbytes: int,
+        should_stop: Callable[[], bool] = lambda: False,
+        poll_seconds: float = 0.5,
+    ) -> bool:
+        """Block until ``nbytes`` is granted. False if ``should_stop`` turns true."""
+        while not should_stop():
+            if self.try_reserve(nbytes):
+                return True
+            with self._cond:
+                self._cond.wait(timeout=poll_seconds)
+        return False
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self.reserved = max(0, self.reserved - nbytes)
+            self._outstanding = max(0, self._outstanding - 1)
+            self._cond.notify_all()
+
+
 # Module-level singleton used by the workers and the GUI.
 temp_manager: TempFileManager = TempFileManager()
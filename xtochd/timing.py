@@ -0,0 +1,139 @@
+"""Per-job timing spans, and the per-stage table the run summary prints.
+
+``ConversionStats`` counts files and bytes, which says a night's run was
+slow but not why. The engine therefore times every stage of every job -
+temp dir creation, archive listing, extraction, the walk for candidates,
+chdman, publishing the .chd, verification and cleanup - as a ``JobSpan``
+carrying its wall time, CPU time and the bytes it moved.
+
+CPU time is the calling thread's own (``time.thread_time``) plus, for
+stages that run a subprocess, that process's user + system time where
+the OS reports it (``os.wait4`` on POSIX). Comparing the two points at the
+bottleneck: chdman near 100% CPU per thread is compression-bound, while
+extraction or publishing with little CPU and a low MB/s is waiting on the
+disk or the NAS.
+
+``stage_report`` folds the spans into one line per stage with totals,
+throughput and a histogram of span durations.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+# Stages, in the order a job goes through them.
+TEMP_DIR = "temp_dir"
+LIST = "list"
+EXTRACT = "extract"
+WALK = "walk"
+CHDMAN = "chdman"
+PUBLISH = "publish"
+VERIFY = "verify"
+CLEANUP = "cleanup"
+STAGES: tuple[str, ...] = (TEMP_DIR, LIST, EXTRACT, WALK, CHDMAN, PUBLISH, VERIFY, CLEANUP)
+
+# Histogram buckets: a span falls in the first whose upper bound (seconds)
+# exceeds its wall time, else in the last.
+BUCKET_BOUNDS: tuple[float, ...] = (0.1, 1.0, 10.0, 60.0, 600.0)
+BUCKET_LABELS: tuple[str, ...] = ("<0.1s", "<1s", "<10s", "<1m", "<10m", "10m+")
+
+
+@dataclass
+class JobSpan:
+    """One stage of one job: how long it took and what it moved."""
+
+    stage: str
+    job: int | None = None  # 1-based job number, None outside a job
+    nbytes: int = 0
+    wall: float = 0.0  # seconds
+    cpu: float = 0.0  # seconds: this thread plus any subprocess it waited on
+
+
+@contextmanager
+def measure(
+    stage: str,
+    sink: Callable[[JobSpan], None],
+    job: int | None = None,
+    nbytes: int = 0,
+) -> Iterator[JobSpan]:
+    """Time the ``with`` body as a ``stage`` span and hand it to ``sink``.
+
+    The body may fill in ``nbytes`` once it knows it, and add a child
+    process's CPU time to ``cpu``. The span is recorded even when the body
+    raises, so failed stages show up too.
+    """
+    span = JobSpan(stage, job, nbytes)
+    wall0, cpu0 = time.perf_counter(), time.thread_time()
+    try:
+        yield span
+    finally:
+        span.wall = time.perf_counter() - wall0
+        span.cpu += time.thread_time() - cpu0
+        sink(span)
+
+
+def wait_for(proc: subprocess.Popen) -> tuple[int, float]:
+    """Wait for ``proc``; returns (exit code, its CPU seconds or 0 if unknown).
+
+    Reaps the child with ``os.wait4`` where it exists, which also yields its
+    resource usage; ``Popen.wait`` would discard that. If something else
+    reaped it first (``poll`` from a cancel), the CPU time is lost.
+    """
+    if hasattr(os, "wait4"):
+        try:
+            _pid, status, usage = os.wait4(proc.pid, 0)
+        except ChildProcessError:
+            return proc.wait(), 0.0
+        if os.WIFSIGNALED(status):
+            proc.returncode = -os.WTERMSIG(status)
+        else:
+            proc.returncode = os.WEXITSTATUS(status)
+        return proc.returncode, usage.ru_utime + usage.ru_stime
+    return proc.wait(), 0.0
+
+
+def _bucket(seconds: float) -> int:
+    for i, bound in enumerate(BUCKET_BOUNDS):
+        if seconds < bound:
+            return i
+    return len(BUCKET_BOUNDS)
+
+
+def stage_report(spans: Iterable[JobSpan]) -> list[str]:
+    """Summary lines: per stage, span count, total wall/CPU, MB/s and a histogram.
+
+    Wall times are summed across jobs, so with parallel jobs a stage can
+    total more than the run itself took. Empty if nothing was timed.
+    """
+    by_stage: dict[str, list[JobSpan]] = {}
+    for span in spans:
+        by_stage.setdefault(span.stage, []).append(span)
+    if not by_stage:
+        return []
+
+    order = [s for s in STAGES if s in by_stage] + sorted(set(by_stage) - set(STAGES))
+    lines = [
+        "TIMING BY STAGE (wall and CPU summed over jobs):",
+        f"  {'stage':<9}{'spans':>6}{'wall s':>9}{'cpu s':>9}{'cpu%':>6}{'MB/s':>8}  "
+        + " ".join(f"{label:>5}" for label in BUCKET_LABELS),
+    ]
+    for stage in order:
+        group = by_stage[stage]
+        wall = sum(s.wall for s in group)
+        cpu = sum(s.cpu for s in group)
+        nbytes = sum(s.nbytes for s in group)
+        counts = [0] * len(BUCKET_LABELS)
+        for s in group:
+            counts[_bucket(s.wall)] += 1
+        cpu_pct = f"{100 * cpu / wall:.0f}" if wall > 0 else "-"
+        rate = f"{nbytes / (1024 * 1024) / wall:.1f}" if nbytes and wall > 0 else "-"
+        lines.append(
+            f"  {stage:<9}{len(group):>6}{wall:>9.1f}{cpu:>9.1f}{cpu_pct:>6}{rate:>8}  "
+            + " ".join(f"{n:>5}" for n in counts)
+        )
+    return lines
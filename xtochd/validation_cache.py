@@ -0,0 +1,152 @@
+"""Persistent cache of ``get_file_info`` results across launches.
+
+Re-validating a library on every start is wasted work when nothing
+changed - and thorough mode runs ``ZipFile.testzip()``, which decompresses
+entire archives. Results are stored in a small SQLite database beside the
+app and are reused only while the file's size and ``st_mtime_ns`` still
+match what was validated, separately for fast and thorough mode.
+
+The cache is strictly an optimisation: any SQLite problem (read-only app
+dir, corrupt database, locked file) is logged and the cache turns itself
+into a no-op rather than failing validation.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Iterable
+
+from .temp_manager import temp_manager
+
+log = logging.getLogger(__name__)
+
+CACHE_FILENAME = "validation_cache.sqlite3"
+
+# SQLite's default host-parameter limit is 999; stay well below it.
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation (
+    path      TEXT    NOT NULL,
+    fast_mode INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    info      TEXT    NOT NULL,
+    PRIMARY KEY (path, fast_mode)
+)
+"""
+
+
+def _stat_key(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class ValidationCache:
+    """Thread-safe (path, size, mtime_ns, fast_mode) -> file-info store."""
+
+    def __init__(self, db_path: str | None) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if db_path is None:
+            return
+        try:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as e:
+            log.warning("Validation cache disabled (%s): %s", db_path, e)
+
+    @classmethod
+    def open_default(cls) -> "ValidationCache":
+        """Open the cache in the app dir, falling back to the system temp dir."""
+        for directory in (temp_manager.app_dir, tempfile.gettempdir()):
+            cache = cls(os.path.join(directory, CACHE_FILENAME))
+            if cache.enabled:
+                return cache
+        return cls(None)
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def lookup(self, paths: Iterable[str], fast_mode: bool) -> dict[str, dict]:
+        """Return cached info for every path whose size and mtime are unchanged."""
+        paths = list(paths)
+        if self._conn is None or not paths:
+            return {}
+        rows: dict[str, tuple[int, int, str]] = {}
+        try:
+            with self._lock:
+                for i in range(0, len(paths), _LOOKUP_CHUNK):
+                    chunk = paths[i : i + _LOOKUP_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    cur = self._conn.execute(
+                        "SELECT path, size, mtime_ns, info FROM validation"
+                        f" WHERE fast_mode = ? AND path IN ({placeholders})",
+                        [int(fast_mode), *chunk],
+                    )
+                    for path, size, mtime_ns, info in cur:
+                        rows[path] = (size, mtime_ns, info)
+        except sqlite3.Error as e:
+            log.warning("Validation cache lookup failed: %s", e)
+            return {}
+
+        hits: dict[str, dict] = {}
+        for path, (size, mtime_ns, info) in rows.items():
+            if _stat_key(path) != (size, mtime_ns):
+                continue
+            try:
+                hits[path] = json.loads(info)
+            except ValueError:
+                continue
+        return hits
+
+    def store(self, results: dict[str, dict], fast_mode: bool) -> None:
+        """Remember ``results`` (path -> info) against each file's current stat."""
+        if self._conn is None or not results:
+            return
+        rows = []
+        for path, info in results.items():
+            key = _stat_key(path)
+            if key is None:
+                continue
+            rows.append((path, int(fast_mode), key[0], key[1], json.dumps(info)))
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO validation"
+                    " (path, fast_mode, size, mtime_ns, info) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            log.warning("Validation cache write failed: %s", e)
+
+    def clear(self) -> None:
+        """Forget every cached result."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM validation")
+                self._conn.commit()
+        except sqlite3.Error as e:
+            log.warning("Could not clear validation cache: %s", e)
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.close()
+            self._conn = None